@@ -87,6 +87,12 @@ class ChatAgentWithMemory:
         self.embedding = Memory(
             cfg.embedding_provider,
             cfg.embedding_model,
+            cache_path=cfg.embedding_cache_path,
+            cache_max_entries=cfg.embedding_cache_max_entries,
+            batch_window_ms=cfg.embedding_batch_window_ms,
+            max_batch_size=cfg.embedding_max_batch_size,
+            storage_precision=cfg.embedding_storage_precision,
+            storage_dimensions=cfg.embedding_storage_dimensions,
             **cfg.embedding_kwargs
         ).get_embeddings()
         
@@ -3,6 +3,7 @@ from typing import List, Dict, Set, Optional, Any
 from fastapi import WebSocket
 
 from gpt_researcher import GPTResearcher
+from gpt_researcher.context import WrittenSectionIndex
 
 
 class DetailedReport:
@@ -61,6 +62,8 @@ class DetailedReport:
         self.existing_headers: List[Dict] = []
         self.global_context: List[str] = []
         self.global_written_sections: List[str] = []
+        # Sections are embedded once when written, later subtopics only query the index
+        self.written_section_index = WrittenSectionIndex(self.gpt_researcher.memory.get_embeddings())
         self.global_urls: Set[str] = set(
             self.source_urls) if self.source_urls else set()
 
@@ -137,12 +140,17 @@ class DetailedReport:
             "text", "") for header in parse_draft_section_titles]
 
         relevant_contents = await subtopic_assistant.get_similar_written_contents_by_draft_section_titles(
-            current_subtopic_task, parse_draft_section_titles_text, self.global_written_sections
+            current_subtopic_task,
+            parse_draft_section_titles_text,
+            self.global_written_sections,
+            written_index=self.written_section_index,
         )
 
         subtopic_report = await subtopic_assistant.write_report(self.existing_headers, relevant_contents)
 
-        self.global_written_sections.extend(self.gpt_researcher.extract_sections(subtopic_report))
+        new_sections = self.gpt_researcher.extract_sections(subtopic_report)
+        self.global_written_sections.extend(new_sections)
+        await self.written_section_index.add(new_sections, cost_callback=self.gpt_researcher.add_costs)
         self.global_context = list(set(subtopic_assistant.context))
         self.global_urls.update(subtopic_assistant.visited_urls)
 
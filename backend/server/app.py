@@ -35,6 +35,7 @@ from server.websocket_manager import run_agent
 from utils import write_md_to_word, write_md_to_pdf
 from gpt_researcher.utils.enum import Tone, ReportType, ReportSource
 from gpt_researcher.config.variables.default import DEFAULT_CONFIG
+from gpt_researcher.llm_provider import configure_llm_runtime, get_provider_registry
 from chat.chat import ChatAgentWithMemory
 
 # MongoDB services removed - no database persistence needed
@@ -261,10 +262,14 @@ async def lifespan(app: FastAPI):
         if _env_truthy("STRICT_ENV", False):
             raise RuntimeError("Environment validation failed. Set STRICT_ENV=false to bypass.")
 
+    # Shared LLM runtime (provider pool, concurrency limits, caches) from the environment config
+    configure_llm_runtime(force=True)
+
     logger.info("GPT Researcher API 已就绪 - 本地模式（无数据库持久化）")
     yield
     # Shutdown
     logger.info("研究 API 正在关闭")
+    await get_provider_registry().shutdown()
 
 # App initialization
 app = FastAPI(lifespan=lifespan)
@@ -344,8 +344,15 @@ async def handle_file_upload(file, DOC_PATH: str, max_bytes: int | None = None)
 
     print(f"File uploaded to {file_path}")
 
-    document_loader = DocumentLoader(DOC_PATH)
-    await document_loader.load()
+    # Validate only the uploaded file; the document index picks it up incrementally on the next run
+    document_loader = DocumentLoader([file_path])
+    try:
+        await document_loader.load()
+    except ValueError as e:
+        # Unsupported or empty documents must not stay in DOC_PATH for later runs to trip over
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {"filename": candidate_name, "path": file_path}
 
@@ -111,7 +111,7 @@ cli.add_argument(
     type=str,
     help="The source of information for the report.",
     choices=["web", "local", "hybrid", "azure", "langchain_documents",
-             "langchain_vectorstore", "static"],
+             "langchain_vectorstore", "static", "web_snippets"],
     default="web"
 )
 
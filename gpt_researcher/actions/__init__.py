@@ -2,8 +2,8 @@ from .retriever import get_retriever, get_retrievers
 from .query_processing import plan_research_outline, get_search_results
 from .agent_creator import extract_json_with_regex, choose_agent
 from .web_scraping import scrape_urls
-from .report_generation import write_conclusion, summarize_url, generate_draft_section_titles, generate_report, write_report_introduction
-from .markdown_processing import extract_headers, extract_sections, table_of_contents, add_references
+from .report_generation import write_conclusion, summarize_url, generate_draft_section_titles, generate_report, write_report_introduction, map_reduce_context, generate_report_outline, write_report_section
+from .markdown_processing import extract_headers, extract_sections, table_of_contents, add_references, extract_link_urls
 from .utils import stream_output
 
 __all__ = [
@@ -18,10 +18,14 @@ __all__ = [
     "generate_draft_section_titles",
     "generate_report",
     "write_report_introduction",
+    "map_reduce_context",
+    "generate_report_outline",
+    "write_report_section",
     "extract_headers",
     "extract_sections",
     "table_of_contents",
     "add_references",
+    "extract_link_urls",
     "stream_output",
     "choose_agent"
 ]
\ No newline at end of file
@@ -2,7 +2,9 @@ import json
 import re
 import json_repair
 import logging
-from ..utils.llm import create_chat_completion
+from ..llm_provider.semantic_cache import embed_for_semantic_cache, get_semantic_cache
+from ..utils.enum import TaskClass
+from ..utils.llm import create_task_completion, get_llm_route
 from ..prompts import PromptFamily
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,7 @@ async def choose_agent(
     cost_callback: callable = None,
     headers=None,
     prompt_family: type[PromptFamily] | PromptFamily = PromptFamily,
+    embeddings=None,
     **kwargs
 ):
     """
@@ -25,6 +28,7 @@ async def choose_agent(
         cfg: 配置
         cost_callback: 计算 LLM 成本的回调
         prompt_family: 提示词家族
+        embeddings: 用于语义缓存的向量模型；相近查询会复用已选择的代理
 
     返回:
         agent: 代理名称
@@ -33,22 +37,39 @@ async def choose_agent(
     query = f"{parent_query} - {query}" if parent_query else f"{query}"
     response = None  # Initialize response to ensure it's defined
 
+    semantic_cache = get_semantic_cache()
+    namespace = (
+        "choose_agent",
+        cfg.embedding_provider,
+        cfg.embedding_model,
+        tuple(get_llm_route(cfg, TaskClass.Classify)),
+        prompt_family if isinstance(prompt_family, type) else type(prompt_family),
+    )
+    query_vector = await embed_for_semantic_cache(embeddings, query)
+    if query_vector is not None:
+        cached = semantic_cache.lookup(namespace, query_vector, query)
+        if cached is not None:
+            return cached
+
     try:
-        response = await create_chat_completion(
-            model=cfg.smart_llm_model,
+        response = await create_task_completion(
+            TaskClass.Classify,
+            config=cfg,
             messages=[
                 {"role": "system", "content": f"{prompt_family.auto_agent_instructions()}"},
                 {"role": "user", "content": f"任务: {query}"},
             ],
             temperature=0.15,
-            llm_provider=cfg.smart_llm_provider,
             llm_kwargs=cfg.llm_kwargs,
             cost_callback=cost_callback,
             **kwargs
         )
 
         agent_dict = json.loads(response)
-        return agent_dict["server"], agent_dict["agent_role_prompt"]
+        agent = agent_dict["server"], agent_dict["agent_role_prompt"]
+        if query_vector is not None:
+            semantic_cache.store(namespace, query_vector, agent, query)
+        return agent
 
     except Exception as e:
         return await handle_json_error(response)
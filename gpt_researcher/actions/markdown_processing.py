@@ -91,6 +91,19 @@ def table_of_contents(markdown_text: str) -> str:
         print("table_of_contents Exception : ", e)
         return markdown_text
 
+def extract_link_urls(markdown_text: str) -> List[str]:
+    """
+    Extract the URLs of markdown links, in order of first appearance and without duplicates.
+
+    Args:
+        markdown_text (str): The markdown text to process.
+
+    Returns:
+        List[str]: The linked URLs.
+    """
+    urls = re.findall(r"\]\((https?://[^)\s]+)\)", markdown_text)
+    return list(dict.fromkeys(urls))
+
 def add_references(report_markdown: str, visited_urls: set) -> str:
     """
     Add references to the markdown report.
@@ -1,13 +1,27 @@
 import asyncio
+
+import json_repair
 from typing import List, Dict, Any
 from ..config.config import Config
-from ..utils.llm import create_chat_completion
+from ..context.packing import (
+    PROMPT_RESERVE_TOKENS,
+    count_tokens,
+    get_context_budget,
+    get_context_window,
+    pack_in_order,
+    shard_by_tokens,
+)
+from ..llm_provider.limiter import Priority
+from ..utils.llm import create_task_completion
 from ..utils.logger import get_formatted_logger
 from ..prompts import PromptFamily, get_prompt_by_report_type
-from ..utils.enum import Tone
+from ..utils.enum import TaskClass, Tone
 
 logger = get_formatted_logger()
 
+# Extraction rounds before the notes are truncated to the report budget
+MAP_REDUCE_MAX_ROUNDS = 3
+
 
 async def write_report_introduction(
     query: str,
@@ -35,8 +49,9 @@ async def write_report_introduction(
         str: 生成的引言。
     """
     try:
-        introduction = await create_chat_completion(
-            model=config.smart_llm_model,
+        introduction = await create_task_completion(
+            TaskClass.Write,
+            config=config,
             messages=[
                 {"role": "system", "content": f"{agent_role_prompt}"},
                 {"role": "user", "content": prompt_family.generate_report_introduction(
@@ -46,8 +61,9 @@ async def write_report_introduction(
                 )},
             ],
             temperature=0.25,
-            llm_provider=config.smart_llm_provider,
             stream=True,
+            cache=False,
+            priority=Priority.INTERACTIVE,
             websocket=websocket,
             max_tokens=config.smart_token_limit,
             llm_kwargs=config.llm_kwargs,
@@ -86,8 +102,9 @@ async def write_conclusion(
         str: 生成的结论。
     """
     try:
-        conclusion = await create_chat_completion(
-            model=config.smart_llm_model,
+        conclusion = await create_task_completion(
+            TaskClass.Write,
+            config=config,
             messages=[
                 {"role": "system", "content": f"{agent_role_prompt}"},
                 {
@@ -98,8 +115,9 @@ async def write_conclusion(
                 },
             ],
             temperature=0.25,
-            llm_provider=config.smart_llm_provider,
             stream=True,
+            cache=False,
+            priority=Priority.INTERACTIVE,
             websocket=websocket,
             max_tokens=config.smart_token_limit,
             llm_kwargs=config.llm_kwargs,
@@ -136,19 +154,20 @@ async def summarize_url(
         str: 总结后的内容。
     """
     try:
-        summary = await create_chat_completion(
-            model=config.smart_llm_model,
+        summary = await create_task_completion(
+            TaskClass.Extract,
+            config=config,
             messages=[
                 {"role": "system", "content": f"{role}"},
                 {"role": "user", "content": f"请总结来自 {url} 的以下内容：\n\n{content}"},
             ],
             temperature=0.25,
-            llm_provider=config.smart_llm_provider,
             stream=True,
             websocket=websocket,
             max_tokens=config.smart_token_limit,
             llm_kwargs=config.llm_kwargs,
             cost_callback=cost_callback,
+            priority=Priority.BACKGROUND,
             **kwargs
         )
         return summary
@@ -184,15 +203,15 @@ async def generate_draft_section_titles(
         List[str]: 生成的章节标题列表。
     """
     try:
-        section_titles = await create_chat_completion(
-            model=config.smart_llm_model,
+        section_titles = await create_task_completion(
+            TaskClass.Plan,
+            config=config,
             messages=[
                 {"role": "system", "content": f"{role}"},
                 {"role": "user", "content": prompt_family.generate_draft_titles_prompt(
                     current_subtopic, query, context)},
             ],
             temperature=0.25,
-            llm_provider=config.smart_llm_provider,
             stream=True,
             websocket=None,
             max_tokens=config.smart_token_limit,
@@ -254,15 +273,17 @@ async def generate_report(
     else:
         content = f"{generate_prompt(query, context, report_source, report_format=cfg.report_format, tone=tone, total_words=cfg.total_words, language=cfg.language)}"
     try:
-        report = await create_chat_completion(
-            model=cfg.smart_llm_model,
+        report = await create_task_completion(
+            TaskClass.Write,
+            config=cfg,
             messages=[
                 {"role": "system", "content": f"{agent_role_prompt}"},
                 {"role": "user", "content": content},
             ],
             temperature=0.35,
-            llm_provider=cfg.smart_llm_provider,
             stream=True,
+            cache=False,
+            priority=Priority.INTERACTIVE,
             websocket=websocket,
             max_tokens=cfg.smart_token_limit,
             llm_kwargs=cfg.llm_kwargs,
@@ -271,14 +292,16 @@ async def generate_report(
         )
     except:
         try:
-            report = await create_chat_completion(
-                model=cfg.smart_llm_model,
+            report = await create_task_completion(
+                TaskClass.Write,
+                config=cfg,
                 messages=[
                     {"role": "user", "content": f"{agent_role_prompt}\n\n{content}"},
                 ],
                 temperature=0.35,
-                llm_provider=cfg.smart_llm_provider,
                 stream=True,
+                cache=False,
+                priority=Priority.INTERACTIVE,
                 websocket=websocket,
                 max_tokens=cfg.smart_token_limit,
                 llm_kwargs=cfg.llm_kwargs,
@@ -289,3 +312,212 @@ async def generate_report(
             print(f"生成报告时出错: {e}")
 
     return report
+
+
+async def extract_context_notes(
+    query: str,
+    context: str,
+    config: Config,
+    cost_callback: callable = None,
+    prompt_family: type[PromptFamily] | PromptFamily = PromptFamily,
+    **kwargs
+) -> str:
+    """
+    从一个上下文分片中提取与查询相关的要点笔记。
+
+    参数:
+        query (str): 研究查询。
+        context (str): 上下文分片。
+        config (Config): 配置对象。
+        cost_callback (callable, optional): 计算 LLM 成本的回调。
+        prompt_family: 提示词家族
+
+    返回:
+        str: 提取的笔记；出错时为空字符串。
+    """
+    try:
+        return await create_task_completion(
+            TaskClass.Extract,
+            config=config,
+            default_llm="fast",
+            messages=[
+                {"role": "user", "content": prompt_family.generate_context_notes_prompt(query, context)},
+            ],
+            temperature=0,
+            max_tokens=config.fast_token_limit,
+            llm_kwargs=config.llm_kwargs,
+            cost_callback=cost_callback,
+            **kwargs
+        )
+    except Exception as e:
+        logger.error(f"提取上下文笔记时出错: {e}")
+    return ""
+
+
+def _count_context_tokens(items: list[str], model: str) -> int:
+    return sum(count_tokens(item, model) for item in items)
+
+
+async def map_reduce_context(
+    query: str,
+    context,
+    config: Config,
+    cost_callback: callable = None,
+    prompt_family: type[PromptFamily] | PromptFamily = PromptFamily,
+    **kwargs
+):
+    """
+    将超出报告模型预算的研究上下文归约为与查询相关的笔记。
+
+    上下文按 token 拆分为适合快速模型的分片，并行提取笔记；若笔记仍超出预算
+    (get_context_budget)，则继续归约，最多 MAP_REDUCE_MAX_ROUNDS 轮后按预算截断。
+    REPORT_MAP_REDUCE 为 "auto" 时，未超出预算的上下文原样返回；为 "off" 时不做处理。
+
+    参数:
+        query (str): 研究查询。
+        context: 研究上下文（字符串或字符串列表）。
+        config (Config): 配置对象。
+        cost_callback (callable, optional): 计算 LLM 成本的回调。
+        prompt_family: 提示词家族
+
+    返回:
+        归约后的上下文（笔记列表），或原上下文。
+    """
+    mode = config.report_map_reduce
+    if mode == "off" or not context:
+        return context
+
+    items = [str(item) for item in context] if isinstance(context, list) else str(context).split("\n\n")
+    budget = get_context_budget(config)
+    tokens = await asyncio.to_thread(_count_context_tokens, items, config.smart_llm_model)
+    if mode == "auto" and tokens <= budget:
+        return context
+
+    shard_budget = config.map_reduce_shard_tokens or (
+        get_context_window(config.fast_llm_model) - config.fast_token_limit - PROMPT_RESERVE_TOKENS
+    )
+    shard_budget = max(shard_budget, 1000)
+    for _ in range(MAP_REDUCE_MAX_ROUNDS):
+        shards = await asyncio.to_thread(shard_by_tokens, items, shard_budget, config.fast_llm_model)
+        logger.info(f"上下文约 {tokens} tokens（预算 {budget}），拆分为 {len(shards)} 个分片并行提取笔记")
+        notes = await asyncio.gather(*[
+            extract_context_notes(query, "\n\n".join(shard), config, cost_callback, prompt_family, **kwargs)
+            for shard in shards
+        ])
+        notes = [note for note in notes if note and note.strip()]
+        if not notes:
+            logger.warning("未能从上下文分片中提取笔记，按预算截断原上下文")
+            break
+        items = notes
+        tokens = await asyncio.to_thread(_count_context_tokens, items, config.smart_llm_model)
+        if tokens <= budget or len(shards) == 1:
+            break
+
+    return pack_in_order(items, budget, config.smart_llm_model).select(items)
+
+
+async def generate_report_outline(
+    query: str,
+    context,
+    config: Config,
+    max_sections: int = 4,
+    cost_callback: callable = None,
+    prompt_family: type[PromptFamily] | PromptFamily = PromptFamily,
+    **kwargs
+) -> dict:
+    """
+    生成报告大纲（标题和各部分标题），用于分部分并行撰写报告。
+
+    参数:
+        query (str): 研究查询。
+        context: 报告上下文（应已截断为较小的片段）。
+        config (Config): 配置对象。
+        max_sections (int): 部分数量。
+        cost_callback (callable, optional): 计算 LLM 成本的回调。
+        prompt_family: 提示词家族
+
+    返回:
+        dict: {"title": str, "sections": List[str]}；出错时 sections 为空。
+    """
+    try:
+        response = await create_task_completion(
+            TaskClass.Plan,
+            config=config,
+            messages=[
+                {"role": "user", "content": prompt_family.generate_report_outline_prompt(
+                    query, context, max_sections, config.language)},
+            ],
+            temperature=0.2,
+            priority=Priority.INTERACTIVE,
+            max_tokens=1000,
+            llm_kwargs=config.llm_kwargs,
+            cost_callback=cost_callback,
+            **kwargs
+        )
+        outline = json_repair.loads(response)
+        if isinstance(outline, list):
+            outline = {"sections": outline}
+        sections = [str(title).strip() for title in outline.get("sections", []) if str(title).strip()]
+        return {"title": str(outline.get("title") or query).strip(), "sections": sections[:max_sections]}
+    except Exception as e:
+        logger.error(f"生成报告大纲时出错: {e}")
+    return {"title": query, "sections": []}
+
+
+async def write_report_section(
+    query: str,
+    section_title: str,
+    outline: list,
+    context,
+    config: Config,
+    tone: Tone = None,
+    total_words: int = 300,
+    cost_callback: callable = None,
+    prompt_family: type[PromptFamily] | PromptFamily = PromptFamily,
+    **kwargs
+) -> str:
+    """
+    撰写报告的一个部分（不流式输出，以便多个部分并行撰写）。
+
+    参数:
+        query (str): 研究查询。
+        section_title (str): 要撰写的部分标题。
+        outline (list): 报告所有部分的标题。
+        context: 与该部分相关的上下文。
+        config (Config): 配置对象。
+        tone (Tone): 报告语气。
+        total_words (int): 该部分的目标字数。
+        cost_callback (callable, optional): 计算 LLM 成本的回调。
+        prompt_family: 提示词家族
+
+    返回:
+        str: 该部分的 markdown 内容；出错时为空字符串。
+    """
+    try:
+        return await create_task_completion(
+            TaskClass.Write,
+            config=config,
+            messages=[
+                {"role": "user", "content": prompt_family.generate_report_section_prompt(
+                    query,
+                    section_title,
+                    outline,
+                    context,
+                    report_format=config.report_format,
+                    total_words=total_words,
+                    tone=tone,
+                    language=config.language,
+                )},
+            ],
+            temperature=0.35,
+            cache=False,
+            priority=Priority.INTERACTIVE,
+            max_tokens=config.smart_token_limit,
+            llm_kwargs=config.llm_kwargs,
+            cost_callback=cost_callback,
+            **kwargs
+        )
+    except Exception as e:
+        logger.error(f"撰写报告部分 {section_title} 时出错: {e}")
+    return ""
+
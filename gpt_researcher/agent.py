@@ -5,9 +5,14 @@ import os
 from .config import Config
 from .memory import Memory
 from .utils.enum import ReportSource, ReportType, Tone
-from .llm_provider import GenericLLMProvider
+from .llm_provider import (
+    GenericLLMProvider,
+    configure_llm_runtime,
+    set_llm_session,
+)
 from .prompts import get_prompt_family
 from .vector_store import VectorStoreWrapper
+from .context.written_index import WrittenSectionIndex
 
 # Research skills
 from .skills.researcher import ResearchConductor
@@ -151,8 +156,19 @@ class GPTResearcher:
             self._process_mcp_configs(mcp_configs)
         
         self.retrievers = get_retrievers(self.headers, self.cfg)
+        # The LLM runtime (provider pool, limits, caches, replay) is shared by the whole process:
+        # only the first researcher configures it, unless the server already did at startup
+        configure_llm_runtime(self.cfg)
         self.memory = Memory(
-            self.cfg.embedding_provider, self.cfg.embedding_model, **self.cfg.embedding_kwargs
+            self.cfg.embedding_provider,
+            self.cfg.embedding_model,
+            cache_path=self.cfg.embedding_cache_path,
+            cache_max_entries=self.cfg.embedding_cache_max_entries,
+            batch_window_ms=self.cfg.embedding_batch_window_ms,
+            max_batch_size=self.cfg.embedding_max_batch_size,
+            storage_precision=self.cfg.embedding_storage_precision,
+            storage_dimensions=self.cfg.embedding_storage_dimensions,
+            **self.cfg.embedding_kwargs
         )
         
         # 设置默认编码为 utf-8
@@ -288,6 +304,7 @@ class GPTResearcher:
                 logging.getLogger('research').error(f"_log_event 出错：{e}", exc_info=True)
 
     async def conduct_research(self, on_progress=None):
+        set_llm_session(id(self))
         await self._log_event("research", step="start", details={
             "query": self.query,
             "report_type": self.report_type,
@@ -310,6 +327,7 @@ class GPTResearcher:
                 cost_callback=self.add_costs,
                 headers=self.headers,
                 prompt_family=self.prompt_family,
+                embeddings=self.memory.get_embeddings(),
                 **self.kwargs,
                 # **filtered_kwargs
             )
@@ -376,6 +394,7 @@ class GPTResearcher:
             "context_source": "external" if ext_context else "internal"
         })
 
+        set_llm_session(id(self))
         report = await self.report_generator.write_report(
             existing_headers=existing_headers,
             relevant_written_contents=relevant_written_contents,
@@ -414,13 +433,15 @@ class GPTResearcher:
         current_subtopic: str,
         draft_section_titles: list[str],
         written_contents: list[dict],
-        max_results: int = 10
+        max_results: int = 10,
+        written_index: WrittenSectionIndex | None = None,
     ) -> list[str]:
         return await self.context_manager.get_similar_written_contents_by_draft_section_titles(
             current_subtopic,
             draft_section_titles,
             written_contents,
-            max_results
+            max_results,
+            written_index=written_index,
         )
 
     # 工具方法
@@ -24,7 +24,7 @@ class Config:
         self._set_embedding_attributes()
         self._set_llm_attributes()
         self._handle_deprecated_attributes()
-        if config_to_use['REPORT_SOURCE'] != 'web':
+        if config_to_use['REPORT_SOURCE'] not in ('web', 'web_snippets'):
           self._set_doc_path(config_to_use)
 
         # MCP 支持配置
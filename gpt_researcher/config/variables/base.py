@@ -27,12 +27,42 @@ class BaseConfig(TypedDict):
     SCRAPER: str
     MAX_SCRAPER_WORKERS: int
     SCRAPER_RATE_LIMIT_DELAY: float
+    USE_RETRIEVER_RAW_CONTENT: bool
+    MAX_PAGE_CONTENT_CHARS: int
+    MAX_CONTEXT_TOKENS: int
+    REPORT_MAP_REDUCE: str
+    MAP_REDUCE_SHARD_TOKENS: int
+    REPORT_SECTIONS: int
+    CONTEXT_WINDOW_TOKENS: int
+    CONTEXT_DEDUP_THRESHOLD: float
     MAX_SUBTOPICS: int
     REPORT_SOURCE: Union[str, None]
     DOC_PATH: str
+    DOC_INDEX_PATH: str
+    ANN_INDEX_MIN_CHUNKS: int
     PROMPT_FAMILY: str
     LLM_KWARGS: dict
+    LLM_PROVIDER_POOL_SIZE: int
+    LLM_INITIAL_CONCURRENCY: int
+    LLM_MAX_CONCURRENCY: int
+    LLM_MAX_RETRIES: int
+    LLM_RATE_BUDGETS: dict
+    LLM_ROUTES: dict
+    LLM_ROUTE_TIMEOUT: float
+    LLM_RECORD_PATH: str
+    LLM_REPLAY_LATENCY: float
+    LLM_CACHE_PATH: str
+    LLM_CACHE_TTL: float
+    LLM_CACHE_MAX_ENTRIES: int
+    SEMANTIC_CACHE_THRESHOLD: float
+    SEMANTIC_CACHE_MAX_ENTRIES: int
     EMBEDDING_KWARGS: dict
+    EMBEDDING_CACHE_PATH: str
+    EMBEDDING_CACHE_MAX_ENTRIES: int
+    EMBEDDING_BATCH_WINDOW_MS: float
+    EMBEDDING_MAX_BATCH_SIZE: int
+    EMBEDDING_STORAGE_PRECISION: str
+    EMBEDDING_STORAGE_DIMENSIONS: int
     DEEP_RESEARCH_CONCURRENCY: int
     DEEP_RESEARCH_DEPTH: int
     DEEP_RESEARCH_BREADTH: int
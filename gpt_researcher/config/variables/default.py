@@ -24,13 +24,43 @@ DEFAULT_CONFIG: BaseConfig = {
     "SCRAPER": "bs",
     "MAX_SCRAPER_WORKERS": 15,
     "SCRAPER_RATE_LIMIT_DELAY": 0.0,  # Minimum seconds between scraper requests (0 = no limit, useful for API rate limiting)
+    "USE_RETRIEVER_RAW_CONTENT": False,  # Use full page content returned by retrievers instead of re-scraping those URLs
+    "MAX_PAGE_CONTENT_CHARS": 50000,  # Per-page character budget before chunking/embedding (0 = no limit)
+    "MAX_CONTEXT_TOKENS": 32000,  # Cap on the research context tokens handed to the report writer (0 = window-derived only)
+    "CONTEXT_WINDOW_TOKENS": 0,  # Context window of SMART_LLM (0 = look up by model name)
+    "REPORT_MAP_REDUCE": "auto",  # Reduce research context to notes with FAST_LLM before writing: "auto" (only above budget), "always" or "off"
+    "MAP_REDUCE_SHARD_TOKENS": 0,  # Tokens per context shard when map-reducing (0 = derived from FAST_LLM's window)
+    "REPORT_SECTIONS": 0,  # Write research reports as this many sections in parallel (0 = one streamed call)
+    "CONTEXT_DEDUP_THRESHOLD": 0.95,  # Embedding similarity above which context chunks count as duplicates (0 = exact only)
     "MAX_SUBTOPICS": 3,
     "LANGUAGE": "english",
     "REPORT_SOURCE": "web",
     "DOC_PATH": "./my-docs",
+    "DOC_INDEX_PATH": "",  # Persistent incremental index for DOC_PATH, e.g. "./.gptr-cache/doc_index.sqlite" ("" = disabled)
+    "ANN_INDEX_MIN_CHUNKS": 20000,  # Search indexed DOC_PATH corpora of at least this many chunks through HNSW (0 = always exact)
     "PROMPT_FAMILY": "default",
     "LLM_KWARGS": {},
+    "LLM_PROVIDER_POOL_SIZE": 32,  # Reused LLM client instances kept per process (0 = build a client per call)
+    "LLM_INITIAL_CONCURRENCY": 8,  # Concurrent LLM requests per provider before the adaptive (AIMD) limit adjusts
+    "LLM_MAX_CONCURRENCY": 64,  # Upper bound of the adaptive per-provider LLM concurrency limit
+    "LLM_MAX_RETRIES": 5,  # Retries of LLM calls failing with 429/5xx/timeouts, with jittered exponential backoff
+    "LLM_ROUTES": {},  # Models per task class (classify/extract/plan/write/reason), e.g. {"extract": ["openai:gpt-4o-mini", "smart"]}
+    "LLM_ROUTE_TIMEOUT": 0,  # Seconds before a routed (non-streamed) LLM call fails over to the next model (0 = no timeout)
+    "LLM_RECORD_PATH": "",  # Record every LLM request/response (with chunks and timing) to this JSONL for replay ("" = off)
+    "LLM_REPLAY_LATENCY": 0.0,  # Recorded latency replayed by the replay provider, as a multiplier (0 = instant)
+    "LLM_RATE_BUDGETS": {},  # Per-provider request/token budgets per minute, e.g. {"openai": {"rpm": 500, "tpm": 200000}}
+    "LLM_CACHE_PATH": "",  # Persistent exact-match LLM response cache, e.g. "./.gptr-cache/llm_responses.sqlite" ("" = disabled)
+    "LLM_CACHE_TTL": 86400,  # Seconds a cached LLM response stays valid (0 = no expiry)
+    "LLM_CACHE_MAX_ENTRIES": 10000,  # Least recently used responses are evicted above this size (0 = unbounded)
+    "SEMANTIC_CACHE_THRESHOLD": 0,  # Query similarity at which agent choices and sub-query plans are reused, e.g. 0.95 (0 = disabled)
+    "SEMANTIC_CACHE_MAX_ENTRIES": 1000,  # Cached agent choices / plans kept per model configuration
     "EMBEDDING_KWARGS": {},
+    "EMBEDDING_CACHE_PATH": "",  # Persistent content-hash embedding cache, e.g. "./.gptr-cache/embeddings.sqlite" ("" = disabled)
+    "EMBEDDING_CACHE_MAX_ENTRIES": 200000,  # Least recently used vectors are evicted above this size (0 = unbounded)
+    "EMBEDDING_BATCH_WINDOW_MS": 10,  # Coalesce concurrent embedding calls made within this window (0 = disabled)
+    "EMBEDDING_MAX_BATCH_SIZE": 512,  # Maximum number of texts per batched embedding request
+    "EMBEDDING_STORAGE_PRECISION": "float32",  # Precision of stored embeddings: float32, float16 or int8
+    "EMBEDDING_STORAGE_DIMENSIONS": 0,  # Keep only the leading dimensions of stored embeddings (0 = all)
     "VERBOSE": False,
     # Deep research specific settings
     "DEEP_RESEARCH_BREADTH": 3,
@@ -1,4 +1,6 @@
+from .chunk_index import ChunkIndex
 from .compression import ContextCompressor
 from .retriever import SearchAPIRetriever
+from .written_index import WrittenSectionIndex
 
-__all__ = ['ContextCompressor', 'SearchAPIRetriever']
+__all__ = ['ChunkIndex', 'ContextCompressor', 'SearchAPIRetriever', 'WrittenSectionIndex']
@@ -0,0 +1,121 @@
+import json
+import os
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+    HAS_HNSWLIB = True
+except ImportError:
+    HAS_HNSWLIB = False
+
+
+class HNSWIndex:
+    """
+    Persistent approximate nearest-neighbour index (hnswlib) over labelled vectors.
+
+    The graph is stored at `path`, with a JSON sidecar holding its dimension and a `.labels.npy`
+    file with the active labels, read into a set on load. Vectors can be inserted and
+    removed incrementally; removed labels are marked deleted and their slots are reused.
+    Scores are cosine similarities, like SimilarityEngine.
+    """
+
+    def __init__(self, path: str, M: int = 16, ef_construction: int = 200, ef_search: int = 128):
+        """
+        Args:
+            path: Path of the index file. An existing index is loaded from it.
+            M: Number of graph links per element.
+            ef_construction: Size of the candidate list while inserting.
+            ef_search: Minimum size of the candidate list while searching.
+        """
+        if not HAS_HNSWLIB:
+            raise ImportError("使用 HNSW 索引需要 hnswlib 包。请使用以下命令安装: pip install hnswlib")
+        self.path = path
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.labels: set = set()
+        self._index = None
+        if os.path.exists(path) and os.path.exists(self._meta_path):
+            self._load()
+
+    @property
+    def _meta_path(self) -> str:
+        return f"{self.path}.json"
+
+    @property
+    def _labels_path(self) -> str:
+        return f"{self.path}.labels.npy"
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def _load(self) -> None:
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        self._index = hnswlib.Index(space="cosine", dim=meta["dim"])
+        self._index.load_index(self.path, allow_replace_deleted=True)
+        self.labels = set(np.load(self._labels_path).tolist())
+
+    def _create(self, dim: int, capacity: int) -> None:
+        self._index = hnswlib.Index(space="cosine", dim=dim)
+        self._index.init_index(
+            max_elements=capacity, M=self.M, ef_construction=self.ef_construction, allow_replace_deleted=True
+        )
+
+    def add(self, labels: List[int], vectors) -> None:
+        """Insert vectors under the given integer labels."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(labels):
+            return
+        if self._index is None:
+            self._create(vectors.shape[1], max(1024, 2 * len(labels)))
+
+        needed = self._index.get_current_count() + len(labels)
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(max(needed, 2 * self._index.get_max_elements()))
+        self._index.add_items(vectors, np.asarray(labels, dtype=np.int64), replace_deleted=True)
+        self.labels.update(int(label) for label in labels)
+
+    def remove(self, labels: Iterable[int]) -> None:
+        for label in labels:
+            if label in self.labels:
+                self._index.mark_deleted(label)
+                self.labels.discard(label)
+
+    def save(self) -> None:
+        if self._index is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._index.save_index(self.path)
+        np.save(self._labels_path, np.fromiter(self.labels, dtype=np.int64, count=len(self.labels)))
+        with open(self._meta_path, "w") as f:
+            json.dump({"dim": self._index.dim}, f)
+
+    def get_vectors(self, labels) -> np.ndarray:
+        """Normalized float32 vectors stored under the given labels."""
+        vectors = np.asarray(self._index.get_items(list(labels)), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def search_many(self, query_vectors, k: int, threshold: float | None = None) -> List[List[Tuple[int, float]]]:
+        """
+        Return, for each query, up to k (label, score) pairs sorted by descending cosine similarity.
+        """
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        k = min(k, len(self.labels))
+        if self._index is None or k <= 0 or queries.size == 0:
+            return [[] for _ in range(len(queries))]
+
+        self._index.set_ef(max(self.ef_search, k))
+        labels, distances = self._index.knn_query(queries.reshape(len(queries), -1), k=k)
+        return [
+            [
+                (int(label), float(1.0 - distance))
+                for label, distance in zip(row_labels, row_distances)
+                if threshold is None or 1.0 - distance > threshold
+            ]
+            for row_labels, row_distances in zip(labels, distances)
+        ]
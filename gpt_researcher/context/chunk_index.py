@@ -0,0 +1,184 @@
+import asyncio
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from .dedup import content_hash
+from .packing import PackResult, count_tokens, pack_by_mmr
+from .similarity import SimilarityEngine
+
+
+class ChunkIndex:
+    """
+    In-memory index over the chunks of a fixed set of pages.
+
+    Pages are split and embedded once when the index is built; every search afterwards only
+    embeds its own query and scores it against the stored chunk vectors. Documents are only
+    created for the chunks that are returned.
+
+    The vectors of chunks selected by pack_many() are kept in `packed_vectors`, keyed by
+    content_hash(), so later steps such as deduplication need not embed them again.
+    """
+
+    def __init__(self, chunks: List[dict], vectors: np.ndarray | None, embeddings, ann_index=None, precision: str = "float32"):
+        """
+        Args:
+            chunks: Dicts with `content`, `source` and `title` keys, plus `chunk_id` when ann_index is given.
+            vectors: One embedding row per chunk. Unused when ann_index is given.
+            embeddings: Embeddings client used to embed search queries.
+            ann_index: Optional HNSWIndex labelled by chunk_id, searched instead of an exact scan.
+            precision: In-memory precision of the chunk vectors, "float32" or "int8".
+        """
+        self.chunks = chunks
+        self.embeddings = embeddings
+        self._positions = None
+        self.packed_vectors: dict[str, np.ndarray] = {}
+        if ann_index is not None:
+            self.engine = ann_index
+            self._positions = {chunk["chunk_id"]: i for i, chunk in enumerate(chunks)}
+        elif chunks:
+            self.engine = SimilarityEngine(
+                np.asarray(vectors, dtype=np.float32).reshape(len(chunks), -1), precision=precision
+            )
+        else:
+            self.engine = SimilarityEngine(np.zeros((0, 0), dtype=np.float32))
+
+    @classmethod
+    async def from_pages(
+        cls,
+        pages: List[dict],
+        embeddings,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 100,
+        vectors: np.ndarray | None = None,
+        ann_index=None,
+        precision: str = "float32",
+    ) -> "ChunkIndex":
+        """
+        Split and embed pages into an index.
+
+        Args:
+            pages: Dicts with `raw_content`, `url` and optionally `title` keys.
+            embeddings: Embeddings client.
+            chunk_size: Chunk size used to split pages.
+            chunk_overlap: Overlap between consecutive chunks.
+            vectors: Precomputed embeddings, one row per page. When given, pages are
+                treated as ready-made chunks and are neither split nor embedded.
+            ann_index: HNSWIndex already holding the pages' vectors under their `chunk_id`.
+                Like vectors, pages are then used as ready-made chunks.
+            precision: In-memory precision of the chunk vectors, "float32" or "int8".
+
+        Returns:
+            ChunkIndex: The built index.
+        """
+        if vectors is not None or ann_index is not None:
+            chunks = [
+                {
+                    "content": page.get("raw_content", ""),
+                    "source": page.get("url", ""),
+                    "title": page.get("title", ""),
+                    "chunk_id": page.get("chunk_id"),
+                }
+                for page in pages
+            ]
+            return cls(chunks, vectors, embeddings, ann_index=ann_index, precision=precision)
+
+        splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        chunks = [
+            {"content": text, "source": page.get("url", ""), "title": page.get("title", "")}
+            for page in pages
+            for text in splitter.split_text(page.get("raw_content", "") or "")
+        ]
+        if not chunks:
+            return cls([], np.zeros((0, 0), dtype=np.float32), embeddings)
+
+        chunk_vectors = await embeddings.aembed_documents([chunk["content"] for chunk in chunks])
+        return cls(chunks, np.asarray(chunk_vectors, dtype=np.float32), embeddings, precision=precision)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def _to_document(self, i: int) -> Document:
+        chunk = self.chunks[i]
+        return Document(page_content=chunk["content"], metadata={"source": chunk["source"], "title": chunk["title"]})
+
+    async def search(self, query: str, k: int = 10, similarity_threshold: float = 0.35) -> List[Document]:
+        """
+        Return up to k chunks whose cosine similarity to the query exceeds the threshold,
+        most similar first.
+        """
+        return (await self.search_many([query], k, similarity_threshold))[0]
+
+    async def search_many(self, queries: List[str], k: int = 10, similarity_threshold: float = 0.35) -> List[List[Document]]:
+        """Like search(), for several queries scored together in one matrix multiply."""
+        if not self.chunks:
+            return [[] for _ in queries]
+
+        query_vectors = await asyncio.gather(*(self.embeddings.aembed_query(query) for query in queries))
+        hits = self._search_vectors(query_vectors, k, similarity_threshold)
+        return [[self._to_document(i) for i, _ in query_hits] for query_hits in hits]
+
+    def _search_vectors(self, query_vectors, k: int, similarity_threshold: float) -> List[list]:
+        hits = self.engine.search_many(query_vectors, k, similarity_threshold)
+        if self._positions is not None:
+            # The ANN index returns chunk ids; it may still hold chunks outside this index
+            hits = [
+                [(self._positions[label], score) for label, score in query_hits if label in self._positions]
+                for query_hits in hits
+            ]
+        return hits
+
+    def _chunk_tokens(self, i: int, model: str) -> int:
+        chunk = self.chunks[i]
+        if "tokens" not in chunk:
+            chunk["tokens"] = count_tokens(f"{chunk['source']}\n{chunk['title']}\n{chunk['content']}", model)
+        return chunk["tokens"]
+
+    async def pack_many(
+        self,
+        queries: List[str],
+        token_budget: int,
+        model: str,
+        k: int = 10,
+        similarity_threshold: float = 0.35,
+        lambda_mult: float = 0.7,
+    ) -> List[tuple[List[Document], PackResult]]:
+        """
+        For each query, select up to k chunks by maximal marginal relevance within token_budget.
+
+        Candidates are the most similar chunks above the threshold; chunks that mostly repeat
+        an already selected one are passed over for more diverse ones.
+
+        Returns:
+            list: (documents, PackResult) per query, documents in selection order.
+        """
+        if not self.chunks:
+            return [([], PackResult(budget=token_budget)) for _ in queries]
+
+        query_vectors = await asyncio.gather(*(self.embeddings.aembed_query(query) for query in queries))
+        hits = self._search_vectors(query_vectors, max(3 * k, 30), similarity_threshold)
+
+        results = []
+        for query_hits in hits:
+            if not query_hits:
+                results.append(([], PackResult(budget=token_budget)))
+                continue
+            positions = [i for i, _ in query_hits]
+            if self._positions is not None:
+                vectors = self.engine.get_vectors([self.chunks[i]["chunk_id"] for i in positions])
+            else:
+                vectors = self.engine.get_vectors(positions)
+            packed = pack_by_mmr(
+                np.array([score for _, score in query_hits], dtype=np.float32),
+                vectors,
+                [self._chunk_tokens(i, model) for i in positions],
+                token_budget,
+                lambda_mult=lambda_mult,
+                max_items=k,
+            )
+            for i in packed.indices:
+                self.packed_vectors[content_hash(self.chunks[positions[i]]["content"])] = vectors[i]
+            results.append(([self._to_document(positions[i]) for i in packed.indices], packed))
+        return results
@@ -1,17 +1,9 @@
 import os
-import asyncio
 from typing import Optional
-from .retriever import SearchAPIRetriever, SectionRetriever
-from langchain_classic.retrievers import (
-    ContextualCompressionRetriever,
-)
-from langchain_classic.retrievers.document_compressors import (
-    DocumentCompressorPipeline,
-    EmbeddingsFilter,
-)
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from .chunk_index import ChunkIndex
+from .page_budget import apply_page_budget
 from ..vector_store import VectorStoreWrapper
-from ..utils.costs import estimate_embedding_cost
+from ..utils.costs import aestimate_embedding_cost
 from ..memory.embeddings import OPENAI_EMBEDDING_MODEL
 from ..prompts import PromptFamily
 
@@ -29,7 +21,6 @@ class VectorstoreCompressor:
         self.vector_store = vector_store
         self.max_results = max_results
         self.filter = filter
-        self.kwargs = kwargs
         self.prompt_family = prompt_family
 
     async def async_get_context(self, query, max_results=5):
@@ -45,66 +36,40 @@ class ContextCompressor:
         embeddings,
         max_results=5,
         prompt_family: type[PromptFamily] | PromptFamily = PromptFamily,
+        max_page_chars: int = 0,
         **kwargs,
     ):
         self.max_results = max_results
         self.documents = documents
-        self.kwargs = kwargs
+        self.max_page_chars = max_page_chars
         self.embeddings = embeddings
-        self.similarity_threshold = os.environ.get("SIMILARITY_THRESHOLD", 0.35)
+        self.similarity_threshold = float(os.environ.get("SIMILARITY_THRESHOLD", 0.35))
         self.prompt_family = prompt_family
+        self.last_pack = None
+        self.packed_vectors = {}
 
-    def __get_contextual_retriever(self):
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        relevance_filter = EmbeddingsFilter(embeddings=self.embeddings,
-                                            similarity_threshold=self.similarity_threshold)
-        pipeline_compressor = DocumentCompressorPipeline(
-            transformers=[splitter, relevance_filter]
-        )
-        base_retriever = SearchAPIRetriever(
-            pages=self.documents
-        )
-        contextual_retriever = ContextualCompressionRetriever(
-            base_compressor=pipeline_compressor, base_retriever=base_retriever
-        )
-        return contextual_retriever
+    async def async_get_documents(self, query, max_results=5, cost_callback=None, token_budget=None, model=None):
+        """
+        Returns the chunks of the documents most relevant to the query.
 
-    async def async_get_context(self, query, max_results=5, cost_callback=None):
-        compressed_docs = self.__get_contextual_retriever()
+        With a token_budget, chunks are selected by maximal marginal relevance until the budget
+        (counted with the tokenizer of `model`) is used up; the last PackResult is kept in
+        self.last_pack and the vectors of the packed chunks in self.packed_vectors.
+        """
+        # Trim oversized pages before any chunking or embedding happens
+        pages = apply_page_budget(self.documents, query, self.max_page_chars)
         if cost_callback:
-            cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=self.documents))
-        relevant_docs = await asyncio.to_thread(compressed_docs.invoke, query, **self.kwargs)
-        return self.prompt_family.pretty_print_docs(relevant_docs, max_results)
-
-
-class WrittenContentCompressor:
-    def __init__(self, documents, embeddings, similarity_threshold, **kwargs):
-        self.documents = documents
-        self.kwargs = kwargs
-        self.embeddings = embeddings
-        self.similarity_threshold = similarity_threshold
+            cost_callback(await aestimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=pages))
+        chunk_index = await ChunkIndex.from_pages(pages, self.embeddings)
+        if token_budget:
+            [(relevant_docs, self.last_pack)] = await chunk_index.pack_many(
+                [query], token_budget, model, k=max_results, similarity_threshold=self.similarity_threshold
+            )
+            self.packed_vectors = chunk_index.packed_vectors
+            return relevant_docs
+        return await chunk_index.search(query, k=max_results, similarity_threshold=self.similarity_threshold)
 
-    def __get_contextual_retriever(self):
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        relevance_filter = EmbeddingsFilter(embeddings=self.embeddings,
-                                            similarity_threshold=self.similarity_threshold)
-        pipeline_compressor = DocumentCompressorPipeline(
-            transformers=[splitter, relevance_filter]
-        )
-        base_retriever = SectionRetriever(
-            sections=self.documents
-        )
-        contextual_retriever = ContextualCompressionRetriever(
-            base_compressor=pipeline_compressor, base_retriever=base_retriever
-        )
-        return contextual_retriever
-
-    def __pretty_docs_list(self, docs, top_n):
-        return [f"Title: {d.metadata.get('section_title')}\nContent: {d.page_content}\n" for i, d in enumerate(docs) if i < top_n]
-
-    async def async_get_context(self, query, max_results=5, cost_callback=None):
-        compressed_docs = self.__get_contextual_retriever()
-        if cost_callback:
-            cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=self.documents))
-        relevant_docs = await asyncio.to_thread(compressed_docs.invoke, query, **self.kwargs)
-        return self.__pretty_docs_list(relevant_docs, max_results)
+    async def async_get_context(self, query, max_results=5, cost_callback=None, token_budget=None, model=None):
+        """Returns the chunks most relevant to the query, formatted for prompts."""
+        relevant_docs = await self.async_get_documents(query, max_results, cost_callback, token_budget, model)
+        return self.prompt_family.pretty_print_docs(relevant_docs, max_results)
@@ -0,0 +1,91 @@
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+
+from .similarity import normalize
+
+
+def content_hash(text: str) -> str:
+    """Hash of a chunk's text, ignoring case and whitespace differences."""
+    return hashlib.sha256(re.sub(r"\s+", " ", text).strip().lower().encode("utf-8")).hexdigest()
+
+
+def _merge_sources(target: Document, duplicate: Document) -> None:
+    sources = duplicate.metadata.get("sources") or [duplicate.metadata.get("source")]
+    for source in sources:
+        if source and source not in target.metadata["sources"]:
+            target.metadata["sources"].append(source)
+    target.metadata["source"] = ", ".join(target.metadata["sources"])
+
+
+async def deduplicate_documents(
+    groups: List[List[Document]],
+    embeddings,
+    similarity_threshold: float = 0.95,
+    vectors: dict[str, np.ndarray] | None = None,
+) -> tuple[List[List[Document]], int]:
+    """
+    Remove repeated chunks across the document groups of a research run.
+
+    A chunk is a duplicate when its normalized text hashes like an earlier chunk's or, if
+    similarity_threshold > 0, when its embedding is at least that similar to an earlier chunk's.
+    The first occurrence is kept in its group and gains the sources of its duplicates under
+    `metadata["sources"]`; `metadata["source"]` lists them all.
+
+    Args:
+        groups: Documents per sub-query, in priority order.
+        embeddings: Embeddings client used for the near-duplicate check.
+        similarity_threshold: Minimum cosine similarity of near-duplicates (0 = exact only).
+        vectors: Known chunk embeddings keyed by content_hash(), e.g. ChunkIndex.packed_vectors.
+            Only chunks missing from it are embedded for the near-duplicate check.
+
+    Returns:
+        tuple: The deduplicated groups (copies of the kept documents) and the number removed.
+    """
+    kept: List[Document] = []
+    kept_hashes: List[str] = []
+    by_hash: dict[str, Document] = {}
+    assignments: List[List[Document]] = []
+    removed = 0
+    for group in groups:
+        group_kept = []
+        for doc in group:
+            key = content_hash(doc.page_content)
+            if key in by_hash:
+                _merge_sources(by_hash[key], doc)
+                removed += 1
+                continue
+            copy = Document(page_content=doc.page_content, metadata=dict(doc.metadata))
+            copy.metadata["sources"] = [doc.metadata["source"]] if doc.metadata.get("source") else []
+            by_hash[key] = copy
+            kept.append(copy)
+            kept_hashes.append(key)
+            group_kept.append(copy)
+        assignments.append(group_kept)
+
+    if similarity_threshold > 0 and len(kept) > 1:
+        known = vectors or {}
+        missing = [i for i, key in enumerate(kept_hashes) if key not in known]
+        embedded = await embeddings.aembed_documents([kept[i].page_content for i in missing]) if missing else []
+        rows = [known.get(key) for key in kept_hashes]
+        for i, vector in zip(missing, embedded):
+            rows[i] = vector
+        matrix = normalize(np.asarray(rows, dtype=np.float32))
+        similarities = matrix @ matrix.T
+        duplicate_of: dict[int, int] = {}
+        for i in range(1, len(kept)):
+            # Compare only with earlier chunks that are themselves kept
+            earlier = [j for j in range(i) if j not in duplicate_of]
+            best = earlier[int(np.argmax(similarities[i, earlier]))]
+            if similarities[i, best] >= similarity_threshold:
+                duplicate_of[i] = best
+                _merge_sources(kept[best], kept[i])
+        if duplicate_of:
+            dropped = {id(kept[i]) for i in duplicate_of}
+            assignments = [[doc for doc in group if id(doc) not in dropped] for group in assignments]
+            removed += len(duplicate_of)
+
+    return assignments, removed
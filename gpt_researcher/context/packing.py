@@ -0,0 +1,180 @@
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Sequence
+
+import numpy as np
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Tokens kept free for the prompt template and instructions around the research context
+PROMPT_RESERVE_TOKENS = 2000
+
+# Context windows by model name prefix; the longest matching prefix wins
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4.1": 1047576,
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "gpt-5": 400000,
+    "o1": 200000,
+    "o3": 200000,
+    "o4-mini": 200000,
+    "claude": 200000,
+    "gemini": 1048576,
+    "deepseek": 64000,
+    "mistral": 32000,
+    "llama3": 8192,
+    "llama3.1": 128000,
+    "qwen": 32000,
+}
+DEFAULT_CONTEXT_WINDOW = 32000
+
+# Rough characters per token, used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=32)
+def get_tokenizer(model: str):
+    """
+    tiktoken encoding for a model, falling back to o200k_base for unknown (non-OpenAI) models.
+    Returns None when no encoding can be loaded (e.g. offline without a tiktoken cache).
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except (KeyError, ValueError):
+        pass
+    except Exception as e:
+        logger.warning(f"无法加载 {model} 的分词器，将按字符数估算 token: {e}")
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"无法加载 o200k_base 分词器，将按字符数估算 token: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    tokenizer = get_tokenizer(model)
+    if tokenizer is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(tokenizer.encode(text, disallowed_special=()))
+
+
+def get_context_window(model: str) -> int:
+    name = model.split("/")[-1].lower()
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if name.startswith(prefix)]
+    if not matches:
+        return DEFAULT_CONTEXT_WINDOW
+    return MODEL_CONTEXT_WINDOWS[max(matches, key=len)]
+
+
+def get_context_budget(cfg) -> int:
+    """
+    Token budget for the research context handed to the report writer.
+
+    Derived from the smart model's context window (or CONTEXT_WINDOW_TOKENS) minus its output
+    limit and a prompt reserve, and capped by MAX_CONTEXT_TOKENS.
+    """
+    window = getattr(cfg, "context_window_tokens", 0) or get_context_window(cfg.smart_llm_model)
+    available = window - cfg.smart_token_limit - PROMPT_RESERVE_TOKENS
+    max_tokens = getattr(cfg, "max_context_tokens", 0)
+    budget = min(available, max_tokens) if max_tokens else available
+    return max(budget, 0)
+
+
+@dataclass
+class PackResult:
+    """Items selected by a packer, in selection order, with the tokens they use."""
+    indices: List[int] = field(default_factory=list)
+    tokens_used: int = 0
+    budget: int = 0
+
+    def select(self, items: Sequence):
+        return [items[i] for i in self.indices]
+
+
+def pack_by_mmr(
+    relevance: np.ndarray,
+    vectors: np.ndarray,
+    token_counts: Sequence[int],
+    budget: int,
+    lambda_mult: float = 0.7,
+    max_items: int | None = None,
+) -> PackResult:
+    """
+    Greedily select items by maximal marginal relevance until the token budget is used up.
+
+    Args:
+        relevance: Similarity of each candidate to the query.
+        vectors: L2-normalized candidate embeddings, one row per candidate.
+        token_counts: Token count of each candidate.
+        budget: Maximum total tokens of the selected items.
+        lambda_mult: Trade-off between relevance (1.0) and diversity (0.0).
+        max_items: Optional cap on the number of selected items.
+    """
+    result = PackResult(budget=budget)
+    remaining = list(range(len(relevance)))
+    redundancy = np.zeros(len(relevance), dtype=np.float32)
+
+    while remaining and (max_items is None or len(result.indices) < max_items):
+        fitting = [i for i in remaining if result.tokens_used + token_counts[i] <= budget]
+        if not fitting:
+            break
+        scores = lambda_mult * relevance[fitting] - (1 - lambda_mult) * redundancy[fitting]
+        chosen = fitting[int(np.argmax(scores))]
+        result.indices.append(chosen)
+        result.tokens_used += token_counts[chosen]
+        remaining.remove(chosen)
+        if remaining:
+            similarity = vectors[remaining] @ vectors[chosen]
+            redundancy[remaining] = np.maximum(redundancy[remaining], similarity)
+    return result
+
+
+def pack_in_order(items: Sequence[str], budget: int, model: str, keep_last: bool = False) -> PackResult:
+    """
+    Keep items in their original order until the token budget is used up.
+
+    Args:
+        items: Texts to pack.
+        budget: Maximum total tokens.
+        model: Model whose tokenizer counts the tokens.
+        keep_last: Prefer the last items instead of the first ones.
+    """
+    result = PackResult(budget=budget)
+    order = range(len(items) - 1, -1, -1) if keep_last else range(len(items))
+    for i in order:
+        tokens = count_tokens(items[i], model)
+        if result.tokens_used + tokens > budget:
+            break
+        result.indices.append(i)
+        result.tokens_used += tokens
+    result.indices.sort()
+    return result
+
+
+def shard_by_tokens(items: Sequence[str], budget: int, model: str) -> List[List[str]]:
+    """
+    Split texts, in order, into consecutive shards of about `budget` tokens each. Texts larger
+    than a shard are cut into pieces sized from their token density.
+    """
+    shards, current, used = [], [], 0
+    for item in items:
+        tokens = count_tokens(item, model)
+        if tokens > budget:
+            size = max(int(len(item) * budget / tokens * 0.9), 1)
+            pieces = [(piece, count_tokens(piece, model)) for piece in (item[i:i + size] for i in range(0, len(item), size))]
+        else:
+            pieces = [(item, tokens)]
+        for piece, piece_tokens in pieces:
+            if current and used + piece_tokens > budget:
+                shards.append(current)
+                current, used = [], 0
+            current.append(piece)
+            used += piece_tokens
+    if current:
+        shards.append(current)
+    return shards
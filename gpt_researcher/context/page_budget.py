@@ -0,0 +1,142 @@
+"""
+Per-page content budget applied to scraped pages before they are chunked and embedded.
+
+Very large pages (books, huge forum threads, long API references) would otherwise be
+split and embedded in full for every sub-query. The budget keeps the lead of the page and
+the sections with the densest overlap with the query terms, using plain string
+operations only so that no embedding call is spent on the discarded text.
+"""
+import re
+from typing import Dict, List
+
+# Share of the budget reserved for the beginning of the page (title, intro, summary)
+LEAD_BUDGET_RATIO = 0.2
+# Sections longer than this are split into windows so scoring stays fine-grained
+MAX_SECTION_CHARS = 2000
+SECTION_SEPARATOR = "\n\n"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Han, kana and hangul runs have no spaces between words: they are tokenized as character bigrams
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+")
+CJK_NGRAM = 2
+_STOPWORDS = {
+    "the", "and", "for", "are", "but", "not", "you", "all", "any", "can", "was", "how",
+    "what", "when", "where", "which", "who", "why", "with", "from", "that", "this", "into",
+    "about", "does", "have", "has", "its", "their", "there", "these", "those", "will",
+}
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercased words of a text, with CJK runs split into overlapping character n-grams."""
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        if not _CJK_RE.search(word):
+            tokens.append(word)
+            continue
+        # Keep the non-CJK parts (e.g. "gpt4" in "gpt4模型") as words
+        tokens.extend(part for part in _CJK_RE.split(word) if part)
+        for run in _CJK_RE.findall(word):
+            if len(run) <= CJK_NGRAM:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + CJK_NGRAM] for i in range(len(run) - CJK_NGRAM + 1))
+    return tokens
+
+
+def _query_terms(query: str) -> set:
+    tokens = _tokenize(query)
+    return {
+        token for token in tokens
+        if (len(token) > 2 or _CJK_RE.match(token)) and token not in _STOPWORDS
+    } or set(tokens)
+
+
+def _split_sections(content: str) -> List[str]:
+    sections = []
+    for paragraph in re.split(r"\n\s*\n", content):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        for start in range(0, len(paragraph), MAX_SECTION_CHARS):
+            sections.append(paragraph[start:start + MAX_SECTION_CHARS])
+    return sections
+
+
+def _term_density(section: str, terms: set) -> float:
+    words = _tokenize(section)
+    if not words:
+        return 0.0
+    hits = sum(1 for word in words if word in terms)
+    return hits / len(words)
+
+
+def truncate_content(content: str, query: str, max_chars: int) -> str:
+    """
+    Reduce content to at most max_chars while preserving the most query-relevant parts.
+
+    Args:
+        content (str): The full page text.
+        query (str): The (sub-)query the page is being compressed for.
+        max_chars (int): Character budget for the page. 0 or less disables the budget.
+
+    Returns:
+        str: The content unchanged if it fits, otherwise the lead of the page followed by
+        the densest query-term sections in their original order.
+    """
+    if max_chars <= 0 or len(content) <= max_chars:
+        return content
+
+    sections = _split_sections(content)
+    terms = _query_terms(query)
+    selected = set()
+    used = 0
+
+    # Always keep the lead of the page
+    lead_budget = int(max_chars * LEAD_BUDGET_RATIO)
+    for index, section in enumerate(sections):
+        cost = len(section) + len(SECTION_SEPARATOR)
+        if used + cost > lead_budget:
+            break
+        selected.add(index)
+        used += cost
+
+    # Fill the rest of the budget with the densest sections
+    ranked = sorted(
+        (index for index in range(len(sections)) if index not in selected),
+        key=lambda index: (-_term_density(sections[index], terms), index),
+    )
+    for index in ranked:
+        cost = len(sections[index]) + len(SECTION_SEPARATOR)
+        if used + cost > max_chars:
+            continue
+        selected.add(index)
+        used += cost
+
+    if not selected:
+        return content[:max_chars]
+
+    return SECTION_SEPARATOR.join(sections[index] for index in sorted(selected))
+
+
+def apply_page_budget(pages: List[Dict], query: str, max_chars: int) -> List[Dict]:
+    """
+    Apply truncate_content to the raw_content of every page.
+
+    Args:
+        pages (List[Dict]): Scraped pages with `raw_content`, `url` and `title` keys.
+        query (str): The (sub-)query the pages are being compressed for.
+        max_chars (int): Character budget per page. 0 or less disables the budget.
+
+    Returns:
+        List[Dict]: Pages with oversized content truncated. Other keys are preserved.
+    """
+    if max_chars <= 0:
+        return pages
+
+    budgeted_pages = []
+    for page in pages:
+        raw_content = page.get("raw_content") or ""
+        if len(raw_content) > max_chars:
+            page = {**page, "raw_content": truncate_content(raw_content, query, max_chars)}
+        budgeted_pages.append(page)
+    return budgeted_pages
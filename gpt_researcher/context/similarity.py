@@ -0,0 +1,116 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from ..memory.quantization import dequantize_int8, quantize_int8
+
+# Rows dequantized at a time when scoring an int8 matrix
+_INT8_BLOCK_ROWS = 16384
+
+
+class SimilarityEngine:
+    """
+    Cosine-similarity search over a fixed set of embeddings.
+
+    Vectors are L2-normalized once into a contiguous float32 matrix, so scoring any number
+    of queries is a single matrix multiply. Top-k selection uses argpartition and only the
+    selected candidates are sorted.
+
+    With precision="int8" the matrix is kept resident as int8 codes with one scale per row
+    (about a quarter of the memory). Queries stay full precision and are scored against the
+    rows dequantized block by block, which keeps recall close to float32.
+    """
+
+    def __init__(self, vectors, precision: str = "float32"):
+        """
+        Args:
+            vectors: Array-like of shape (n, dim), one embedding per item.
+            precision: In-memory precision of the matrix, "float32" or "int8".
+        """
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(matrix), -1)
+        self.precision = precision
+        if precision == "int8" and len(matrix):
+            self.codes, self.scales = quantize_int8(normalize(matrix))
+            # Norms of the dequantized rows, so scores stay true cosine similarities
+            self.norms = np.ones(len(matrix), dtype=np.float32)
+            for start in range(0, len(matrix), _INT8_BLOCK_ROWS):
+                end = start + _INT8_BLOCK_ROWS
+                self.norms[start:end] = np.linalg.norm(dequantize_int8(self.codes[start:end], self.scales[start:end]), axis=1)
+            self.norms[self.norms == 0] = 1.0
+            self.matrix = None
+        else:
+            self.precision = "float32"
+            self.matrix = normalize(matrix)
+
+    def __len__(self) -> int:
+        return len(self.codes) if self.matrix is None else self.matrix.shape[0]
+
+    def _score(self, queries: np.ndarray) -> np.ndarray:
+        if self.matrix is not None:
+            return queries @ self.matrix.T
+        scores = np.empty((len(queries), len(self.codes)), dtype=np.float32)
+        for start in range(0, len(self.codes), _INT8_BLOCK_ROWS):
+            end = start + _INT8_BLOCK_ROWS
+            block = dequantize_int8(self.codes[start:end], self.scales[start:end])
+            scores[:, start:end] = (queries @ block.T) / self.norms[start:end]
+        return scores
+
+    def get_vectors(self, indices) -> np.ndarray:
+        """Normalized float32 vectors of the given items."""
+        indices = np.asarray(indices, dtype=np.int64)
+        if self.matrix is not None:
+            return self.matrix[indices]
+        return dequantize_int8(self.codes[indices], self.scales[indices]) / self.norms[indices][:, None]
+
+    def search(self, query_vector, k: int, threshold: float | None = None) -> List[Tuple[int, float]]:
+        """Return (index, score) pairs of the top-k items for one query, most similar first."""
+        return self.search_many([query_vector], k, threshold)[0]
+
+    def search_many(self, query_vectors, k: int, threshold: float | None = None) -> List[List[Tuple[int, float]]]:
+        """
+        Score every query against every item in one matrix multiply.
+
+        Args:
+            query_vectors: Array-like of shape (m, dim).
+            k: Maximum number of results per query.
+            threshold: Minimum cosine similarity (exclusive) of a result.
+
+        Returns:
+            list: For each query, (index, score) pairs sorted by descending score.
+        """
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        if len(self) == 0 or k <= 0 or queries.size == 0:
+            return [[] for _ in range(len(queries))]
+
+        queries = queries.reshape(len(queries), -1)
+        dim = self.matrix.shape[1] if self.matrix is not None else self.codes.shape[1]
+        if queries.shape[1] > dim:
+            # Items stored with Matryoshka truncation: compare on the leading dimensions
+            queries = queries[:, :dim]
+        scores = self._score(normalize(queries))
+        k = min(k, scores.shape[1])
+        if k < scores.shape[1]:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(k), (len(scores), k))
+
+        results = []
+        for row, row_candidates in zip(scores, candidates):
+            candidate_scores = row[row_candidates]
+            order = np.argsort(-candidate_scores, kind="stable")
+            hits = [
+                (int(row_candidates[i]), float(candidate_scores[i]))
+                for i in order
+                if threshold is None or candidate_scores[i] > threshold
+            ]
+            results.append(hits)
+        return results
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize the rows of a 2-D float32 array; zero rows are left as zeros."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(vectors / norms, dtype=np.float32)
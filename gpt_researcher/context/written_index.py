@@ -0,0 +1,69 @@
+import asyncio
+from typing import Callable, Dict, List
+
+import numpy as np
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from ..memory.embeddings import OPENAI_EMBEDDING_MODEL
+from ..utils.costs import aestimate_embedding_cost
+from .similarity import SimilarityEngine
+
+
+class WrittenSectionIndex:
+    """
+    Growing index of the sections already written in a report.
+
+    Each section is split and embedded once when it is added; lookups only embed their query
+    strings. Used by DetailedReport so later subtopics can avoid repeating earlier sections
+    without re-embedding everything written so far.
+    """
+
+    def __init__(self, embeddings, chunk_size: int = 1000, chunk_overlap: int = 100):
+        self.embeddings = embeddings
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.chunks: List[dict] = []
+        self._vectors: List[np.ndarray] = []
+        self._engine: SimilarityEngine | None = None
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    async def add(self, sections: List[Dict], cost_callback: Callable | None = None) -> None:
+        """
+        Split and embed newly written sections.
+
+        Args:
+            sections: Dicts with `section_title` and `written_content` keys.
+            cost_callback: Receives the estimated embedding cost of the new sections.
+        """
+        new_chunks = [
+            {"title": section.get("section_title", ""), "content": text}
+            for section in sections
+            for text in self.splitter.split_text(section.get("written_content", "") or "")
+        ]
+        if not new_chunks:
+            return
+        if cost_callback:
+            cost_callback(await aestimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=sections))
+
+        vectors = await self.embeddings.aembed_documents([chunk["content"] for chunk in new_chunks])
+        self.chunks.extend(new_chunks)
+        self._vectors.append(np.asarray(vectors, dtype=np.float32))
+        self._engine = None
+
+    async def search_many(self, queries: List[str], k: int = 10, similarity_threshold: float = 0.5) -> List[List[str]]:
+        """
+        Return, for each query, up to k formatted sections above the similarity threshold,
+        most similar first.
+        """
+        if not self.chunks:
+            return [[] for _ in queries]
+        if self._engine is None:
+            self._engine = SimilarityEngine(np.vstack(self._vectors))
+
+        query_vectors = await asyncio.gather(*(self.embeddings.aembed_query(query) for query in queries))
+        hits = self._engine.search_many(query_vectors, k, similarity_threshold)
+        return [
+            [f"Title: {self.chunks[i]['title']}\nContent: {self.chunks[i]['content']}\n" for i, _ in query_hits]
+            for query_hits in hits
+        ]
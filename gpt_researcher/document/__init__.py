@@ -1,5 +1,6 @@
 from .document import DocumentLoader
 from .online_document import OnlineDocumentLoader
 from .langchain_document import LangChainDocumentLoader
+from .index import LocalDocumentIndex
 
-__all__ = ['DocumentLoader', 'OnlineDocumentLoader', 'LangChainDocumentLoader']
+__all__ = ['DocumentLoader', 'OnlineDocumentLoader', 'LangChainDocumentLoader', 'LocalDocumentIndex']
@@ -1,5 +1,8 @@
 import asyncio
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Union
 from langchain_community.document_loaders import (
     PyMuPDFLoader,
@@ -12,81 +15,176 @@ from langchain_community.document_loaders import (
 )
 from langchain_community.document_loaders import BSHTMLLoader
 
+# Loader class and extra kwargs per file extension. Loaders are only instantiated for
+# the extension that is actually being parsed.
+LOADER_MAP = {
+    "pdf": (PyMuPDFLoader, {}),
+    "txt": (TextLoader, {}),
+    "doc": (UnstructuredWordDocumentLoader, {}),
+    "docx": (UnstructuredWordDocumentLoader, {}),
+    "pptx": (UnstructuredPowerPointLoader, {}),
+    "csv": (UnstructuredCSVLoader, {"mode": "elements"}),
+    "xls": (UnstructuredExcelLoader, {"mode": "elements"}),
+    "xlsx": (UnstructuredExcelLoader, {"mode": "elements"}),
+    "md": (UnstructuredMarkdownLoader, {}),
+    "html": (BSHTMLLoader, {}),
+    "htm": (BSHTMLLoader, {}),
+}
+
+# Below this many files the process pool start-up cost outweighs the parallelism gain
+PROCESS_POOL_MIN_FILES = 8
+
+
+def get_loader(file_path: str, file_extension: str):
+    """Instantiate the LangChain loader for a file, or return None for unsupported types."""
+    loader_spec = LOADER_MAP.get(file_extension)
+    if loader_spec is None:
+        return None
+    loader_class, loader_kwargs = loader_spec
+    return loader_class(file_path, **loader_kwargs)
+
+
+def parse_document(file_path: str, file_extension: str) -> list:
+    """
+    Parse a single file into plain page dicts.
+
+    This is a module-level function so it can run in a worker process; it returns plain
+    dicts rather than LangChain Documents to keep the results cheap to pickle.
+    """
+    ret_data = []
+    try:
+        loader = get_loader(file_path, file_extension)
+        if loader:
+            for page in loader.load():
+                if page.page_content:
+                    ret_data.append({
+                        "raw_content": page.page_content,
+                        "url": os.path.basename(page.metadata.get("source", file_path))
+                    })
+    except Exception as e:
+        print(f"加载文档失败：{file_path}")
+        print(e)
+
+    return ret_data
+
+
+class _ByteBudget:
+    """Bounds the total size of files being parsed at the same time."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, size: int) -> None:
+        async with self._condition:
+            # A single file larger than the budget is still allowed through on its own
+            await self._condition.wait_for(
+                lambda: self.in_flight == 0 or self.in_flight + size <= self.max_bytes
+            )
+            self.in_flight += size
+
+    async def release(self, size: int) -> None:
+        async with self._condition:
+            self.in_flight -= size
+            self._condition.notify_all()
+
 
 class DocumentLoader:
 
-    def __init__(self, path: Union[str, List[str]]):
+    def __init__(
+        self,
+        path: Union[str, List[str]],
+        max_workers: int | None = None,
+        max_in_flight_files: int | None = None,
+        max_in_flight_bytes: int = 512 * 1024 * 1024,
+    ):
+        """
+        Args:
+            path: A directory to walk, or a list of file paths.
+            max_workers: Number of parser processes. Defaults to the number of CPUs.
+            max_in_flight_files: Maximum number of files parsed at once. Defaults to twice max_workers.
+            max_in_flight_bytes: Maximum combined size of the files parsed at once.
+        """
         self.path = path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight_files = max_in_flight_files or self.max_workers * 2
+        self.max_in_flight_bytes = max_in_flight_bytes
 
-    async def load(self) -> list:
-        tasks = []
+    def _collect_files(self) -> list:
+        files = []
         if isinstance(self.path, list):
             for file_path in self.path:
                 if os.path.isfile(file_path):  # Ensure it's a valid file
-                    filename = os.path.basename(file_path)
-                    file_name, file_extension_with_dot = os.path.splitext(filename)
-                    file_extension = file_extension_with_dot.strip(".").lower()
-                    tasks.append(self._load_document(file_path, file_extension))
-                    
+                    files.append(file_path)
+
         elif isinstance(self.path, (str, bytes, os.PathLike)):
-            for root, dirs, files in os.walk(self.path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    file_name, file_extension_with_dot = os.path.splitext(file)
-                    file_extension = file_extension_with_dot.strip(".").lower()
-                    tasks.append(self._load_document(file_path, file_extension))
-                    
+            for root, dirs, filenames in os.walk(self.path):
+                for file in filenames:
+                    files.append(os.path.join(root, file))
+
         else:
             raise ValueError("路径类型无效。应为 str、bytes、os.PathLike 或它们的列表。")
 
-        # for root, dirs, files in os.walk(self.path):
-        #     for file in files:
-        #         file_path = os.path.join(root, file)
-        #         file_name, file_extension_with_dot = os.path.splitext(file_path)
-        #         file_extension = file_extension_with_dot.strip(".")
-        #         tasks.append(self._load_document(file_path, file_extension))
+        # Only keep files a loader exists for, so no worker time is spent on the rest
+        return [
+            (file_path, self._get_extension(file_path))
+            for file_path in files
+            if self._get_extension(file_path) in LOADER_MAP
+        ]
+
+    async def load(self) -> list:
+        results = await self.load_by_file()
+        docs = [page for pages in results.values() for page in pages]
 
-        docs = []
-        for pages in await asyncio.gather(*tasks):
-            for page in pages:
-                if page.page_content:
-                    docs.append({
-                        "raw_content": page.page_content,
-                        "url": os.path.basename(page.metadata['source'])
-                    })
-                    
         if not docs:
             raise ValueError("🤷 未能加载任何文档！")
 
         return docs
 
-    async def _load_document(self, file_path: str, file_extension: str) -> list:
-        ret_data = []
+    async def load_by_file(self) -> dict:
+        """Parse every supported file and return its pages keyed by file path."""
+        files = self._collect_files()
+
+        executor = None
+        if len(files) >= PROCESS_POOL_MIN_FILES and self.max_workers > 1:
+            # Spawned workers do not inherit the event loop, threads and locks of this process
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
         try:
-            loader_dict = {
-                "pdf": PyMuPDFLoader(file_path),
-                "txt": TextLoader(file_path),
-                "doc": UnstructuredWordDocumentLoader(file_path),
-                "docx": UnstructuredWordDocumentLoader(file_path),
-                "pptx": UnstructuredPowerPointLoader(file_path),
-                "csv": UnstructuredCSVLoader(file_path, mode="elements"),
-                "xls": UnstructuredExcelLoader(file_path, mode="elements"),
-                "xlsx": UnstructuredExcelLoader(file_path, mode="elements"),
-                "md": UnstructuredMarkdownLoader(file_path),
-                "html": BSHTMLLoader(file_path),
-                "htm": BSHTMLLoader(file_path)
-            }
-
-            loader = loader_dict.get(file_extension, None)
-            if loader:
+            results = await self._parse_files(files, executor)
+        except BrokenProcessPool:
+            print("文档解析进程池异常，改为在线程中解析")
+            results = await self._parse_files(files, None)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        return {file_path: pages for (file_path, _), pages in zip(files, results)}
+
+    async def _parse_files(self, files: list, executor: ProcessPoolExecutor | None) -> list:
+        loop = asyncio.get_running_loop()
+        file_slots = asyncio.Semaphore(self.max_in_flight_files)
+        byte_budget = _ByteBudget(self.max_in_flight_bytes)
+
+        async def parse(file_path: str, file_extension: str) -> list:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
+            async with file_slots:
+                await byte_budget.acquire(size)
                 try:
-                    ret_data = loader.load()
-                except Exception as e:
-                    print(f"加载 HTML 文档失败：{file_path}")
-                    print(e)
+                    if executor is None:
+                        return await asyncio.to_thread(parse_document, file_path, file_extension)
+                    return await loop.run_in_executor(executor, parse_document, file_path, file_extension)
+                finally:
+                    await byte_budget.release(size)
 
-        except Exception as e:
-            print(f"加载文档失败：{file_path}")
-            print(e)
+        return await asyncio.gather(*(parse(file_path, ext) for file_path, ext in files))
 
-        return ret_data
+    @staticmethod
+    def _get_extension(file_path: str) -> str:
+        return os.path.splitext(file_path)[1].strip(".").lower()
@@ -0,0 +1,311 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from typing import List
+
+import numpy as np
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from ..context.ann_index import HNSWIndex
+from ..memory.quantization import VectorCodec
+from .document import DocumentLoader, LOADER_MAP
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    PRIMARY KEY (root, path)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_by_file ON chunks (root, path);
+CREATE TABLE IF NOT EXISTS chunk_embeddings (
+    chunk_id INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (chunk_id, model)
+);
+"""
+
+
+def _file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LocalDocumentIndex:
+    """
+    Persistent, incremental index of a local document directory (DOC_PATH).
+
+    A SQLite file keeps a manifest of every indexed file (path, size, mtime, sha256),
+    the parsed chunks of each file and, once computed, the chunk embeddings per embedding
+    model. Each load() only re-parses files that are new or whose content changed, and
+    drops files that were removed from disk. Writes take the SQLite write lock, so several
+    runs may share one index file.
+    """
+
+    def __init__(
+        self,
+        doc_path: str,
+        index_path: str,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 100,
+        loader_kwargs: dict | None = None,
+        codec: VectorCodec | None = None,
+    ):
+        """
+        Args:
+            doc_path: Directory containing the documents.
+            index_path: Path of the SQLite index file. Parent directories are created.
+            chunk_size: Chunk size used to split parsed documents.
+            chunk_overlap: Overlap between consecutive chunks.
+            loader_kwargs: Extra keyword arguments for the DocumentLoader used to parse changed files.
+            codec: Storage encoding of the chunk embeddings. Defaults to full-precision float32.
+        """
+        self.doc_path = doc_path
+        self.root = os.path.abspath(doc_path)
+        self.index_path = index_path
+        self.loader_kwargs = loader_kwargs or {}
+        self.codec = codec or VectorCodec()
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    def _connect(self) -> sqlite3.Connection:
+        index_dir = os.path.dirname(os.path.abspath(self.index_path))
+        os.makedirs(index_dir, exist_ok=True)
+        # Transactions are managed explicitly by _write_transaction; the busy timeout makes
+        # concurrent runs sharing the index file wait for each other's writes
+        conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    @contextmanager
+    def _write_transaction(self):
+        """
+        A connection inside a transaction that holds the database write lock from the start
+        (BEGIN IMMEDIATE), committed on success and always closed.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def _scan_files(self) -> dict:
+        files = {}
+        for root, dirs, filenames in os.walk(self.root):
+            for file in filenames:
+                file_path = os.path.join(root, file)
+                if DocumentLoader._get_extension(file_path) not in LOADER_MAP:
+                    continue
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                files[file_path] = (stat.st_size, stat.st_mtime)
+        return files
+
+    def _plan_updates(self) -> tuple[list, dict]:
+        """Compare the directory with the manifest and return (changed paths, new manifest rows)."""
+        on_disk = self._scan_files()
+        changed = []
+        manifest_updates = {}
+        touched = []
+
+        with closing(self._connect()) as conn:
+            manifest = {
+                path: (size, mtime, sha256)
+                for path, size, mtime, sha256 in conn.execute(
+                    "SELECT path, size, mtime, sha256 FROM files WHERE root = ?", (self.root,)
+                )
+            }
+
+        # Files are hashed outside of any transaction so other runs are not blocked meanwhile
+        for path, (size, mtime) in on_disk.items():
+            entry = manifest.get(path)
+            if entry and entry[0] == size and entry[1] == mtime:
+                continue
+            sha256 = _file_sha256(path)
+            if entry and entry[2] == sha256:
+                # Touched but unchanged: only refresh the manifest
+                touched.append((size, mtime, self.root, path))
+                continue
+            changed.append(path)
+            manifest_updates[path] = (size, mtime, sha256)
+
+        removed = [path for path in manifest if path not in on_disk]
+        if removed or touched:
+            with self._write_transaction() as conn:
+                for path in removed:
+                    self._delete_file(conn, path)
+                conn.executemany(
+                    "UPDATE files SET size = ?, mtime = ? WHERE root = ? AND path = ?", touched
+                )
+
+        return changed, manifest_updates
+
+    def _delete_file(self, conn: sqlite3.Connection, path: str) -> None:
+        conn.execute(
+            "DELETE FROM chunk_embeddings WHERE chunk_id IN "
+            "(SELECT id FROM chunks WHERE root = ? AND path = ?)",
+            (self.root, path),
+        )
+        conn.execute("DELETE FROM chunks WHERE root = ? AND path = ?", (self.root, path))
+        conn.execute("DELETE FROM files WHERE root = ? AND path = ?", (self.root, path))
+
+    def _store(self, parsed: dict, manifest_updates: dict) -> None:
+        with self._write_transaction() as conn:
+            for path, pages in parsed.items():
+                self._delete_file(conn, path)
+                if not pages:
+                    # Failed (or empty) parses are not recorded in the manifest, so the next
+                    # update() retries them
+                    continue
+                chunk_index = 0
+                for page in pages:
+                    for chunk in self.splitter.split_text(page["raw_content"]):
+                        conn.execute(
+                            "INSERT INTO chunks (root, path, chunk_index, source, content) VALUES (?, ?, ?, ?, ?)",
+                            (self.root, path, chunk_index, page["url"], chunk),
+                        )
+                        chunk_index += 1
+                size, mtime, sha256 = manifest_updates[path]
+                conn.execute(
+                    "INSERT INTO files (root, path, size, mtime, sha256, indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.root, path, size, mtime, sha256, time.time()),
+                )
+
+    def _read_chunks(self) -> list:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, source, content FROM chunks WHERE root = ? ORDER BY path, chunk_index",
+                (self.root,),
+            ).fetchall()
+        return [
+            {"raw_content": content, "url": source, "chunk_id": chunk_id}
+            for chunk_id, source, content in rows
+        ]
+
+    async def update(self) -> int:
+        """
+        Bring the index up to date with the directory.
+
+        Returns:
+            int: Number of files that were (re-)parsed.
+        """
+        changed, manifest_updates = await asyncio.to_thread(self._plan_updates)
+        if changed:
+            parsed = await DocumentLoader(changed, **self.loader_kwargs).load_by_file()
+            await asyncio.to_thread(self._store, parsed, manifest_updates)
+        return len(changed)
+
+    async def load(self) -> list:
+        """
+        Update the index and return all chunks in the same shape as DocumentLoader.load().
+
+        Returns:
+            list: Dicts with `raw_content`, `url` and `chunk_id` keys.
+        """
+        await self.update()
+        docs = await asyncio.to_thread(self._read_chunks)
+        if not docs:
+            raise ValueError("🤷 未能加载任何文档！")
+        return docs
+
+    def _read_embeddings(self, chunk_ids: List[int], model: str) -> dict:
+        vectors = {}
+        with closing(self._connect()) as conn:
+            for start in range(0, len(chunk_ids), 500):
+                batch = chunk_ids[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for chunk_id, vector in conn.execute(
+                    f"SELECT chunk_id, vector FROM chunk_embeddings WHERE model = ? AND chunk_id IN ({placeholders})",
+                    (model, *batch),
+                ):
+                    vectors[chunk_id] = self.codec.decode(vector)
+        return vectors
+
+    def _write_embeddings(self, rows: list, model: str) -> None:
+        with self._write_transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO chunk_embeddings (chunk_id, model, vector) VALUES (?, ?, ?)",
+                [(chunk_id, model, self.codec.encode(vector)) for chunk_id, vector in rows],
+            )
+
+    async def get_embeddings(self, docs: list, embeddings, model: str, batch_size: int = 256) -> np.ndarray:
+        """
+        Return the embedding of every chunk in docs, computing and storing only the missing ones.
+
+        Args:
+            docs: Chunks as returned by load().
+            embeddings: A LangChain embeddings client.
+            model: Name identifying the embedding provider and model (e.g. "openai:text-embedding-3-small").
+            batch_size: Number of chunks sent per embedding request.
+
+        Returns:
+            np.ndarray: float32 matrix with one row per chunk, in the order of docs.
+        """
+        if self.codec.name:
+            model = f"{model}|{self.codec.name}"
+        chunk_ids = [doc["chunk_id"] for doc in docs]
+        vectors = await asyncio.to_thread(self._read_embeddings, chunk_ids, model)
+
+        missing = [doc for doc in docs if doc["chunk_id"] not in vectors]
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            new_vectors = await embeddings.aembed_documents([doc["raw_content"] for doc in batch])
+            rows = list(zip([doc["chunk_id"] for doc in batch], new_vectors))
+            await asyncio.to_thread(self._write_embeddings, rows, model)
+            for chunk_id, vector in rows:
+                vectors[chunk_id] = self.codec.decode(self.codec.encode(vector))
+
+        if not docs:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([vectors[chunk_id] for chunk_id in chunk_ids])
+
+    async def get_ann_index(self, docs: list, embeddings, model: str, batch_size: int = 256) -> HNSWIndex:
+        """
+        Return the on-disk HNSW index of the chunks in docs for an embedding model.
+
+        Only chunks the index does not hold yet are embedded and inserted, and chunks that no
+        longer exist are removed. Requires hnswlib.
+
+        Args:
+            docs: Chunks as returned by load().
+            embeddings: A LangChain embeddings client.
+            model: Name identifying the embedding provider and model.
+            batch_size: Number of chunks sent per embedding request.
+        """
+        model_hash = hashlib.sha256(f"{model}|{self.codec.name}".encode("utf-8")).hexdigest()[:12]
+        ann_index = await asyncio.to_thread(HNSWIndex, f"{self.index_path}.{model_hash}.hnsw")
+
+        current = {doc["chunk_id"] for doc in docs}
+        stale = ann_index.labels - current
+        missing = [doc for doc in docs if doc["chunk_id"] not in ann_index.labels]
+        if missing:
+            vectors = await self.get_embeddings(missing, embeddings, model, batch_size)
+            await asyncio.to_thread(ann_index.add, [doc["chunk_id"] for doc in missing], vectors)
+        if stale:
+            ann_index.remove(stale)
+        if missing or stale:
+            await asyncio.to_thread(ann_index.save)
+        return ann_index
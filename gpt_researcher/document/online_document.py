@@ -1,26 +1,42 @@
+import asyncio
 import os
 import aiohttp
 import tempfile
-from langchain_community.document_loaders import (
-    PyMuPDFLoader,
-    TextLoader,
-    UnstructuredCSVLoader,
-    UnstructuredExcelLoader,
-    UnstructuredMarkdownLoader,
-    UnstructuredPowerPointLoader,
-    UnstructuredWordDocumentLoader
-)
+from .document import get_loader
 
 
 class OnlineDocumentLoader:
 
-    def __init__(self, urls):
+    def __init__(self, urls, max_concurrency: int = 8, max_file_size: int = 50 * 1024 * 1024, timeout: float = 6):
+        """
+        Args:
+            urls: Document URLs to download and parse.
+            max_concurrency: Maximum number of documents downloaded and parsed at once.
+            max_file_size: Maximum size in bytes of a single document; larger downloads are skipped.
+            timeout: Total timeout in seconds for a single download.
+        """
         self.urls = urls
+        self.max_concurrency = max_concurrency
+        self.max_file_size = max_file_size
+        self.timeout = timeout
 
     async def load(self) -> list:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        headers = {
+            "User-Agent": "Mozilla/5.0"
+        }
+
+        async def process(session: aiohttp.ClientSession, url: str) -> list:
+            async with semaphore:
+                return await self._download_and_process(session, url)
+
+        # One pooled session shared by all downloads
+        async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+            results = await asyncio.gather(*(process(session, url) for url in self.urls))
+
         docs = []
-        for url in self.urls:
-            pages = await self._download_and_process(url)
+        for pages in results:
             for page in pages:
                 if page.page_content:
                     docs.append({
@@ -33,24 +49,37 @@ class OnlineDocumentLoader:
 
         return docs
 
-    async def _download_and_process(self, url: str) -> list:
+    async def _download_and_process(self, session: aiohttp.ClientSession, url: str) -> list:
+        tmp_file_path = None
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0"
-            }
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=6) as response:
-                    if response.status != 200:
-                        print(f"下载失败 {url}：HTTP {response.status}")
-                        return []
-
-                    content = await response.read()
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=self._get_extension(url)) as tmp_file:
-                        tmp_file.write(content)
-                        tmp_file_path = tmp_file.name
-
-                    return await self._load_document(tmp_file_path, self._get_extension(url).strip('.'))
-        except aiohttp.ClientError as e:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            async with session.get(url, timeout=timeout) as response:
+                if response.status != 200:
+                    print(f"下载失败 {url}：HTTP {response.status}")
+                    return []
+
+                if response.content_length and response.content_length > self.max_file_size:
+                    print(f"跳过 {url}：文件大小 {response.content_length} 字节超过上限 {self.max_file_size}")
+                    return []
+
+                # Stream the body to disk instead of buffering it in memory
+                extension = self._get_extension(url)
+                with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+                    tmp_file_path = tmp_file.name
+                    size = 0
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        size += len(chunk)
+                        if size > self.max_file_size:
+                            print(f"跳过 {url}：文件大小超过上限 {self.max_file_size}")
+                            return []
+                        tmp_file.write(chunk)
+
+            # Parsing is blocking, keep it off the event loop
+            pages = await asyncio.to_thread(self._load_document, tmp_file_path, extension.strip('.'))
+            for page in pages:
+                page.metadata["source"] = url
+            return pages
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"处理失败 {url}")
             print(e)
             return []
@@ -58,31 +87,20 @@ class OnlineDocumentLoader:
             print(f"处理 {url} 时发生意外错误")
             print(e)
             return []
+        finally:
+            if tmp_file_path and os.path.exists(tmp_file_path):
+                os.remove(tmp_file_path)  # 删除临时文件
 
-    async def _load_document(self, file_path: str, file_extension: str) -> list:
+    def _load_document(self, file_path: str, file_extension: str) -> list:
         ret_data = []
         try:
-            loader_dict = {
-                "pdf": PyMuPDFLoader(file_path),
-                "txt": TextLoader(file_path),
-                "doc": UnstructuredWordDocumentLoader(file_path),
-                "docx": UnstructuredWordDocumentLoader(file_path),
-                "pptx": UnstructuredPowerPointLoader(file_path),
-                "csv": UnstructuredCSVLoader(file_path, mode="elements"),
-                "xls": UnstructuredExcelLoader(file_path, mode="elements"),
-                "xlsx": UnstructuredExcelLoader(file_path, mode="elements"),
-                "md": UnstructuredMarkdownLoader(file_path)
-            }
-
-            loader = loader_dict.get(file_extension, None)
+            loader = get_loader(file_path, file_extension)
             if loader:
                 ret_data = loader.load()
 
         except Exception as e:
             print(f"加载文档失败：{file_path}")
             print(e)
-        finally:
-            os.remove(file_path)  # 删除临时文件
 
         return ret_data
 
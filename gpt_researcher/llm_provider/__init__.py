@@ -1,5 +1,33 @@
+from .cache import LLMResponseCache, configure_response_cache, get_response_cache
 from .generic import GenericLLMProvider
+from .limiter import (
+    AdaptiveConcurrencyLimiter,
+    LLMConcurrencyController,
+    Priority,
+    get_llm_concurrency_controller,
+    set_llm_session,
+)
+from .registry import ProviderRegistry, get_provider_registry
+from .replay import ReplayChatModel, ReplayMissError, configure_llm_replay
+from .runtime import configure_llm_runtime
+from .semantic_cache import SemanticCache, get_semantic_cache
 
 __all__ = [
     "GenericLLMProvider",
+    "LLMResponseCache",
+    "configure_response_cache",
+    "get_response_cache",
+    "AdaptiveConcurrencyLimiter",
+    "LLMConcurrencyController",
+    "get_llm_concurrency_controller",
+    "Priority",
+    "set_llm_session",
+    "ProviderRegistry",
+    "get_provider_registry",
+    "ReplayChatModel",
+    "ReplayMissError",
+    "configure_llm_replay",
+    "configure_llm_runtime",
+    "SemanticCache",
+    "get_semantic_cache",
 ]
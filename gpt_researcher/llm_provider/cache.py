@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_by_last_used ON responses (last_used);
+"""
+
+
+def response_cache_key(provider: str, messages: Any, params: dict) -> str:
+    """
+    Key of a chat completion: sha256 over the provider, the messages and every parameter that
+    changes the output (model, temperature, token limit, LLM kwargs, tools...).
+    """
+    payload = json.dumps(
+        {"provider": provider, "messages": messages, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Persistent exact-match cache of chat completion responses.
+
+    Responses are stored in a SQLite file under a key computed by response_cache_key. Entries
+    older than ttl seconds are ignored and purged, and once the cache holds more than
+    max_entries responses the least recently used ones are evicted.
+    """
+
+    def __init__(self, path: str, ttl: float = 86400, max_entries: int = 10000):
+        """
+        Args:
+            path: Path of the SQLite file. Parent directories are created.
+            ttl: Lifetime of a response in seconds (0 = no expiry).
+            max_entries: Maximum number of cached responses (0 = unbounded).
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for the key, if present and not expired."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, created = row
+            if self.ttl and now - created > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response, purging expired entries and evicting above max_entries."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            if self.ttl:
+                conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            if self.max_entries:
+                (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM responses WHERE rowid IN "
+                        "(SELECT rowid FROM responses ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+
+
+_response_cache: LLMResponseCache | None = None
+
+
+def configure_response_cache(path: str, ttl: float = 86400, max_entries: int = 10000) -> None:
+    """
+    Enable the process-wide response cache used by create_chat_completion, or disable it
+    with an empty path.
+    """
+    global _response_cache
+    if not path:
+        _response_cache = None
+        return
+    current = _response_cache
+    if current is None or (current.path, current.ttl, current.max_entries) != (path, ttl, max_entries):
+        _response_cache = LLMResponseCache(path, ttl=ttl, max_entries=max_entries)
+
+
+def get_response_cache() -> LLMResponseCache | None:
+    """Get the configured response cache, or None when caching is disabled."""
+    return _response_cache
@@ -1,3 +1,3 @@
-from .base import GenericLLMProvider
+from .base import GenericLLMProvider, PartialStreamError
 
-__all__ = ["GenericLLMProvider"]
\ No newline at end of file
+__all__ = ["GenericLLMProvider", "PartialStreamError"]
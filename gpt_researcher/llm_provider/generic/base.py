@@ -4,12 +4,14 @@ import importlib
 import json
 import subprocess
 import sys
+import time
 import traceback
 from typing import Any
 from colorama import Fore, Style, init
 import os
 from enum import Enum
 
+from gpt_researcher.llm_provider.replay import get_chat_recorder, request_hash
 from gpt_researcher.utils.openai_base_url import normalize_openai_base_url
 
 _SUPPORTED_PROVIDERS = {
@@ -35,6 +37,7 @@ _SUPPORTED_PROVIDERS = {
     "vllm_openai",
     "aimlapi",
     "netmind",
+    "replay",
 }
 
 NO_SUPPORT_TEMPERATURE_MODELS = [
@@ -70,21 +73,39 @@ class ReasoningEfforts(Enum):
     Low = "low"
 
 
+class PartialStreamError(RuntimeError):
+    """
+    A streamed response failed after part of it was already sent to the client. Retrying
+    would send that part again, so this error is never retried.
+    """
+
+
 class ChatLogger:
-    """用于记录所有聊天请求及其对应响应，并保存调用栈跟踪。"""
+    """
+    用于记录所有聊天请求及其对应响应，并保存调用栈跟踪。
+
+    Records also carry what the replay provider needs to serve them again: the request hash,
+    the model, streamed chunks as [seconds since the request, text] pairs, the total elapsed
+    time and the token usage.
+    """
 
     def __init__(self, fname: str):
         self.fname = fname
         self._lock = asyncio.Lock()
 
-    async def log_request(self, messages, response):
+    async def log_request(self, messages, response, model=None, chunks=None, elapsed=None, usage=None):
         async with self._lock:
             async with aiofiles.open(self.fname, mode="a", encoding="utf-8") as handle:
                 await handle.write(json.dumps({
+                    "hash": request_hash(messages),
+                    "model": model,
                     "messages": messages,
                     "response": response,
+                    "chunks": chunks,
+                    "elapsed": elapsed,
+                    "usage": usage,
                     "stacktrace": traceback.format_exc()
-                }) + "\n")
+                }, default=str) + "\n")
 
 class GenericLLMProvider:
 
@@ -246,6 +267,10 @@ class GenericLLMProvider:
             from langchain_netmind import ChatNetmind
 
             llm = ChatNetmind(**kwargs)
+        elif provider == "replay":
+            from gpt_researcher.llm_provider.replay import ReplayChatModel
+
+            llm = ReplayChatModel(**kwargs)
         else:
             supported = ", ".join(_SUPPORTED_PROVIDERS)
             raise ValueError(
@@ -254,38 +279,84 @@ class GenericLLMProvider:
         return cls(llm, chat_log, verbose=verbose)
 
 
-    async def get_chat_response(self, messages, stream, websocket=None, **kwargs):
+    async def get_chat_response(self, messages, stream, websocket=None, on_usage=None, **kwargs):
+        """
+        Get the model's response text.
+
+        on_usage, when given, is called with the token usage reported by the provider
+        (LangChain usage_metadata), if any.
+        """
+        chat_logger = self.chat_logger or get_chat_recorder()
+        usage = {}
+        chunks = [] if chat_logger else None
+        start = time.monotonic()
         if not stream:
             # 使用 ainvoke 异步从模型链获取输出
             output = await self.llm.ainvoke(messages, **kwargs)
 
             res = output.content
+            if output.usage_metadata:
+                usage = dict(output.usage_metadata)
+                if on_usage:
+                    on_usage(usage)
 
         else:
-            res = await self.stream_response(messages, websocket, **kwargs)
-
-        if self.chat_logger:
-            await self.chat_logger.log_request(messages, res)
+            res = await self.stream_response(messages, websocket, on_usage=usage.update, chunks=chunks, **kwargs)
+            if on_usage and usage:
+                on_usage(usage)
+
+        if chat_logger:
+            await chat_logger.log_request(
+                messages,
+                res,
+                model=getattr(self.llm, "model_name", None) or getattr(self.llm, "model", None),
+                chunks=chunks if stream else None,
+                elapsed=time.monotonic() - start,
+                usage=usage or None,
+            )
 
         return res
 
-    async def stream_response(self, messages, websocket=None, **kwargs):
+    async def stream_response(self, messages, websocket=None, on_usage=None, chunks=None, **kwargs):
+        """
+        Stream the response to the websocket (or console) paragraph by paragraph.
+
+        chunks, when given, receives every streamed chunk as [seconds since the start, text].
+        """
         paragraph = ""
         response = ""
+        usage = {}
+        start = time.monotonic()
+        sent = False
 
         # 使用 langchain 的 astream 方法流式输出响应
-        async for chunk in self.llm.astream(messages, **kwargs):
-            content = chunk.content
-            if content is not None:
-                response += content
-                paragraph += content
-                if "\n" in paragraph:
-                    await self._send_output(paragraph, websocket)
-                    paragraph = ""
+        try:
+            async for chunk in self.llm.astream(messages, **kwargs):
+                # Providers report usage in one final chunk or spread over several (e.g. input tokens first)
+                for key, value in (getattr(chunk, "usage_metadata", None) or {}).items():
+                    if isinstance(value, int):
+                        usage[key] = usage.get(key, 0) + value
+                content = chunk.content
+                if chunks is not None and content:
+                    chunks.append([time.monotonic() - start, content])
+                if content is not None:
+                    response += content
+                    paragraph += content
+                    if "\n" in paragraph:
+                        sent = True
+                        await self._send_output(paragraph, websocket)
+                        paragraph = ""
+        except Exception as e:
+            if sent:
+                raise PartialStreamError(f"流式响应在输出 {len(response)} 个字符后中断: {e}") from e
+            raise
 
         if paragraph:
             await self._send_output(paragraph, websocket)
 
+        if on_usage and usage:
+            on_usage(usage)
+
         return response
 
     async def _send_output(self, content, websocket=None):
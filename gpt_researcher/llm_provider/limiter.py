@@ -0,0 +1,346 @@
+"""
+Adaptive per-provider concurrency control, scheduling and retries for LLM calls.
+
+Each provider gets an AIMD limiter: the number of concurrent requests grows additively while
+calls succeed and is halved when the provider answers 429, so research runs settle at the
+highest throughput the provider sustains. Retryable failures (rate limits, overload, 5xx,
+timeouts) are retried with jittered exponential backoff, honoring Retry-After.
+
+Calls waiting for a slot are served by priority class (interactive report writing, then
+planning, then background work) and shared fairly between concurrent research sessions,
+within optional per-provider request and token budgets.
+"""
+import asyncio
+import contextvars
+import email.utils
+import itertools
+import logging
+import random
+import time
+from collections import defaultdict
+from enum import IntEnum
+from typing import Awaitable, Callable, ClassVar, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeout, conflict, rate limit, server errors, overloaded (529)
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+# Exception class names raised by provider SDKs for transient network failures
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout", "TimeoutError", "TimeoutException"}
+
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+
+def get_status_code(error: BaseException) -> int | None:
+    status = getattr(error, "status_code", None) or getattr(error, "http_status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None and type(error).__name__ == "RateLimitError":
+        status = 429
+    return status if isinstance(status, int) else None
+
+
+def get_retry_after(error: BaseException) -> float | None:
+    """Seconds to wait according to the Retry-After(-ms) headers of a provider error, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    status = get_status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Full-jitter exponential backoff for the given (0-based) retry attempt."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class Priority(IntEnum):
+    """Scheduling classes of LLM calls; lower values are served first."""
+    INTERACTIVE = 0  # Report writing a user is watching
+    PLANNING = 1  # Agent choice, sub-queries, outlines, tool selection
+    BACKGROUND = 2  # Curation, summaries and other background work
+
+
+_session: contextvars.ContextVar[Hashable | None] = contextvars.ContextVar("llm_session", default=None)
+
+
+def set_llm_session(session: Hashable) -> None:
+    """
+    Attribute the LLM calls of the current task (and the tasks it starts) to a research
+    session, unless an enclosing research already did, so nested researchers share their
+    parent's fair share.
+    """
+    if _session.get() is None:
+        _session.set(session)
+
+
+class TokenBucket:
+    """Per-minute budget refilled continuously; a rate of 0 means unlimited."""
+
+    def __init__(self, per_minute: float = 0):
+        self.per_minute = per_minute
+        self.available = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.available = min(self.per_minute, self.available + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` (capped at the budget) is available."""
+        if not self.per_minute:
+            return 0.0
+        self._refill(now)
+        missing = min(amount, self.per_minute) - self.available
+        return max(missing, 0.0) * 60 / self.per_minute
+
+    def consume(self, amount: float) -> None:
+        if self.per_minute:
+            self.available -= min(amount, self.per_minute)
+
+
+class _Ticket:
+    __slots__ = ("priority", "session", "tokens", "seq", "future")
+
+    def __init__(self, priority, session, tokens, seq, future):
+        self.priority = priority
+        self.session = session
+        self.tokens = tokens
+        self.seq = seq
+        self.future = future
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit and request scheduler for one provider.
+
+    The limit grows by about one slot per `limit` successful calls and is halved on a rate
+    limit response, never leaving [min_limit, max_limit]. A Retry-After pauses new calls to
+    the provider until it has elapsed.
+
+    Waiting calls are granted by priority class first, then to the research session that has
+    been served least, then in arrival order. Optional requests- and tokens-per-minute budgets
+    hold back calls that would exceed them.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+    ):
+        self.limit = float(max(min(initial, max_limit), min_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._waiting: list[_Ticket] = []
+        self._served: dict = defaultdict(int)
+        self._seq = itertools.count()
+        self._loop = None
+        self._timer = None
+
+    def _check_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Waiters and in-flight calls of a previous event loop are gone
+            self._loop = loop
+            self._waiting = []
+            self._timer = None
+            self.in_flight = 0
+        return loop
+
+    async def acquire(self, priority: Priority = Priority.PLANNING, session: Hashable | None = None, tokens: int = 0) -> None:
+        """Wait until the scheduler grants this call a slot."""
+        loop = self._check_loop()
+        ticket = _Ticket(priority, session, tokens, next(self._seq), loop.create_future())
+        self._waiting.append(ticket)
+        self._dispatch()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+            elif ticket.future.done() and not ticket.future.cancelled():
+                await self.release()
+            raise
+
+    async def release(self) -> None:
+        self._check_loop()
+        self.in_flight = max(self.in_flight - 1, 0)
+        self._dispatch()
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is None:
+            self._timer = self._loop.call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        self._waiting = [ticket for ticket in self._waiting if not ticket.future.done()]
+        while self._waiting and self.in_flight < int(self.limit):
+            now = time.monotonic()
+            if self.paused_until > now:
+                self._schedule(self.paused_until - now)
+                return
+            ticket = min(self._waiting, key=lambda t: (t.priority, self._served[t.session], t.seq))
+            wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(ticket.tokens, now))
+            if wait > 0:
+                # Lower priority calls may not jump ahead and use up the budget
+                self._schedule(wait)
+                return
+            self._waiting.remove(ticket)
+            self.requests.consume(1)
+            self.tokens.consume(ticket.tokens)
+            self.in_flight += 1
+            self._served[ticket.session] += 1
+            ticket.future.set_result(None)
+        if not self._waiting and not self.in_flight:
+            self._served.clear()
+
+    def on_success(self) -> None:
+        self.limit = min(self.limit + 1.0 / self.limit, float(self.max_limit))
+
+    def on_rate_limit(self, retry_after: float | None = None) -> None:
+        self.limit = max(self.limit / 2, float(self.min_limit))
+        if retry_after:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+
+class LLMConcurrencyController:
+    """
+    Singleton LLM request scheduler holding one AdaptiveConcurrencyLimiter per provider,
+    shared by every researcher in the process.
+    """
+
+    _instance: ClassVar['LLMConcurrencyController'] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """Initialize the controller (only once)."""
+        if self._initialized:
+            return
+
+        self.initial_concurrency = 8
+        self.max_concurrency = 64
+        self.max_retries = 5
+        self.budgets: dict = {}
+        self._limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+        self._initialized = True
+
+    def configure(self, initial_concurrency: int, max_concurrency: int, max_retries: int, budgets: dict | None = None):
+        """
+        Configure the limits applied to providers.
+
+        Args:
+            initial_concurrency: Concurrent requests allowed per provider before adapting
+            max_concurrency: Upper bound of the adaptive limit
+            max_retries: Retries of a failed call on transient errors
+            budgets: Per-provider {"rpm": ..., "tpm": ...} request and token budgets per minute
+        """
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.budgets = budgets or {}
+        for provider, limiter in self._limiters.items():
+            limiter.max_limit = max_concurrency
+            limiter.limit = min(limiter.limit, float(max_concurrency))
+            budget = self.budgets.get(provider, {})
+            limiter.requests.per_minute = budget.get("rpm", 0)
+            limiter.tokens.per_minute = budget.get("tpm", 0)
+
+    def limiter(self, provider: str | None) -> AdaptiveConcurrencyLimiter:
+        key = provider or "default"
+        if key not in self._limiters:
+            budget = self.budgets.get(key, {})
+            self._limiters[key] = AdaptiveConcurrencyLimiter(
+                self.initial_concurrency,
+                max_limit=self.max_concurrency,
+                requests_per_minute=budget.get("rpm", 0),
+                tokens_per_minute=budget.get("tpm", 0),
+            )
+        return self._limiters[key]
+
+    async def call(
+        self,
+        provider: str | None,
+        func: Callable[[], Awaitable[T]],
+        priority: Priority = Priority.PLANNING,
+        tokens: int = 0,
+    ) -> T:
+        """
+        Run an LLM call when the scheduler grants it a slot, retrying transient failures.
+
+        Args:
+            provider: Provider name, e.g. "openai".
+            func: Zero-argument coroutine function performing one attempt.
+            priority: Scheduling class of the call.
+            tokens: Estimated tokens of the call (prompt and completion), charged to the
+                provider's tokens-per-minute budget.
+        """
+        limiter = self.limiter(provider)
+        session = _session.get()
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire(priority, session, tokens)
+            try:
+                result = await func()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                retry_after = get_retry_after(e)
+                if get_status_code(e) == 429:
+                    limiter.on_rate_limit(retry_after)
+                delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                logger.warning(
+                    f"{provider} 调用失败（{type(e).__name__}），{delay:.1f} 秒后进行第 {attempt + 1} 次重试，"
+                    f"当前并发上限 {int(limiter.limit)}"
+                )
+            else:
+                limiter.on_success()
+                return result
+            finally:
+                await limiter.release()
+            await asyncio.sleep(delay)
+        raise RuntimeError(f"Failed to get response from {provider} API")
+
+
+# Singleton instance
+_llm_concurrency_controller = LLMConcurrencyController()
+
+
+def get_llm_concurrency_controller() -> LLMConcurrencyController:
+    """Get the LLM concurrency controller singleton instance."""
+    return _llm_concurrency_controller
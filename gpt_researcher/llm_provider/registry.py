@@ -0,0 +1,170 @@
+"""
+Process-wide pool of LLM provider instances.
+
+Building a provider constructs a new LangChain chat client with its own HTTP connection pool,
+so every research step used to pay for client setup and fresh TLS connections. The registry
+hands out one shared GenericLLMProvider per (provider, kwargs) so clients and their keep-alive
+connections are reused across calls and researchers.
+
+Retries of transient errors are left to LLMConcurrencyController: clients whose SDK retries on
+its own are built with max_retries=0, so one rate-limited call is not multiplied by both layers.
+"""
+import asyncio
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, ClassVar, Hashable
+
+from .generic.base import GenericLLMProvider
+
+logger = logging.getLogger(__name__)
+
+# Client attributes that hold connection pools on LangChain chat models
+_CLIENT_ATTRIBUTES = ("root_async_client", "root_client", "_async_client", "_client", "async_client", "client")
+
+# Providers whose chat models take a max_retries argument for their SDK's built-in retries
+_SDK_RETRY_PROVIDERS = frozenset(
+    {"openai", "azure_openai", "anthropic", "dashscope", "deepseek", "openrouter", "vllm_openai", "aimlapi"}
+)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable, order-independent form of provider kwargs; raises TypeError for unhashable values."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+def _current_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class ProviderRegistry:
+    """
+    Singleton LRU pool of GenericLLMProvider instances keyed by (provider, frozen kwargs).
+
+    Providers are bound to the event loop they were first used on; an entry whose loop has
+    been closed is rebuilt. Providers with unhashable kwargs (e.g. custom client objects) are
+    built fresh every time.
+    """
+
+    _instance: ClassVar['ProviderRegistry'] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """Initialize the registry (only once)."""
+        if self._initialized:
+            return
+
+        self.max_size = 32
+        self._providers: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._initialized = True
+
+    def configure(self, max_size: int):
+        """
+        Configure the pool size.
+
+        Args:
+            max_size: Maximum number of pooled providers (0 = no pooling)
+        """
+        self.max_size = max_size
+        with self._lock:
+            self._evict()
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+    def _evict(self) -> None:
+        # Evicted providers are only dropped: LangChain clients may share HTTP clients between
+        # instances, so their connections are released when the last user goes away
+        while len(self._providers) > self.max_size:
+            self._providers.popitem(last=False)
+
+    def get(self, provider: str, **kwargs: Any) -> GenericLLMProvider:
+        """Return the pooled provider for these arguments, building it on first use."""
+        if provider in _SDK_RETRY_PROVIDERS:
+            # An explicit max_retries from the caller still wins
+            kwargs = {"max_retries": 0, **kwargs}
+        if self.max_size <= 0:
+            return GenericLLMProvider.from_provider(provider, **kwargs)
+        try:
+            key = (provider, _freeze(kwargs))
+        except TypeError:
+            return GenericLLMProvider.from_provider(provider, **kwargs)
+
+        loop = _current_loop()
+        with self._lock:
+            entry = self._providers.get(key)
+            if entry is not None and (entry[1] is None or not entry[1].is_closed()):
+                self._providers.move_to_end(key)
+                if entry[1] is None and loop is not None:
+                    self._providers[key] = (entry[0], loop)
+                self.hits += 1
+                return entry[0]
+
+        instance = GenericLLMProvider.from_provider(provider, **kwargs)
+        with self._lock:
+            self.misses += 1
+            self._providers[key] = (instance, loop)
+            self._providers.move_to_end(key)
+            self._evict()
+        return instance
+
+    async def shutdown(self) -> None:
+        """
+        Drop every pooled provider and close the connection pools of their clients.
+
+        Meant for process shutdown: some clients share HTTP connections with providers built
+        outside the registry.
+        """
+        with self._lock:
+            providers = [instance for instance, _ in self._providers.values()]
+            self._providers.clear()
+
+        for instance in providers:
+            for name in _CLIENT_ATTRIBUTES:
+                client = getattr(instance.llm, name, None)
+                close = getattr(client, "close", None) or getattr(client, "aclose", None)
+                if close is None:
+                    continue
+                try:
+                    result = close()
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.debug(f"关闭 LLM 客户端 {name} 失败: {e}")
+        if providers:
+            logger.info(f"已关闭 {len(providers)} 个复用的 LLM 提供方")
+
+    def reset(self):
+        """Drop pooled providers without closing them (useful for testing)."""
+        with self._lock:
+            self._providers.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Singleton instance
+_provider_registry = ProviderRegistry()
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """Get the provider registry singleton instance."""
+    return _provider_registry
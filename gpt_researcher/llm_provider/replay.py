@@ -0,0 +1,143 @@
+"""
+Record and replay LLM conversations for offline benchmarking.
+
+In record mode (LLM_RECORD_PATH) every chat request is appended to a JSONL file with its
+response, streamed chunks, timing and token usage. The `replay` provider (e.g.
+SMART_LLM=replay:./recordings/run.jsonl) then serves those responses by request hash, without
+network access or API keys, optionally reproducing the recorded latency.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, AsyncIterator
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+logger = logging.getLogger(__name__)
+
+_recorder = None
+_replay_latency = 0.0
+
+
+class ReplayMissError(KeyError):
+    """A request has no recorded response in the replayed recording."""
+
+
+def request_hash(messages: Any) -> str:
+    """Key of a chat request in recordings: sha256 over its messages."""
+    payload = json.dumps(messages, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def configure_llm_replay(record_path: str = "", latency: float = 0.0) -> None:
+    """
+    Configure recording and replay of LLM calls process-wide.
+
+    Args:
+        record_path: JSONL file every chat request is recorded to ("" = no recording)
+        latency: Multiplier of the recorded timing applied by the replay provider (0 = instant)
+    """
+    from .generic.base import ChatLogger
+
+    global _recorder, _replay_latency
+    if not record_path:
+        _recorder = None
+    elif _recorder is None or _recorder.fname != record_path:
+        _recorder = ChatLogger(record_path)
+    _replay_latency = latency
+
+
+def get_chat_recorder():
+    """The ChatLogger recording every chat request, or None when recording is disabled."""
+    return _recorder
+
+
+class _Recording:
+    """Recorded responses of a JSONL file, grouped by request hash."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records: dict[str, list[dict]] = defaultdict(list)
+        self._served: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    record = json.loads(line)
+                    key = record.get("hash") or request_hash(record["messages"])
+                    self.records[key].append(record)
+
+    def next_record(self, messages: Any) -> dict:
+        """
+        The recorded response of a request. Repeated identical requests get their recorded
+        responses in order, cycling when the recording has fewer.
+        """
+        key = request_hash(messages)
+        with self._lock:
+            records = self.records.get(key)
+            if not records:
+                raise ReplayMissError(f"{self.path} 中没有请求 {key[:12]} 的录制响应")
+            index = self._served[key]
+            self._served[key] += 1
+        return records[index % len(records)]
+
+
+@lru_cache(maxsize=None)
+def load_recording(path: str) -> _Recording:
+    return _Recording(path)
+
+
+def _usage_metadata(record: dict) -> dict | None:
+    usage = record.get("usage") or {}
+    if all(key in usage for key in ("input_tokens", "output_tokens", "total_tokens")):
+        return {key: usage[key] for key in ("input_tokens", "output_tokens", "total_tokens")}
+    return None
+
+
+class ReplayChatModel:
+    """
+    Chat model answering from a recording instead of calling an API.
+
+    Implements the ainvoke/astream subset of the LangChain chat model interface used by
+    GenericLLMProvider. Streamed responses are replayed chunk by chunk. Tool calling is not
+    recorded, so bind_tools raises NotImplementedError.
+    """
+
+    def __init__(self, model: str, **kwargs: Any):
+        """
+        Args:
+            model: Path of the JSONL recording (the model part of "replay:<path>").
+            **kwargs: Ignored model parameters (temperature, max_tokens...).
+        """
+        self.model_name = model
+        self.recording = load_recording(model)
+
+    async def _sleep(self, seconds: float) -> None:
+        if _replay_latency and seconds > 0:
+            await asyncio.sleep(seconds * _replay_latency)
+
+    async def ainvoke(self, messages: Any, **kwargs: Any) -> AIMessage:
+        record = self.recording.next_record(messages)
+        await self._sleep(record.get("elapsed") or 0)
+        return AIMessage(content=record["response"], usage_metadata=_usage_metadata(record))
+
+    async def astream(self, messages: Any, **kwargs: Any) -> AsyncIterator[AIMessageChunk]:
+        record = self.recording.next_record(messages)
+        chunks = record.get("chunks") or [[record.get("elapsed") or 0, record["response"]]]
+        previous = 0.0
+        for offset, content in chunks:
+            await self._sleep(offset - previous)
+            previous = offset
+            yield AIMessageChunk(content=content)
+        usage = _usage_metadata(record)
+        if usage:
+            yield AIMessageChunk(content="", usage_metadata=usage)
+
+    def bind_tools(self, tools: Any, **kwargs: Any):
+        raise NotImplementedError(
+            f"replay 模型 {self.model_name} 不支持工具调用：录制只包含 GenericLLMProvider.get_chat_response 的请求"
+        )
@@ -0,0 +1,84 @@
+"""
+Process-wide configuration of the LLM runtime.
+
+The provider pool, the concurrency controller with its rate budgets, the response cache,
+record/replay and the semantic cache are shared by every GPTResearcher of a process. They are
+configured once, by the server at startup or by the first researcher created, rather than
+being reset from the config of each new instance while other research runs use them.
+"""
+import logging
+import threading
+
+from .cache import configure_response_cache
+from .limiter import get_llm_concurrency_controller
+from .registry import get_provider_registry
+from .replay import configure_llm_replay
+from .semantic_cache import get_semantic_cache
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_configured = False
+# Settings the runtime was configured with, to detect later configs that differ
+_settings: dict = {}
+
+_RUNTIME_KEYS = (
+    "llm_provider_pool_size",
+    "llm_initial_concurrency",
+    "llm_max_concurrency",
+    "llm_max_retries",
+    "llm_rate_budgets",
+    "llm_cache_path",
+    "llm_cache_ttl",
+    "llm_cache_max_entries",
+    "llm_record_path",
+    "llm_replay_latency",
+    "semantic_cache_threshold",
+    "semantic_cache_max_entries",
+)
+
+
+def _runtime_settings(cfg) -> dict:
+    return {key: getattr(cfg, key, None) for key in _RUNTIME_KEYS}
+
+
+def configure_llm_runtime(cfg=None, force: bool = False) -> bool:
+    """
+    Configure the shared LLM runtime from a config, once per process.
+
+    A later config whose runtime settings differ is ignored with a warning naming the keys.
+
+    Args:
+        cfg: Config to read the settings from. Defaults to the environment and default config.
+        force: Apply the settings even if the runtime was already configured.
+
+    Returns:
+        bool: Whether the settings were applied.
+    """
+    global _configured, _settings
+    with _lock:
+        if _configured and not force:
+            if cfg is not None:
+                differing = [key.upper() for key, value in _runtime_settings(cfg).items() if _settings.get(key) != value]
+                if differing:
+                    logger.warning(f"LLM 运行时已按进程配置，忽略新配置中的不同设置: {', '.join(differing)}")
+            return False
+        if cfg is None:
+            # Imported lazily: the config module imports this package
+            from ..config import Config
+            cfg = Config()
+
+        get_provider_registry().configure(cfg.llm_provider_pool_size)
+        get_llm_concurrency_controller().configure(
+            cfg.llm_initial_concurrency,
+            cfg.llm_max_concurrency,
+            cfg.llm_max_retries,
+            cfg.llm_rate_budgets,
+        )
+        configure_response_cache(cfg.llm_cache_path, ttl=cfg.llm_cache_ttl, max_entries=cfg.llm_cache_max_entries)
+        configure_llm_replay(cfg.llm_record_path, cfg.llm_replay_latency)
+        get_semantic_cache().configure(cfg.semantic_cache_threshold, cfg.semantic_cache_max_entries)
+        _settings = _runtime_settings(cfg)
+        _configured = True
+        logger.info("已配置进程级 LLM 运行时")
+    return True
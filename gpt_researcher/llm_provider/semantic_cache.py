@@ -0,0 +1,150 @@
+"""
+Process-wide semantic cache for planning decisions.
+
+Nested research runs (deep research, detailed reports) create many researchers whose queries
+differ only slightly, and each one asks the LLM to pick an agent role and to plan sub-queries.
+The semantic cache reuses an earlier result when a new query's embedding is close enough to
+a cached one, turning those LLM calls into an in-memory lookup.
+"""
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, ClassVar, Hashable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Numbers (years, versions, amounts) and capitalized words (names, products, places)
+_KEY_TERM_RE = re.compile(r"\b(?:\w*\d\w*|[A-Z][\w.&-]*)")
+
+
+def key_terms(text: str) -> frozenset:
+    """
+    Terms of a query that must match exactly for a cache hit: embeddings of queries differing
+    only by a year or a named entity are usually more similar than any useful threshold.
+    """
+    return frozenset(_KEY_TERM_RE.findall(text or ""))
+
+
+class SemanticCache:
+    """
+    Singleton cache of results keyed by query embeddings.
+
+    Entries live in namespaces (e.g. the decision kind plus the models involved), so only
+    results produced under the same settings are ever compared. A lookup returns the value of
+    the most similar cached query with the same key terms (numbers and capitalized words) when
+    its cosine similarity reaches the threshold. Disabled until configured with a threshold.
+    """
+
+    _instance: ClassVar['SemanticCache'] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """Initialize the semantic cache (only once)."""
+        if self._initialized:
+            return
+
+        self.threshold = 0.0
+        self.max_entries = 1000
+        self._namespaces: dict = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._initialized = True
+
+    def configure(self, threshold: float, max_entries: int = 1000):
+        """
+        Configure the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit (0 = disabled)
+            max_entries: Maximum number of entries per namespace
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0 and self.max_entries > 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def lookup(self, namespace: Hashable, vector, text: str = "") -> Any | None:
+        """
+        Return the value of the most similar cached query above the threshold, if any.
+
+        Args:
+            namespace: Namespace of the lookup
+            vector: Embedding of the query
+            text: The query itself; only cached queries with the same key terms can match
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        terms = key_terms(text)
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            best = None
+            keys = [key for key in entries if entries[key][2] == terms] if entries else []
+            if keys and norm > 0:
+                similarities = np.vstack([entries[key][0] for key in keys]) @ (query / norm)
+                i = int(np.argmax(similarities))
+                if similarities[i] >= self.threshold:
+                    best = keys[i]
+                    entries.move_to_end(best)
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            value = entries[best][1]
+        logger.info(f"语义缓存命中 {namespace[0] if isinstance(namespace, tuple) else namespace}，命中率: {self.hit_rate:.0%}")
+        return value
+
+    def store(self, namespace: Hashable, vector, value: Any, text: str = "") -> None:
+        """Cache a value under the query embedding and text, evicting the least recently used entries."""
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return
+        with self._lock:
+            entries = self._namespaces.setdefault(namespace, OrderedDict())
+            entries[vector.tobytes()] = (vector / norm, value, key_terms(text))
+            entries.move_to_end(vector.tobytes())
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def reset(self):
+        """Drop all entries and statistics (useful for testing)."""
+        with self._lock:
+            self._namespaces.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Singleton instance
+_semantic_cache = SemanticCache()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get the semantic cache singleton instance."""
+    return _semantic_cache
+
+
+async def embed_for_semantic_cache(embeddings, text: str):
+    """Embed a query for a semantic cache lookup; None when the cache is disabled or embedding fails."""
+    if embeddings is None or not _semantic_cache.enabled:
+        return None
+    try:
+        return await embeddings.aembed_query(text)
+    except Exception as e:
+        logger.warning(f"语义缓存查询向量生成失败，跳过缓存: {e}")
+        return None
@@ -49,15 +49,16 @@ class MCPResearchSkill:
         logger.info(f"使用 {len(selected_tools)} 个已选工具进行研究")
         
         try:
-            from ..llm_provider.generic.base import GenericLLMProvider
+            from ..llm_provider.limiter import get_llm_concurrency_controller
+            from ..utils.llm import get_llm
             
-            # 使用配置创建 LLM 提供方
+            # 使用配置获取复用的 LLM 提供方
             provider_kwargs = {
                 'model': self.cfg.strategic_llm_model,
                 **self.cfg.llm_kwargs
             }
             
-            llm_provider = GenericLLMProvider.from_provider(
+            llm_provider = get_llm(
                 self.cfg.strategic_llm_provider, 
                 **provider_kwargs
             )
@@ -76,7 +77,9 @@ class MCPResearchSkill:
             
             # 调用带工具的 LLM
             logger.info("大模型正在使用绑定工具进行研究...")
-            response = await llm_with_tools.ainvoke(messages)
+            response = await get_llm_concurrency_controller().call(
+                self.cfg.strategic_llm_provider, lambda: llm_with_tools.ainvoke(messages)
+            )
             
             # 处理工具调用与结果
             research_results = []
@@ -0,0 +1,109 @@
+import asyncio
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+# Providers whose embed_query is the same request as embed_documents([text]), so
+# queries can be coalesced into document batches without changing the vectors
+QUERY_AS_DOCUMENT_PROVIDERS = {
+    "openai",
+    "azure_openai",
+    "custom",
+    "aimlapi",
+    "fireworks",
+    "together",
+    "mistralai",
+    "ollama",
+}
+
+
+class BatchingEmbeddings(Embeddings):
+    """
+    Embeddings client that coalesces concurrent async calls into batched provider requests.
+
+    aembed_documents (and, for providers listed in QUERY_AS_DOCUMENT_PROVIDERS, aembed_query)
+    calls made within `window` seconds of each other are sent together, in requests of at most
+    `max_batch_size` texts, and the vectors are fanned back out to the callers. Synchronous
+    calls are passed straight through.
+    """
+
+    def __init__(self, embeddings: Embeddings, provider: str, window: float = 0.01, max_batch_size: int = 512):
+        self.embeddings = embeddings
+        self.provider = provider
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: list = []
+        self._pending_texts = 0
+        self._timer = None
+        self._tasks = set()
+
+    def __getattr__(self, name):
+        # Expose provider specific attributes of the wrapped client
+        embeddings = self.__dict__.get("embeddings")
+        if embeddings is None:
+            raise AttributeError(name)
+        return getattr(embeddings, name)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        if self._timer is not None and self._timer.get_loop() is not loop:
+            # Left over from an event loop that has been closed
+            self._pending, self._pending_texts, self._timer = [], 0, None
+
+        future = loop.create_future()
+        self._pending.append((list(texts), future))
+        self._pending_texts += len(texts)
+
+        if self._pending_texts >= self.max_batch_size:
+            self._start(self._flush())
+        elif self._timer is None:
+            self._timer = self._start(self._flush_after_window())
+        return await future
+
+    def _start(self, coro) -> asyncio.Task:
+        # Keep a reference so pending flushes are not garbage collected
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def aembed_query(self, text: str) -> List[float]:
+        if self.provider not in QUERY_AS_DOCUMENT_PROVIDERS:
+            return await self.embeddings.aembed_query(text)
+        return (await self.aembed_documents([text]))[0]
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        self._pending_texts = 0
+        if not pending:
+            return
+
+        texts = [text for call_texts, _ in pending for text in call_texts]
+        batches = [texts[i:i + self.max_batch_size] for i in range(0, len(texts), self.max_batch_size)]
+        try:
+            results = await asyncio.gather(*(self.embeddings.aembed_documents(batch) for batch in batches))
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        vectors = [vector for batch_vectors in results for vector in batch_vectors]
+        offset = 0
+        for call_texts, future in pending:
+            if not future.done():
+                future.set_result(vectors[offset:offset + len(call_texts)])
+            offset += len(call_texts)
@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .quantization import VectorCodec
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (provider, model, text_hash)
+);
+CREATE INDEX IF NOT EXISTS embeddings_by_last_used ON embeddings (last_used);
+"""
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_BATCH = 500
+# The cache size is re-counted after this share of max_entries was inserted, so the cache may
+# briefly exceed max_entries by that much
+EVICTION_CHECK_RATIO = 0.01
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding store keyed by (provider, model, sha256(text)).
+
+    Vectors are stored as blobs in a SQLite file, encoded by a VectorCodec (float32 by default).
+    Every hit refreshes the entry's last-used time, and once the cache holds more than
+    max_entries vectors the least recently used ones are evicted. Each thread keeps one
+    connection to the file.
+    """
+
+    def __init__(self, path: str, max_entries: int = 200000, codec: VectorCodec | None = None):
+        """
+        Args:
+            path: Path of the SQLite file. Parent directories are created.
+            max_entries: Maximum number of cached vectors (0 = unbounded).
+            codec: Storage encoding of the vectors. Defaults to full-precision float32.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.codec = codec or VectorCodec()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connection()
+        # WAL mode is persistent, it only needs to be set once per file
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        # Upper bound of the number of entries, exact right after each count
+        (self._size,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        self._inserted_since_count = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """The connection of the calling thread, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, provider: str, model: str, hashes: List[str], codec: VectorCodec | None = None) -> dict:
+        """Return {hash: vector} for the hashes present in the cache and mark them as used."""
+        codec = codec or self.codec
+        found = {}
+        with self._lock, self._connection() as conn:
+            for start in range(0, len(hashes), _LOOKUP_BATCH):
+                batch = hashes[start:start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                for text_hash, vector in conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE provider = ? AND model = ? AND text_hash IN ({placeholders})",
+                    (provider, model, *batch),
+                ):
+                    found[text_hash] = codec.decode(vector).tolist()
+            if found:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE provider = ? AND model = ? AND text_hash = ?",
+                    [(now, provider, model, text_hash) for text_hash in found],
+                )
+        return found
+
+    def put_many(self, provider: str, model: str, items: dict, codec: VectorCodec | None = None) -> None:
+        """Store {hash: vector} and evict the least recently used entries above max_entries."""
+        if not items:
+            return
+        codec = codec or self.codec
+        now = time.time()
+        with self._lock, self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (provider, model, text_hash, vector, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (provider, model, text_hash, codec.encode(vector), now)
+                    for text_hash, vector in items.items()
+                ],
+            )
+            if self.max_entries:
+                self._evict(conn, len(items))
+
+    def _evict(self, conn: sqlite3.Connection, inserted: int) -> None:
+        """
+        Evict the least recently used entries above max_entries. The table is only counted once
+        the size upper bound exceeds max_entries and enough entries were inserted since the
+        last count.
+        """
+        self._size += inserted
+        self._inserted_since_count += inserted
+        check_interval = max(1, int(self.max_entries * EVICTION_CHECK_RATIO))
+        if self._size <= self.max_entries or self._inserted_since_count < check_interval:
+            return
+        (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            count = self.max_entries
+        self._size = count
+        self._inserted_since_count = 0
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings client that serves repeated texts from an EmbeddingCache.
+
+    Only texts that are not cached yet are sent to the wrapped client, and duplicates
+    within one call are embedded once. Document vectors are returned exactly as the cache
+    stores them (possibly truncated and quantized), whether they were hits or not. Query
+    vectors are only truncated and stay full precision, which recovers most of the accuracy
+    lost to quantization when they are scored against stored documents.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, provider: str, model: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.provider = provider
+        codec = cache.codec
+        self.model = f"{model}|{codec.name}" if codec.name else model
+        self.query_codec = VectorCodec("float32", codec.dimensions)
+        self.query_model = f"{model}#query@{codec.dimensions}" if codec.dimensions else f"{model}#query"
+
+    def _stored(self, vectors: list) -> list:
+        # Round-trip fresh vectors through the codec so misses match later hits
+        if not self.cache.codec.name:
+            return vectors
+        return [self.cache.codec.decode(self.cache.codec.encode(vector)).tolist() for vector in vectors]
+
+    def __getattr__(self, name):
+        # Expose provider specific attributes of the wrapped client
+        embeddings = self.__dict__.get("embeddings")
+        if embeddings is None:
+            raise AttributeError(name)
+        return getattr(embeddings, name)
+
+    @staticmethod
+    def _missing(texts: List[str], hashes: List[str], cached: dict) -> list:
+        missing = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in cached and text_hash not in missing:
+                missing[text_hash] = text
+        return list(missing.items())
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [_text_hash(text) for text in texts]
+        cached = self.cache.get_many(self.provider, self.model, list(set(hashes)))
+        missing = self._missing(texts, hashes, cached)
+        if missing:
+            vectors = self._stored(self.embeddings.embed_documents([text for _, text in missing]))
+            new_items = {text_hash: vector for (text_hash, _), vector in zip(missing, vectors)}
+            self.cache.put_many(self.provider, self.model, new_items)
+            cached.update(new_items)
+        return [list(cached[text_hash]) for text_hash in hashes]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [_text_hash(text) for text in texts]
+        cached = await asyncio.to_thread(self.cache.get_many, self.provider, self.model, list(set(hashes)))
+        missing = self._missing(texts, hashes, cached)
+        if missing:
+            vectors = self._stored(await self.embeddings.aembed_documents([text for _, text in missing]))
+            new_items = {text_hash: vector for (text_hash, _), vector in zip(missing, vectors)}
+            await asyncio.to_thread(self.cache.put_many, self.provider, self.model, new_items)
+            cached.update(new_items)
+        return [list(cached[text_hash]) for text_hash in hashes]
+
+    # Queries are cached under their own namespace since some providers embed queries
+    # and documents differently
+    def embed_query(self, text: str) -> List[float]:
+        text_hash = _text_hash(text)
+        cached = self.cache.get_many(self.provider, self.query_model, [text_hash], self.query_codec)
+        if text_hash in cached:
+            return cached[text_hash]
+        vector = self.query_codec.decode(self.query_codec.encode(self.embeddings.embed_query(text))).tolist()
+        self.cache.put_many(self.provider, self.query_model, {text_hash: vector}, self.query_codec)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        text_hash = _text_hash(text)
+        cached = await asyncio.to_thread(
+            self.cache.get_many, self.provider, self.query_model, [text_hash], self.query_codec
+        )
+        if text_hash in cached:
+            return cached[text_hash]
+        vector = await self.embeddings.aembed_query(text)
+        vector = self.query_codec.decode(self.query_codec.encode(vector)).tolist()
+        await asyncio.to_thread(
+            self.cache.put_many, self.provider, self.query_model, {text_hash: vector}, self.query_codec
+        )
+        return vector
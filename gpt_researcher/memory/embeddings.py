@@ -3,6 +3,10 @@ from typing import Any
 
 from gpt_researcher.utils.openai_base_url import normalize_openai_base_url
 
+from .batching import BatchingEmbeddings
+from .cache import CachedEmbeddings, EmbeddingCache
+from .quantization import VectorCodec
+
 OPENAI_EMBEDDING_MODEL = os.environ.get(
     "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"
 )
@@ -30,7 +34,23 @@ _SUPPORTED_PROVIDERS = {
 
 
 class Memory:
-    def __init__(self, embedding_provider: str, model: str, **embedding_kwargs: Any):
+    def __init__(
+        self,
+        embedding_provider: str,
+        model: str,
+        cache_path: str | None = None,
+        cache_max_entries: int = 200000,
+        batch_window_ms: float = 0,
+        max_batch_size: int = 512,
+        storage_precision: str = "float32",
+        storage_dimensions: int = 0,
+        **embedding_kwargs: Any,
+    ):
+        # Output dimensions change the vectors, so they are part of the cache key
+        cache_model = model
+        if embedding_kwargs.get("dimensions"):
+            cache_model = f"{model}@{embedding_kwargs['dimensions']}"
+
         _embeddings = None
         match embedding_provider:
             case "custom":
@@ -141,6 +161,27 @@ class Memory:
             case _:
                 raise Exception("未找到 Embedding。")
 
+        # Batching sits under the cache so only cache misses are coalesced into requests
+        if batch_window_ms > 0:
+            _embeddings = BatchingEmbeddings(
+                _embeddings,
+                embedding_provider,
+                window=batch_window_ms / 1000,
+                max_batch_size=max_batch_size,
+            )
+
+        if cache_path:
+            _embeddings = CachedEmbeddings(
+                _embeddings,
+                EmbeddingCache(
+                    cache_path,
+                    max_entries=cache_max_entries,
+                    codec=VectorCodec(storage_precision, storage_dimensions),
+                ),
+                embedding_provider,
+                cache_model,
+            )
+
         self._embeddings = _embeddings
 
     def get_embeddings(self):
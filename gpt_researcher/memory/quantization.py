@@ -0,0 +1,75 @@
+import numpy as np
+
+PRECISIONS = ("float32", "float16", "int8")
+
+
+def truncate(vectors: np.ndarray, dimensions: int) -> np.ndarray:
+    """
+    Matryoshka-style truncation: keep the leading dimensions and re-normalize each row.
+    dimensions=0 keeps the vectors whole.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if not dimensions or vectors.shape[-1] <= dimensions:
+        return vectors
+    vectors = vectors[..., :dimensions]
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row scalar quantization. Returns (int8 codes, float32 scale per row)."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    return codes.astype(np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+
+
+class VectorCodec:
+    """
+    Encodes embeddings for persistent storage.
+
+    Vectors can be truncated to their leading `dimensions` and stored as float32, float16 or
+    int8 (4-byte scale followed by one byte per dimension). Decoding always yields float32.
+    """
+
+    def __init__(self, precision: str = "float32", dimensions: int = 0):
+        """
+        Args:
+            precision: One of "float32", "float16" or "int8".
+            dimensions: Number of leading dimensions kept (0 = all).
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"不支持的向量存储精度: {precision}，可选值: {', '.join(PRECISIONS)}")
+        self.precision = precision
+        self.dimensions = dimensions
+
+    @property
+    def name(self) -> str:
+        """Storage format tag; empty for the default full-precision format."""
+        if self.precision == "float32" and not self.dimensions:
+            return ""
+        return f"{self.precision}@{self.dimensions}" if self.dimensions else self.precision
+
+    def encode(self, vector) -> bytes:
+        vector = truncate(vector, self.dimensions)
+        if self.precision == "float16":
+            return vector.astype(np.float16).tobytes()
+        if self.precision == "int8":
+            codes, scales = quantize_int8(vector)
+            return scales[:1].tobytes() + codes[0].tobytes()
+        return vector.tobytes()
+
+    def decode(self, blob: bytes) -> np.ndarray:
+        if self.precision == "float16":
+            return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+        if self.precision == "int8":
+            scale = np.frombuffer(blob[:4], dtype=np.float32)
+            codes = np.frombuffer(blob[4:], dtype=np.int8)
+            return dequantize_int8(codes[None, :], scale)[0]
+        return np.frombuffer(blob, dtype=np.float32)
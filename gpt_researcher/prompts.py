@@ -179,7 +179,7 @@ class PromptFamily:
         """
 
         reference_prompt = ""
-        if report_source == ReportSource.Web.value:
+        if report_source in (ReportSource.Web.value, ReportSource.WebSnippets.value):
             reference_prompt = f"""
 你必须在报告末尾将所有使用的来源网址作为参考文献列出,并确保不添加重复的来源,每个来源只引用一次。
 每个网址都应该是超链接: [url website](url)
@@ -218,6 +218,52 @@ class PromptFamily:
 你必须使用以下语言撰写报告: {language}。
 请尽力而为,这对我的职业生涯非常重要。
 假设当前日期是 {date.today()}。
+"""
+
+    @staticmethod
+    def generate_report_outline_prompt(question: str, context, max_sections: int = 4, language="english"):
+        return f"""
+信息: "{context}"
+---
+根据以上信息,为回答以下查询或任务的研究报告拟定大纲: "{question}"
+- 给出报告标题,以及 {max_sections} 个主要部分的标题,按报告中的顺序排列
+- 各部分应覆盖查询的不同方面,彼此不重复;最后一个部分应为结论
+- 标题使用以下语言: {language}
+
+你必须只返回如下格式的 JSON 对象,不得包含任何 markdown 格式或附加文本:
+{{"title": "报告标题", "sections": ["部分标题 1", "部分标题 2"]}}
+"""
+
+    @staticmethod
+    def generate_report_section_prompt(
+        question: str,
+        section_title: str,
+        outline: list,
+        context,
+        report_format="apa",
+        total_words=300,
+        tone=None,
+        language="english",
+    ):
+        tone_prompt = f"以{tone.value}的语气撰写。" if tone else ""
+        outline_text = "\n".join(f"- {title}" for title in outline)
+        return f"""
+信息: "{context}"
+---
+你正在与其他作者并行撰写关于以下查询或任务的研究报告: "{question}"
+报告大纲:
+{outline_text}
+
+请使用以上信息,只撰写其中 "{section_title}" 这一部分,至少 {total_words} 字:
+- 以二级标题 "## {section_title}" 开头,必要时使用 ### 子标题
+- 只覆盖本部分的内容,不要撰写报告标题、目录、引言或其他部分的内容
+- 使用 markdown 语法和 {report_format} 格式,如果可用,应包含事实和数字
+- 在引用来源的句子或段落末尾使用 markdown 超链接: ([in-text citation](url))
+- 不要在末尾添加参考文献列表,参考文献将统一添加到报告末尾
+- {tone_prompt}
+
+你必须使用以下语言撰写: {language}。
+假设当前日期是 {date.today()}。
 """
 
     @staticmethod
@@ -252,6 +298,18 @@ class PromptFamily:
 
 你必须以与原始来源完全相同的来源 JSON 列表格式返回响应。
 响应不得包含任何 markdown 格式或附加文本(如 ```json),只需 JSON 列表!
+"""
+
+    @staticmethod
+    def generate_context_notes_prompt(query, context):
+        return f"""以下是为研究任务 "{query}" 收集的部分研究资料。
+请从中提取所有与该任务相关的信息,整理为简洁的要点笔记:
+- 保留事实、数据、统计数字、日期和具体例子,不要编造资料中没有的内容
+- 每条要点后用 [来源 URL] 注明出处(若资料中提供)
+- 忽略与研究任务无关的内容;若没有相关内容,返回空响应
+
+研究资料:
+{context}
 """
 
     @staticmethod
@@ -269,7 +327,7 @@ class PromptFamily:
         """
 
         reference_prompt = ""
-        if report_source == ReportSource.Web.value:
+        if report_source in (ReportSource.Web.value, ReportSource.WebSnippets.value):
             reference_prompt = f"""
             你必须包含所有相关的来源网址。
             每个网址都应该是超链接: [url website](url)
@@ -342,7 +400,7 @@ class PromptFamily:
             str: The deep research report prompt
         """
         reference_prompt = ""
-        if report_source == ReportSource.Web.value:
+        if report_source in (ReportSource.Web.value, ReportSource.WebSnippets.value):
             reference_prompt = f"""
 你必须在报告末尾将所有使用的来源网址作为参考文献列出,并确保不添加重复的来源,每个来源只引用一次。
 每个网址都应该是超链接: [url website](url)
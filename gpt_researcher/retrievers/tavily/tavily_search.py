@@ -12,7 +12,7 @@ class TavilySearch:
     Tavily API 检索器
     """
 
-    def __init__(self, query, headers=None, topic="general", query_domains=None):
+    def __init__(self, query, headers=None, topic="general", query_domains=None, include_raw_content=False):
         """
         初始化 TavilySearch 对象。
 
@@ -21,6 +21,7 @@ class TavilySearch:
             headers (dict, optional): 要包含在请求中的额外请求头。默认为 None。
             topic (str, optional): 搜索主题。默认为 "general"。
             query_domains (list, optional): 要包含在搜索中的域名列表。默认为 None。
+            include_raw_content (bool, optional): 是否在结果中返回页面完整内容。默认为 False。
         """
         self.query = query
         self.headers = headers or {}
@@ -31,6 +32,7 @@ class TavilySearch:
             "Content-Type": "application/json",
         }
         self.query_domains = query_domains or None
+        self.include_raw_content = include_raw_content
 
     def get_api_key(self):
         """
@@ -107,14 +109,19 @@ class TavilySearch:
                 max_results=max_results,
                 topic=self.topic,
                 include_domains=self.query_domains,
+                include_raw_content=self.include_raw_content,
             )
             sources = results.get("results", [])
             if not sources:
                 raise Exception("使用 Tavily API 搜索未找到结果。")
             # 返回结果
-            search_response = [
-                {"href": obj["url"], "body": obj["content"]} for obj in sources
-            ]
+            search_response = []
+            for obj in sources:
+                result = {"href": obj["url"], "body": obj["content"]}
+                if obj.get("raw_content"):
+                    result["title"] = obj.get("title", "")
+                    result["raw_content"] = obj["raw_content"]
+                search_response.append(result)
         except Exception as e:
             print(f"错误：{e}。获取来源失败，返回空结果。")
             search_response = []
@@ -1,7 +1,15 @@
-import asyncio
-from typing import List, Dict, Optional, Set
+import os
+from typing import List, Dict, Optional
 
-from ..context.compression import ContextCompressor, WrittenContentCompressor, VectorstoreCompressor
+from langchain_core.documents import Document
+
+from ..context.chunk_index import ChunkIndex
+from ..context.dedup import deduplicate_documents
+from ..context.packing import get_context_budget
+from ..context.compression import ContextCompressor, VectorstoreCompressor
+from ..context.written_index import WrittenSectionIndex
+from ..memory.embeddings import OPENAI_EMBEDDING_MODEL
+from ..utils.costs import aestimate_embedding_cost
 from ..actions.utils import stream_output
 
 
@@ -10,8 +18,35 @@ class ContextManager:
 
     def __init__(self, researcher):
         self.researcher = researcher
+        # Vectors of the chunks packed so far, keyed by content hash, reused by deduplicate_documents
+        self._chunk_vectors = {}
 
-    async def get_similar_content_by_query(self, query, pages):
+    def get_query_token_budget(self) -> int:
+        """
+        Token budget of the context gathered for one (sub-)query: the report context budget
+        split between the sub-queries of a research run and the main query.
+        """
+        return get_context_budget(self.researcher.cfg) // (self.researcher.cfg.max_iterations + 1)
+
+    async def _log_pack(self, query, pack):
+        if self.researcher.verbose and pack is not None:
+            await stream_output(
+                "logs",
+                "context_packed",
+                f"📦 查询 '{query}' 的上下文使用了 {pack.tokens_used}/{pack.budget} 个 token，共 {len(pack.indices)} 个片段",
+                self.researcher.websocket,
+            )
+
+    async def get_similar_documents_by_query(self, query, pages, scraped: bool = True):
+        """
+        Returns the chunks of the pages most relevant to the query, within the query's token budget.
+
+        Args:
+            query: The (sub-)query.
+            pages: Pages with `raw_content` and `url` keys.
+            scraped: Whether the pages were scraped from the web. Only scraped pages are trimmed to
+                MAX_PAGE_CONTENT_CHARS; local and LangChain documents are used in full.
+        """
         if self.researcher.verbose:
             await stream_output(
                 "logs",
@@ -24,11 +59,90 @@ class ContextManager:
             documents=pages,
             embeddings=self.researcher.memory.get_embeddings(),
             prompt_family=self.researcher.prompt_family,
+            max_page_chars=self.researcher.cfg.max_page_content_chars if scraped else 0,
             **self.researcher.kwargs
         )
-        return await context_compressor.async_get_context(
-            query=query, max_results=10, cost_callback=self.researcher.add_costs
+        documents = await context_compressor.async_get_documents(
+            query=query,
+            max_results=10,
+            cost_callback=self.researcher.add_costs,
+            token_budget=self.get_query_token_budget(),
+            model=self.researcher.cfg.smart_llm_model,
+        )
+        await self._log_pack(query, context_compressor.last_pack)
+        self._chunk_vectors.update(context_compressor.packed_vectors)
+        return documents
+
+    async def get_similar_content_by_query(self, query, pages):
+        documents = await self.get_similar_documents_by_query(query, pages)
+        return self.researcher.prompt_family.pretty_print_docs(documents)
+
+    async def build_chunk_index(self, query, pages, vectors=None, ann_index=None) -> ChunkIndex:
+        """
+        Splits and embeds documents once so every sub-query of a research run can search them.
+        The documents are used in full: the page budget only applies to scraped web pages.
+
+        Args:
+            query: The research query.
+            pages: Documents with `raw_content` and `url` keys.
+            vectors: Precomputed embeddings when pages are already chunks (e.g. from the local document index).
+            ann_index: HNSWIndex holding the vectors of pages that are already chunks, for large corpora.
+        """
+        if vectors is None and ann_index is None:
+            self.researcher.add_costs(await aestimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=pages))
+        return await ChunkIndex.from_pages(
+            pages,
+            self.researcher.memory.get_embeddings(),
+            vectors=vectors,
+            ann_index=ann_index,
+            precision=getattr(self.researcher.cfg, "embedding_storage_precision", "float32"),
+        )
+
+    async def get_similar_documents_by_chunk_index(self, queries: List[str], chunk_index: ChunkIndex) -> List[List[Document]]:
+        """
+        Searches the chunk index for all queries at once and returns the relevant chunks per query.
+        Each query gets diverse chunks (MMR) within its share of the context token budget.
+        """
+        if self.researcher.verbose:
+            await stream_output(
+                "logs",
+                "fetching_query_content",
+                f"📚 Getting relevant content based on queries: {queries}...",
+                self.researcher.websocket,
+            )
+        similarity_threshold = float(os.environ.get("SIMILARITY_THRESHOLD", 0.35))
+        results = await chunk_index.pack_many(
+            queries,
+            self.get_query_token_budget(),
+            self.researcher.cfg.smart_llm_model,
+            k=10,
+            similarity_threshold=similarity_threshold,
+        )
+        for query, (_, pack) in zip(queries, results):
+            await self._log_pack(query, pack)
+        self._chunk_vectors.update(chunk_index.packed_vectors)
+        return [docs for docs, _ in results]
+
+    async def deduplicate_documents(self, groups: List[List[Document]]) -> List[List[Document]]:
+        """
+        Drops chunks repeated across sub-queries, by exact hash and embedding similarity
+        (CONTEXT_DEDUP_THRESHOLD), keeping every source of a merged chunk.
+        """
+        # Reuse the vectors computed for retrieval; only chunks without one are embedded again
+        groups, removed = await deduplicate_documents(
+            groups,
+            self.researcher.memory.get_embeddings(),
+            similarity_threshold=self.researcher.cfg.context_dedup_threshold,
+            vectors=self._chunk_vectors,
         )
+        if removed and self.researcher.verbose:
+            await stream_output(
+                "logs",
+                "context_deduplicated",
+                f"🧹 已从合并上下文中移除 {removed} 个重复片段",
+                self.researcher.websocket,
+            )
+        return groups
 
     async def get_similar_content_by_query_with_vectorstore(self, query, filter):
         if self.researcher.verbose:
@@ -49,39 +163,29 @@ class ContextManager:
         current_subtopic: str,
         draft_section_titles: List[str],
         written_contents: List[Dict],
-        max_results: int = 10
+        max_results: int = 10,
+        written_index: Optional[WrittenSectionIndex] = None,
     ) -> List[str]:
-        all_queries = [current_subtopic] + draft_section_titles
+        """
+        Finds already written content similar to the subtopic or any of its draft section titles.
 
-        async def process_query(query: str) -> Set[str]:
-            return set(await self.__get_similar_written_contents_by_query(query, written_contents, **self.researcher.kwargs))
-
-        results = await asyncio.gather(*[process_query(query) for query in all_queries])
-        relevant_contents = set().union(*results)
-        relevant_contents = list(relevant_contents)[:max_results]
-
-        return relevant_contents
-
-    async def __get_similar_written_contents_by_query(self,
-                                                      query: str,
-                                                      written_contents: List[Dict],
-                                                      similarity_threshold: float = 0.5,
-                                                      max_results: int = 10
-                                                      ) -> List[str]:
+        Args:
+            written_index: Index of the written sections kept across a report. When omitted, a
+                temporary index is built from written_contents, embedding each section once.
+        """
+        all_queries = [current_subtopic] + draft_section_titles
         if self.researcher.verbose:
             await stream_output(
                 "logs",
                 "fetching_relevant_written_content",
-                f"🔎 Getting relevant written content based on query: {query}...",
+                f"🔎 Getting relevant written content based on queries: {all_queries}...",
                 self.researcher.websocket,
             )
 
-        written_content_compressor = WrittenContentCompressor(
-            documents=written_contents,
-            embeddings=self.researcher.memory.get_embeddings(),
-            similarity_threshold=similarity_threshold,
-            **self.researcher.kwargs
-        )
-        return await written_content_compressor.async_get_context(
-            query=query, max_results=max_results, cost_callback=self.researcher.add_costs
-        )
+        if written_index is None:
+            written_index = WrittenSectionIndex(self.researcher.memory.get_embeddings())
+            await written_index.add(written_contents, cost_callback=self.researcher.add_costs)
+
+        results = await written_index.search_many(all_queries, k=max_results, similarity_threshold=0.5)
+        relevant_contents = list(dict.fromkeys(content for contents in results for content in contents))
+        return relevant_contents[:max_results]
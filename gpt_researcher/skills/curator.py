@@ -1,7 +1,9 @@
 from typing import Dict, Optional, List
 import json
 from ..config.config import Config
-from ..utils.llm import create_chat_completion
+from ..llm_provider.limiter import Priority
+from ..utils.enum import TaskClass
+from ..utils.llm import create_task_completion
 from ..actions import stream_output
 
 
@@ -38,8 +40,9 @@ class SourceCurator:
 
         response = ""
         try:
-            response = await create_chat_completion(
-                model=self.researcher.cfg.smart_llm_model,
+            response = await create_task_completion(
+                TaskClass.Extract,
+                config=self.researcher.cfg,
                 messages=[
                     {"role": "system", "content": f"{self.researcher.role}"},
                     {"role": "user", "content": self.researcher.prompt_family.curate_sources(
@@ -47,9 +50,9 @@ class SourceCurator:
                 ],
                 temperature=0.2,
                 max_tokens=8000,
-                llm_provider=self.researcher.cfg.smart_llm_provider,
                 llm_kwargs=self.researcher.cfg.llm_kwargs,
                 cost_callback=self.researcher.add_costs,
+                priority=Priority.BACKGROUND,
             )
 
             curated_sources = json.loads(response)
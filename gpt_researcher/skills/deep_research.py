@@ -5,34 +5,18 @@ import time
 from datetime import datetime, timedelta
 
 from gpt_researcher.llm_provider.generic.base import ReasoningEfforts
-from ..utils.llm import create_chat_completion
-from ..utils.enum import ReportType, ReportSource, Tone
+from ..utils.llm import create_task_completion
+from ..utils.enum import ReportType, ReportSource, TaskClass, Tone
 from ..actions.query_processing import get_search_results
+from ..context.packing import get_context_budget, pack_in_order
 
 logger = logging.getLogger(__name__)
 
-# Maximum words allowed in context (25k words for safety margin)
-MAX_CONTEXT_WORDS = 25000
-
-def count_words(text: str) -> int:
-    """Count words in a text string"""
-    return len(text.split())
-
-def trim_context_to_word_limit(context_list: List[str], max_words: int = MAX_CONTEXT_WORDS) -> List[str]:
-    """Trim context list to stay within word limit while preserving most recent/relevant items"""
-    total_words = 0
-    trimmed_context = []
-
-    # Process in reverse to keep most recent items
-    for item in reversed(context_list):
-        words = count_words(item)
-        if total_words + words <= max_words:
-            trimmed_context.insert(0, item)  # Insert at start to maintain original order
-            total_words += words
-        else:
-            break
-
-    return trimmed_context
+def trim_context_to_token_limit(context_list: List[str], token_budget: int, model: str) -> List[str]:
+    """Trim context list to stay within the token budget while preserving most recent/relevant items"""
+    packed = pack_in_order(context_list, token_budget, model, keep_last=True)
+    logger.info(f"上下文使用了 {packed.tokens_used}/{packed.budget} 个 token")
+    return packed.select(context_list)
 
 class ResearchProgress:
     def __init__(self, total_depth: int, total_breadth: int):
@@ -68,10 +52,11 @@ class DeepResearchSkill:
              "content": f"Given the following prompt, generate {num_queries} unique search queries to research the topic thoroughly. For each query, provide a research goal. Format as 'Query: <query>' followed by 'Goal: <goal>' for each pair: {query}"}
         ]
 
-        response = await create_chat_completion(
+        response = await create_task_completion(
+            TaskClass.Plan,
             messages=messages,
-            llm_provider=self.researcher.cfg.strategic_llm_provider,
-            model=self.researcher.cfg.strategic_llm_model,
+            config=self.researcher.cfg,
+            default_llm="strategic",
             reasoning_effort=self.researcher.cfg.reasoning_effort,
             temperature=0.4
         )
@@ -123,10 +108,11 @@ Based on these results, the original query, and the current time, generate {num_
 Format each question on a new line starting with 'Question: '"""}
         ]
 
-        response = await create_chat_completion(
+        response = await create_task_completion(
+            TaskClass.Reason,
             messages=messages,
-            llm_provider=self.researcher.cfg.strategic_llm_provider,
-            model=self.researcher.cfg.strategic_llm_model,
+            config=self.researcher.cfg,
+            default_llm="strategic",
             reasoning_effort=ReasoningEfforts.High.value,
             temperature=0.4
         )
@@ -144,10 +130,11 @@ Format each question on a new line starting with 'Question: '"""}
              "content": f"Given the following research results for the query '{query}', extract key learnings and suggest follow-up questions. For each learning, include a citation to the source URL if available. Format each learning as 'Learning [source_url]: <insight>' and each question as 'Question: <question>':\n\n{context}"}
         ]
 
-        response = await create_chat_completion(
+        response = await create_task_completion(
+            TaskClass.Reason,
             messages=messages,
-            llm_provider=self.researcher.cfg.strategic_llm_provider,
-            model=self.researcher.cfg.strategic_llm_model,
+            config=self.researcher.cfg,
+            default_llm="strategic",
             temperature=0.4,
             reasoning_effort=ReasoningEfforts.High.value,
             max_tokens=1000
@@ -340,9 +327,11 @@ Format each question on a new line starting with 'Question: '"""}
         self.context.extend(all_context)
         self.research_sources.extend(all_sources)
 
-        # Trim context to stay within word limits
-        trimmed_context = trim_context_to_word_limit(all_context)
-        logger.info(f"为控制词数已将上下文从 {len(all_context)} 条裁剪到 {len(trimmed_context)} 条")
+        # Trim context to stay within the token budget
+        trimmed_context = trim_context_to_token_limit(
+            all_context, get_context_budget(self.researcher.cfg), self.researcher.cfg.smart_llm_model
+        )
+        logger.info(f"为控制 token 数已将上下文从 {len(all_context)} 条裁剪到 {len(trimmed_context)} 条")
 
         return {
             'learnings': list(set(all_learnings)),
@@ -398,8 +387,10 @@ Format each question on a new line starting with 'Question: '"""}
         if results.get('context'):
             context_with_citations.extend(results['context'])
 
-        # Trim final context to word limit
-        final_context = trim_context_to_word_limit(context_with_citations)
+        # Trim final context to the token budget
+        final_context = trim_context_to_token_limit(
+            context_with_citations, get_context_budget(self.researcher.cfg), self.researcher.cfg.smart_llm_model
+        )
         
         # Set enhanced context and visited URLs
         self.researcher.context = "\n".join(final_context)
@@ -2,13 +2,21 @@ import asyncio
 import random
 import logging
 import os
+import time
 from ..actions.utils import stream_output
 from ..actions.query_processing import plan_research_outline, get_search_results
-from ..document import DocumentLoader, OnlineDocumentLoader, LangChainDocumentLoader
+from ..document import DocumentLoader, OnlineDocumentLoader, LangChainDocumentLoader, LocalDocumentIndex
+from ..context.ann_index import HAS_HNSWLIB
+from ..llm_provider.semantic_cache import embed_for_semantic_cache, get_semantic_cache
+from ..memory.quantization import VectorCodec
 from ..utils.enum import ReportSource, ReportType
 from ..utils.logging_config import get_json_handler
 from ..actions.agent_creator import choose_agent
 
+# Latency target for report_source="web_snippets": sub-query planning, one search round trip
+# per sub-query and a single embedding ranking pass, with no scraping.
+WEB_SNIPPETS_LATENCY_TARGET_SECONDS = 10.0
+
 
 class ResearchConductor:
     """Manages and coordinates the research process."""
@@ -21,14 +29,37 @@ class ResearchConductor:
         self._mcp_results_cache = None
         # Track MCP query count for balanced mode
         self._mcp_query_count = 0
+        # Persistent index DOC_PATH was last loaded through, if any
+        self._document_index = None
 
     async def plan_research(self, query, query_domains=None):
-        """Gets the sub-queries from the query
+        """Gets the sub-queries from the query, reusing the plan of a semantically close earlier query
         Args:
             query: original query
         Returns:
             List of queries
         """
+        cfg = self.researcher.cfg
+        retriever_names = [r.__name__ for r in self.researcher.retrievers]
+        semantic_cache = get_semantic_cache()
+        namespace = (
+            "sub_queries",
+            cfg.embedding_provider,
+            cfg.embedding_model,
+            cfg.strategic_llm_model,
+            self.researcher.report_type,
+            self.researcher.parent_query,
+            cfg.max_iterations,
+            tuple(sorted(query_domains or [])),
+            tuple(retriever_names),
+        )
+        query_vector = await embed_for_semantic_cache(self.researcher.memory.get_embeddings(), query)
+        if query_vector is not None:
+            cached = semantic_cache.lookup(namespace, query_vector, query)
+            if cached is not None:
+                self.logger.info(f"复用语义相近查询的研究大纲: {list(cached)}")
+                return list(cached)
+
         await stream_output(
             "logs",
             "planning_research",
@@ -46,7 +77,6 @@ class ResearchConductor:
             self.researcher.websocket,
         )
 
-        retriever_names = [r.__name__ for r in self.researcher.retrievers]
         # Remove duplicate logging - this will be logged once in conduct_research instead
 
         outline = await plan_research_outline(
@@ -61,6 +91,8 @@ class ResearchConductor:
             **self.researcher.kwargs
         )
         self.logger.info(f"已生成研究大纲: {outline}")
+        if query_vector is not None and isinstance(outline, list) and outline:
+            semantic_cache.store(namespace, query_vector, tuple(outline), query)
         return outline
 
     async def conduct_research(self):
@@ -100,7 +132,8 @@ class ResearchConductor:
                 parent_query=self.researcher.parent_query,
                 cost_callback=self.researcher.add_costs,
                 headers=self.researcher.headers,
-                prompt_family=self.researcher.prompt_family
+                prompt_family=self.researcher.prompt_family,
+                embeddings=self.researcher.memory.get_embeddings(),
             )
                 
         # Check if MCP retrievers are configured
@@ -126,9 +159,17 @@ class ResearchConductor:
         elif self.researcher.report_source == ReportSource.Web.value:
             self.logger.info("使用所有已配置检索器进行网络搜索")
             research_data = await self._get_context_by_web_search(self.researcher.query, [], self.researcher.query_domains)
+        elif self.researcher.report_source == ReportSource.WebSnippets.value:
+            self.logger.info("仅使用检索器摘要进行快速研究（不抓取网页）")
+            start_time = time.perf_counter()
+            research_data = await self._get_context_by_web_search(self.researcher.query, [], self.researcher.query_domains)
+            elapsed = time.perf_counter() - start_time
+            self.logger.info(f"摘要模式上下文耗时 {elapsed:.2f}s（目标 {WEB_SNIPPETS_LATENCY_TARGET_SECONDS:.0f}s）")
+            if elapsed > WEB_SNIPPETS_LATENCY_TARGET_SECONDS:
+                self.logger.warning(f"摘要模式耗时 {elapsed:.2f}s，超出延迟目标 {WEB_SNIPPETS_LATENCY_TARGET_SECONDS:.0f}s")
         elif self.researcher.report_source == ReportSource.Local.value:
             self.logger.info("使用本地搜索")
-            document_data = await DocumentLoader(self.researcher.cfg.doc_path).load()
+            document_data = await self._load_local_documents()
             self.logger.info(f"已加载 {len(document_data)} 个文档")
             if self.researcher.vector_store:
                 self.researcher.vector_store.load(document_data)
@@ -139,7 +180,7 @@ class ResearchConductor:
             if self.researcher.document_urls:
                 document_data = await OnlineDocumentLoader(self.researcher.document_urls).load()
             else:
-                document_data = await DocumentLoader(self.researcher.cfg.doc_path).load()
+                document_data = await self._load_local_documents()
             if self.researcher.vector_store:
                 self.researcher.vector_store.load(document_data)
             docs_context = await self._get_context_by_web_search(self.researcher.query, document_data, self.researcher.query_domains)
@@ -187,6 +228,54 @@ class ResearchConductor:
         self.logger.info(f"研究完成。上下文大小: {len(str(self.researcher.context))}")
         return self.researcher.context
 
+    async def _load_local_documents(self):
+        """
+        Loads the documents in DOC_PATH, through the persistent document index when DOC_INDEX_PATH is set.
+
+        Returns:
+            list: Document chunks with `raw_content` and `url` keys.
+        """
+        doc_path = self.researcher.cfg.doc_path
+        index_path = getattr(self.researcher.cfg, "doc_index_path", "")
+        if index_path and isinstance(doc_path, (str, os.PathLike)):
+            codec = VectorCodec(
+                getattr(self.researcher.cfg, "embedding_storage_precision", "float32"),
+                getattr(self.researcher.cfg, "embedding_storage_dimensions", 0),
+            )
+            self._document_index = LocalDocumentIndex(doc_path, index_path, codec=codec)
+            return await self._document_index.load()
+        return await DocumentLoader(doc_path).load()
+
+    async def _build_chunk_index(self, query, documents: list):
+        """
+        Splits and embeds the given documents once for all sub-queries of a research run.
+        Chunks coming from the persistent document index reuse their stored embeddings, and
+        large indexed corpora are searched through an on-disk HNSW index.
+
+        Returns:
+            ChunkIndex | None: The index, or None if it could not be built.
+        """
+        try:
+            vectors = None
+            ann_index = None
+            if self._document_index and all("chunk_id" in doc for doc in documents):
+                cfg = self.researcher.cfg
+                embeddings = self.researcher.memory.get_embeddings()
+                model = f"{cfg.embedding_provider}:{cfg.embedding_model}"
+                min_chunks = getattr(cfg, "ann_index_min_chunks", 0)
+                if HAS_HNSWLIB and min_chunks and len(documents) >= min_chunks:
+                    ann_index = await self._document_index.get_ann_index(documents, embeddings, model)
+                else:
+                    vectors = await self._document_index.get_embeddings(documents, embeddings, model)
+            chunk_index = await self.researcher.context_manager.build_chunk_index(
+                query, documents, vectors, ann_index
+            )
+            self.logger.info(f"已为 {len(documents)} 个文档建立共享分块索引，共 {len(chunk_index)} 个分块")
+            return chunk_index
+        except Exception as e:
+            self.logger.warning(f"共享分块索引构建失败，改为按子查询处理文档: {e}")
+            return None
+
     async def _get_context_by_urls(self, urls):
         """Scrapes and compresses the context from the given urls"""
         self.logger.info(f"从 URL 获取上下文: {urls}")
@@ -321,15 +410,43 @@ class ResearchConductor:
                 sub_queries,
             )
 
-        # Using asyncio.gather to process the sub_queries asynchronously
         try:
-            context = await asyncio.gather(
+            # Documents shared by every sub-query are split and embedded only once, and all
+            # sub-queries are scored against them together
+            sub_query_documents = [None] * len(sub_queries)
+            if scraped_data:
+                chunk_index = await self._build_chunk_index(query, scraped_data)
+                if chunk_index is not None:
+                    sub_query_documents = await self.researcher.context_manager.get_similar_documents_by_chunk_index(
+                        sub_queries, chunk_index
+                    )
+
+            # Using asyncio.gather to process the sub_queries asynchronously
+            results = await asyncio.gather(
                 *[
-                    self._process_sub_query(sub_query, scraped_data, query_domains)
-                    for sub_query in sub_queries
+                    self._process_sub_query(sub_query, scraped_data, query_domains, documents)
+                    for sub_query, documents in zip(sub_queries, sub_query_documents)
                 ]
             )
-            self.logger.info(f"已汇总 {len(context)} 个子查询的上下文")
+            self.logger.info(f"已汇总 {len(results)} 个子查询的上下文")
+
+            # Overlapping sub-queries retrieve many of the same chunks; keep each chunk once
+            web_documents = await self.researcher.context_manager.deduplicate_documents(
+                [documents for documents, _ in results]
+            )
+            seen_mcp = set()
+            context = []
+            for sub_query, documents, (_, mcp_context) in zip(sub_queries, web_documents, results):
+                # Cached MCP results are shared by every sub-query in fast mode
+                unique_mcp_context = []
+                for item in mcp_context:
+                    key = (item.get("url"), item.get("content"))
+                    if key not in seen_mcp:
+                        seen_mcp.add(key)
+                        unique_mcp_context.append(item)
+                mcp_context = unique_mcp_context
+                web_context = self.researcher.prompt_family.pretty_print_docs(documents) if documents else ""
+                context.append(self._combine_mcp_and_web_context(mcp_context, web_context, sub_query))
             # Filter out empty results and join the context
             context = [c for c in context if c]
             if context:
@@ -423,8 +540,13 @@ class ResearchConductor:
         
         return all_mcp_context
 
-    async def _process_sub_query(self, sub_query: str, scraped_data: list = [], query_domains: list = []):
-        """Takes in a sub query and scrapes urls based on it and gathers context."""
+    async def _process_sub_query(self, sub_query: str, scraped_data: list = [], query_domains: list = [], documents: list | None = None):
+        """
+        Takes in a sub query and scrapes urls based on it and gathers context.
+
+        Returns:
+            tuple: The relevant web/document chunks and the MCP context entries of the sub query.
+        """
         if self.json_handler:
             self.json_handler.log_event("sub_query", {
                 "query": sub_query,
@@ -446,7 +568,7 @@ class ResearchConductor:
             
             # Initialize context components
             mcp_context = []
-            web_context = ""
+            web_documents = []
             
             # Get MCP strategy configuration
             mcp_strategy = self._get_mcp_strategy()
@@ -495,26 +617,32 @@ class ResearchConductor:
                     mcp_context = await self._execute_mcp_research_for_queries([sub_query], mcp_retrievers)
             
             # Get web search context using non-MCP retrievers (if no scraped data provided)
-            if not scraped_data:
-                scraped_data = await self._scrape_data_by_urls(sub_query, query_domains)
-                self.logger.info(f"抓取数据量: {len(scraped_data)}")
+            scraped = not scraped_data
+            if scraped:
+                if self.researcher.report_source == ReportSource.WebSnippets.value:
+                    scraped_data = await self._get_snippets_by_query(sub_query, query_domains)
+                    self.logger.info(f"检索器摘要数量: {len(scraped_data)}")
+                else:
+                    scraped_data = await self._scrape_data_by_urls(sub_query, query_domains)
+                    self.logger.info(f"抓取数据量: {len(scraped_data)}")
 
             # Get similar content based on scraped data
-            if scraped_data:
-                web_context = await self.researcher.context_manager.get_similar_content_by_query(sub_query, scraped_data)
-                self.logger.info(f"子查询网页内容长度: {len(str(web_context)) if web_context else 0} 字符")
+            if documents is not None:
+                web_documents = documents
+                self.logger.info(f"子查询文档片段数: {len(web_documents)}")
+            elif scraped_data:
+                web_documents = await self.researcher.context_manager.get_similar_documents_by_query(
+                    sub_query, scraped_data, scraped=scraped
+                )
+                self.logger.info(f"子查询网页片段数: {len(web_documents)}")
 
-            # Combine MCP context with web context intelligently
-            combined_context = self._combine_mcp_and_web_context(mcp_context, web_context, sub_query)
-            
-            # Log context combination results
-            if combined_context:
-                context_length = len(str(combined_context))
-                self.logger.info(f"子查询 '{sub_query}' 合并上下文: {context_length} 字符")
+            # Log context collection results
+            if web_documents or mcp_context:
+                self.logger.info(f"子查询 '{sub_query}' 上下文: {len(web_documents)} 个片段, {len(mcp_context)} 条 MCP 结果")
                 
                 if self.researcher.verbose:
                     mcp_count = len(mcp_context)
-                    web_available = bool(web_context)
+                    web_available = bool(web_documents)
                     cache_used = self._mcp_results_cache is not None and mcp_retrievers and mcp_strategy != "deep"
                     cache_status = "（已缓存）" if cache_used else ""
                     await stream_output(
@@ -533,15 +661,16 @@ class ResearchConductor:
                         self.researcher.websocket,
                     )
             
-            if combined_context and self.json_handler:
+            if (web_documents or mcp_context) and self.json_handler:
                 self.json_handler.log_event("content_found", {
                     "sub_query": sub_query,
-                    "content_size": len(str(combined_context)),
+                    "content_size": sum(len(doc.page_content) for doc in web_documents)
+                    + sum(len(item.get("content", "")) for item in mcp_context),
                     "mcp_sources": len(mcp_context),
-                    "web_content": bool(web_context)
+                    "web_content": bool(web_documents)
                 })
                 
-            return combined_context
+            return web_documents, mcp_context
             
         except Exception as e:
             self.logger.error(f"处理子查询出错 {sub_query}: {e}", exc_info=True)
@@ -552,7 +681,7 @@ class ResearchConductor:
                     f"❌ 处理 '{sub_query}' 出错: {str(e)}",
                     self.researcher.websocket,
                 )
-            return ""
+            return [], []
 
     async def _execute_mcp_research(self, retriever, query):
         """
@@ -725,10 +854,24 @@ class ResearchConductor:
 
         return new_urls
 
-    async def _search_relevant_source_urls(self, query, query_domains: list | None = None):
-        new_search_urls = []
+    async def _search_relevant_sources(self, query, query_domains: list | None = None):
+        """
+        Runs the query across the configured retrievers.
+
+        Args:
+            query (str): The query to search for.
+            query_domains (list, optional): Domains to restrict the search to.
+
+        Returns:
+            tuple[list[str], list[dict]]: New URLs that still need scraping, and pages whose
+            full content was already returned by the retriever (only when
+            USE_RETRIEVER_RAW_CONTENT is enabled).
+        """
+        search_urls = []
+        raw_contents = {}
         if query_domains is None:
             query_domains = []
+        use_raw_content = getattr(self.researcher.cfg, "use_retriever_raw_content", False)
 
         # Iterate through the currently set retrievers
         # This allows the method to work when retrievers are temporarily modified
@@ -740,6 +883,9 @@ class ResearchConductor:
             try:
                 # Instantiate the retriever with the sub-query
                 retriever = retriever_class(query, query_domains=query_domains)
+                # Ask retrievers that support it (e.g. Tavily) to return full page content
+                if use_raw_content and hasattr(retriever, "include_raw_content"):
+                    retriever.include_raw_content = True
 
                 # Perform the search using the current retriever
                 search_results = await asyncio.to_thread(
@@ -747,21 +893,38 @@ class ResearchConductor:
                 )
 
                 # Collect new URLs from search results
-                search_urls = [url.get("href") for url in search_results if url.get("href")]
-                new_search_urls.extend(search_urls)
+                for result in search_results or []:
+                    url = result.get("href") or result.get("url")
+                    if not url:
+                        continue
+                    search_urls.append(url)
+                    raw_content = result.get("raw_content")
+                    if use_raw_content and isinstance(raw_content, str) and len(raw_content) >= 100:
+                        raw_contents.setdefault(url, {
+                            "url": url,
+                            "raw_content": raw_content,
+                            "image_urls": [],
+                            "title": result.get("title", ""),
+                        })
             except Exception as e:
                 self.logger.error(f"使用 {retriever_class.__name__} 搜索出错: {e}")
 
         # Get unique URLs
-        new_search_urls = await self._get_new_urls(new_search_urls)
+        new_search_urls = await self._get_new_urls(search_urls)
         random.shuffle(new_search_urls)
 
-        return new_search_urls
+        prefetched_content = [raw_contents[url] for url in new_search_urls if url in raw_contents]
+        urls_to_scrape = [url for url in new_search_urls if url not in raw_contents]
+
+        return urls_to_scrape, prefetched_content
 
     async def _scrape_data_by_urls(self, sub_query, query_domains: list | None = None):
         """
         Runs a sub-query across multiple retrievers and scrapes the resulting URLs.
 
+        Results that already carry the full page content are used as-is when
+        USE_RETRIEVER_RAW_CONTENT is enabled; only the remaining URLs are scraped.
+
         Args:
             sub_query (str): The sub-query to search for.
 
@@ -771,7 +934,7 @@ class ResearchConductor:
         if query_domains is None:
             query_domains = []
 
-        new_search_urls = await self._search_relevant_source_urls(sub_query, query_domains)
+        new_search_urls, prefetched_content = await self._search_relevant_sources(sub_query, query_domains)
 
         # Log the research process if verbose mode is on
         if self.researcher.verbose:
@@ -782,14 +945,76 @@ class ResearchConductor:
                 self.researcher.websocket,
             )
 
+        if prefetched_content:
+            self.logger.info(f"使用检索器返回的完整内容，跳过 {len(prefetched_content)} 个 URL 的抓取")
+            self.researcher.add_research_sources(prefetched_content)
+
         # Scrape the new URLs
-        scraped_content = await self.researcher.scraper_manager.browse_urls(new_search_urls)
+        scraped_content = []
+        if new_search_urls or not prefetched_content:
+            scraped_content = await self.researcher.scraper_manager.browse_urls(new_search_urls)
+        scraped_content = prefetched_content + scraped_content
 
         if self.researcher.vector_store:
             self.researcher.vector_store.load(scraped_content)
 
         return scraped_content
 
+    async def _get_snippets_by_query(self, sub_query, query_domains: list | None = None):
+        """
+        Runs a sub-query across the retrievers and returns their result snippets as pages,
+        without scraping any URL. Used by report_source="web_snippets".
+
+        Args:
+            sub_query (str): The sub-query to search for.
+            query_domains (list, optional): Domains to restrict the search to.
+
+        Returns:
+            list: Pages built from the retriever `body` snippets.
+        """
+        if query_domains is None:
+            query_domains = []
+
+        async def search_snippets(retriever_class):
+            try:
+                retriever = retriever_class(sub_query, query_domains=query_domains)
+                return await asyncio.to_thread(
+                    retriever.search, max_results=self.researcher.cfg.max_search_results_per_query
+                ) or []
+            except Exception as e:
+                self.logger.error(f"使用 {retriever_class.__name__} 搜索出错: {e}")
+                return []
+
+        retrievers = [r for r in self.researcher.retrievers if "mcpretriever" not in r.__name__.lower()]
+        results = await asyncio.gather(*[search_snippets(r) for r in retrievers])
+
+        snippets = []
+        for result in (item for retriever_results in results for item in retriever_results):
+            url = result.get("href") or result.get("url") or ""
+            body = result.get("body") or result.get("raw_content") or ""
+            if body.strip():
+                snippets.append({
+                    "url": url,
+                    "raw_content": body,
+                    "image_urls": [],
+                    "title": result.get("title", ""),
+                })
+
+        # Every snippet feeds this sub-query's context, but only pages of URLs not seen before
+        # are recorded as research sources
+        new_urls = set(await self._get_new_urls(list(dict.fromkeys(page["url"] for page in snippets if page["url"]))))
+        new_pages = []
+        for page in snippets:
+            if page["url"] in new_urls:
+                new_urls.discard(page["url"])
+                new_pages.append(page)
+        self.researcher.add_research_sources(new_pages)
+
+        if self.researcher.vector_store:
+            self.researcher.vector_store.load(new_pages)
+
+        return snippets
+
     async def _search(self, retriever, query):
         """
         Perform a search using the specified retriever.
@@ -1,15 +1,48 @@
 from typing import Dict, Optional
+import asyncio
 import json
+import logging
+import re
 
+from ..context.chunk_index import ChunkIndex
+from ..context.packing import CHARS_PER_TOKEN, get_context_budget
+from ..memory.embeddings import OPENAI_EMBEDDING_MODEL
+from ..utils.costs import aestimate_embedding_cost
 from ..utils.llm import construct_subtopics
 from ..actions import (
     stream_output,
     generate_report,
+    generate_report_outline,
+    write_report_section,
+    map_reduce_context,
     generate_draft_section_titles,
     write_report_introduction,
-    write_conclusion
+    write_conclusion,
+    table_of_contents,
+    add_references,
+    extract_link_urls,
 )
 
+logger = logging.getLogger(__name__)
+
+# Tokens of research context shown to the model drafting the section outline
+OUTLINE_CONTEXT_TOKENS = 4000
+# Lower bound of the context tokens handed to each section writer
+SECTION_MIN_CONTEXT_TOKENS = 4000
+
+_SOURCE_BLOCK = re.compile(r"Source: (.*?)\nTitle: (.*?)\nContent: (.*?)(?=\nSource: |\Z)", re.DOTALL)
+
+
+def _context_pages(items: list[str]) -> list[dict]:
+    """Split formatted research context back into per-source pages for indexing."""
+    pages = []
+    for item in items:
+        blocks = _SOURCE_BLOCK.findall(item)
+        if not blocks:
+            pages.append({"url": "", "title": "", "raw_content": item})
+        pages.extend({"url": url, "title": title, "raw_content": content.strip()} for url, title, content in blocks)
+    return pages
+
 
 class ReportGenerator:
     """Generates reports based on research data."""
@@ -53,6 +86,24 @@ class ReportGenerator:
             )
 
         context = ext_context or self.researcher.context
+        reduced_context = await map_reduce_context(
+            query=self.researcher.query,
+            context=context,
+            config=self.researcher.cfg,
+            cost_callback=self.researcher.add_costs,
+            prompt_family=self.researcher.prompt_family,
+            **self.researcher.kwargs
+        )
+        if reduced_context is not context:
+            context = reduced_context
+            if self.researcher.verbose:
+                await stream_output(
+                    "logs",
+                    "context_reduced",
+                    f"🗜️ Research context reduced to {len(context)} notes for the report",
+                    self.researcher.websocket,
+                )
+
         if self.researcher.verbose:
             await stream_output(
                 "logs",
@@ -75,7 +126,11 @@ class ReportGenerator:
         else:
             report_params["cost_callback"] = self.researcher.add_costs
 
-        report = await generate_report(**report_params, **self.researcher.kwargs)
+        report = None
+        if self._writes_by_sections(custom_prompt):
+            report = await self.write_report_by_sections(context)
+        if report is None:
+            report = await generate_report(**report_params, **self.researcher.kwargs)
 
         if self.researcher.verbose:
             await stream_output(
@@ -87,6 +142,122 @@ class ReportGenerator:
 
         return report
 
+    def _writes_by_sections(self, custom_prompt: str = "") -> bool:
+        return (
+            self.researcher.cfg.report_sections > 1
+            and self.researcher.report_type == "research_report"
+            and not custom_prompt
+        )
+
+    async def write_report_by_sections(self, context) -> Optional[str]:
+        """
+        Write a research report as sections generated concurrently.
+
+        A short outline is drafted first; each section is then written in parallel from the
+        chunks of the context most relevant to it, and the sections are joined under the title
+        with a table of contents and one deduplicated reference list. Finished sections are
+        streamed in report order as soon as all sections before them are done.
+
+        Returns:
+            str: The report, or None when no usable outline could be drafted or every section
+            came back empty, so that the report is written in a single call instead.
+        """
+        cfg = self.researcher.cfg
+        query = self.researcher.query
+        items = [str(item) for item in context] if isinstance(context, list) else [str(context)]
+
+        share = OUTLINE_CONTEXT_TOKENS * CHARS_PER_TOKEN // max(len(items), 1)
+        outline = await generate_report_outline(
+            query=query,
+            context="\n\n".join(item[:share] for item in items),
+            config=cfg,
+            max_sections=cfg.report_sections,
+            cost_callback=self.researcher.add_costs,
+            prompt_family=self.researcher.prompt_family,
+            **self.researcher.kwargs
+        )
+        titles = outline["sections"]
+        if len(titles) < 2:
+            logger.warning("未能生成可用的报告大纲，改为整篇撰写报告")
+            return None
+
+        if self.researcher.verbose:
+            await stream_output(
+                "logs",
+                "writing_sections",
+                f"✍️ Writing {len(titles)} report sections in parallel...",
+                self.researcher.websocket,
+            )
+
+        section_contexts = await self._get_section_contexts(titles, items)
+        header = f"# {outline['title']}\n\n" + table_of_contents("\n".join(f"## {title}" for title in titles))
+
+        tasks = [
+            asyncio.create_task(write_report_section(
+                query=query,
+                section_title=title,
+                outline=titles,
+                context=section_context,
+                config=cfg,
+                tone=self.researcher.tone,
+                total_words=max(cfg.total_words // len(titles), 100),
+                cost_callback=self.researcher.add_costs,
+                prompt_family=self.researcher.prompt_family,
+                **self.researcher.kwargs
+            ))
+            for title, section_context in zip(titles, section_contexts)
+        ]
+        sections = []
+        try:
+            for task in tasks:
+                section = (await task).strip()
+                if not section:
+                    continue
+                if not sections:
+                    # The header is only streamed once there is a section to follow it
+                    await self._stream_report_part(header)
+                sections.append(section)
+                await self._stream_report_part(f"\n\n{section}")
+        finally:
+            # Sections still being written are abandoned if a section fails or the run is cancelled
+            for task in tasks:
+                task.cancel()
+
+        if not sections:
+            logger.warning("所有报告部分均为空，改为整篇撰写报告")
+            return None
+
+        body = "\n\n".join(sections)
+        urls = extract_link_urls(body)
+        references = add_references("", urls) if urls else ""
+        await self._stream_report_part(references)
+        return f"{header}\n\n{body}{references}"
+
+    async def _get_section_contexts(self, titles: list[str], items: list[str]) -> list[str]:
+        """The slice of the research context most relevant to each section, within a per-section token budget."""
+        cfg = self.researcher.cfg
+        budget = get_context_budget(cfg)
+        budget = max(budget // len(titles), min(budget, SECTION_MIN_CONTEXT_TOKENS))
+        pages = _context_pages(items)
+        try:
+            self.researcher.add_costs(await aestimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=pages))
+            chunk_index = await ChunkIndex.from_pages(pages, self.researcher.memory.get_embeddings())
+            packs = await chunk_index.pack_many(
+                [f"{self.researcher.query} - {title}" for title in titles],
+                budget,
+                cfg.smart_llm_model,
+                k=max(10, budget // 250),
+                similarity_threshold=0.0,
+            )
+        except Exception as e:
+            logger.warning(f"为各部分选择上下文时出错，改用完整上下文: {e}")
+            return ["\n\n".join(items)] * len(titles)
+        return [self.researcher.prompt_family.pretty_print_docs(docs) for docs, _ in packs]
+
+    async def _stream_report_part(self, text: str) -> None:
+        if text and (self.researcher.websocket is not None or self.researcher.verbose):
+            await stream_output("report", "report_section", text, self.researcher.websocket, output_log=False)
+
     async def write_report_conclusion(self, report_content: str) -> str:
         """
         Write the conclusion for the report.
@@ -1,25 +1,123 @@
-import tiktoken
+import asyncio
+from typing import Any
 
 # Per OpenAI Pricing Page: https://openai.com/api/pricing/
-ENCODING_MODEL = "o200k_base"
 INPUT_COST_PER_TOKEN = 0.000005
 OUTPUT_COST_PER_TOKEN = 0.000015
 IMAGE_INFERENCE_COST = 0.003825
 EMBEDDING_COST = 0.02 / 1000000 # Assumes new ada-3-small
 
+# (input, output) USD per million tokens by model name prefix; the longest matching prefix wins.
+# Unknown models fall back to INPUT_COST_PER_TOKEN / OUTPUT_COST_PER_TOKEN.
+MODEL_PRICING = {
+    "gpt-5": (1.25, 10.0),
+    "gpt-5-mini": (0.25, 2.0),
+    "gpt-5-nano": (0.05, 0.4),
+    "gpt-4.1": (2.0, 8.0),
+    "gpt-4.1-mini": (0.4, 1.6),
+    "gpt-4.1-nano": (0.1, 0.4),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-3.5-turbo": (0.5, 1.5),
+    "o1": (15.0, 60.0),
+    "o1-mini": (1.1, 4.4),
+    "o3": (2.0, 8.0),
+    "o3-mini": (1.1, 4.4),
+    "o4-mini": (1.1, 4.4),
+    "claude-opus-4": (15.0, 75.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "gemini-2.5-pro": (1.25, 10.0),
+    "gemini-2.5-flash": (0.3, 2.5),
+    "gemini-2.0-flash": (0.1, 0.4),
+    "deepseek-chat": (0.27, 1.1),
+    "deepseek-reasoner": (0.55, 2.19),
+}
 
-# Cost estimation is via OpenAI libraries and models. May vary for other models
-def estimate_llm_cost(input_content: str, output_content: str) -> float:
-    encoding = tiktoken.get_encoding(ENCODING_MODEL)
-    input_tokens = encoding.encode(input_content)
-    output_tokens = encoding.encode(output_content)
-    input_costs = len(input_tokens) * INPUT_COST_PER_TOKEN
-    output_costs = len(output_tokens) * OUTPUT_COST_PER_TOKEN
-    return input_costs + output_costs
+# USD per million tokens of embedding models
+EMBEDDING_PRICING = {
+    "text-embedding-3-small": 0.02,
+    "text-embedding-3-large": 0.13,
+    "text-embedding-ada-002": 0.10,
+}
+
+# Texts longer than this are not tokenized in full: evenly spaced samples are tokenized and
+# the token count is extrapolated from their tokens-per-character ratio.
+SAMPLING_THRESHOLD_CHARS = 100_000
+SAMPLE_COUNT = 8
+SAMPLE_CHARS = 4_000
+
+
+def _match_prefix(table: dict, model: str | None):
+    if not model:
+        return None
+    name = model.split("/")[-1].lower()
+    matches = [prefix for prefix in table if name.startswith(prefix)]
+    return table[max(matches, key=len)] if matches else None
+
+
+def get_model_pricing(model: str | None) -> tuple[float, float]:
+    """(input, output) USD per token for a chat model."""
+    pricing = _match_prefix(MODEL_PRICING, model)
+    if pricing is None:
+        return INPUT_COST_PER_TOKEN, OUTPUT_COST_PER_TOKEN
+    return pricing[0] / 1_000_000, pricing[1] / 1_000_000
+
+
+def estimate_tokens(text: str, model: str | None = None) -> int:
+    """
+    Token count of a text with the model's cached tokenizer, extrapolated from samples when the
+    text is very large.
+    """
+    # Imported lazily: gpt_researcher.context imports this module
+    from ..context.packing import count_tokens
+
+    model = model or "gpt-4o"
+    if len(text) <= SAMPLING_THRESHOLD_CHARS:
+        return count_tokens(text, model)
+    step = (len(text) - SAMPLE_CHARS) // (SAMPLE_COUNT - 1)
+    samples = [text[i * step:i * step + SAMPLE_CHARS] for i in range(SAMPLE_COUNT)]
+    sampled_tokens = sum(count_tokens(sample, model) for sample in samples)
+    return round(sampled_tokens * len(text) / (SAMPLE_COUNT * SAMPLE_CHARS))
+
+
+def get_usage_tokens(usage: Any) -> tuple[int, int] | None:
+    """(input, output) tokens from LangChain usage_metadata, or None when not reported."""
+    if not usage:
+        return None
+    input_tokens = usage.get("input_tokens")
+    output_tokens = usage.get("output_tokens")
+    if input_tokens is None or output_tokens is None:
+        return None
+    return input_tokens, output_tokens
+
+
+# Provider-reported usage is exact; without it, tokens are counted with an OpenAI tokenizer and may vary for other models
+def estimate_llm_cost(input_content: str, output_content: str, model: str | None = None, usage: dict | None = None) -> float:
+    input_cost, output_cost = get_model_pricing(model)
+    tokens = get_usage_tokens(usage)
+    if tokens is None:
+        tokens = estimate_tokens(input_content, model), estimate_tokens(output_content, model)
+    return tokens[0] * input_cost + tokens[1] * output_cost
+
+
+async def aestimate_llm_cost(input_content: str, output_content: str, model: str | None = None, usage: dict | None = None) -> float:
+    """estimate_llm_cost that tokenizes off the event loop when the provider reported no usage."""
+    if get_usage_tokens(usage) is not None:
+        return estimate_llm_cost(input_content, output_content, model, usage)
+    return await asyncio.to_thread(estimate_llm_cost, input_content, output_content, model)
 
 
 def estimate_embedding_cost(model, docs):
-    encoding = tiktoken.encoding_for_model(model)
-    total_tokens = sum(len(encoding.encode(str(doc))) for doc in docs)
-    return total_tokens * EMBEDDING_COST
+    cost_per_token = _match_prefix(EMBEDDING_PRICING, model)
+    cost_per_token = cost_per_token / 1_000_000 if cost_per_token is not None else EMBEDDING_COST
+    total_tokens = sum(estimate_tokens(str(doc), model) for doc in docs)
+    return total_tokens * cost_per_token
+
 
+async def aestimate_embedding_cost(model, docs):
+    """estimate_embedding_cost computed off the event loop."""
+    return await asyncio.to_thread(estimate_embedding_cost, model, docs)
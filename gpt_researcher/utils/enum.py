@@ -11,6 +11,15 @@ class ReportType(Enum):
     DeepResearch = "deep"
 
 
+class TaskClass(Enum):
+    """Kinds of LLM calls, routed to models with LLM_ROUTES."""
+    Classify = "classify"
+    Extract = "extract"
+    Plan = "plan"
+    Write = "write"
+    Reason = "reason"
+
+
 class ReportSource(Enum):
     Web = "web"
     Local = "local"
@@ -19,6 +28,7 @@ class ReportSource(Enum):
     LangChainVectorStore = "langchain_vectorstore"
     Static = "static"
     Hybrid = "hybrid"
+    WebSnippets = "web_snippets"
 
 
 class Tone(Enum):
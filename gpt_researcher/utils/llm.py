@@ -1,16 +1,21 @@
 # libraries
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import PromptTemplate
 
+from gpt_researcher.llm_provider.cache import get_response_cache, response_cache_key
+from gpt_researcher.llm_provider.limiter import Priority, get_llm_concurrency_controller, is_retryable
+from gpt_researcher.llm_provider.replay import ReplayMissError
 from gpt_researcher.llm_provider.generic.base import NO_SUPPORT_TEMPERATURE_MODELS, SUPPORT_REASONING_EFFORT_MODELS, ReasoningEfforts
 
 from ..prompts import PromptFamily
-from .costs import estimate_llm_cost
+from .enum import TaskClass
+from .costs import aestimate_llm_cost
 from .validators import Subtopics
 import os
 
@@ -18,8 +23,9 @@ from gpt_researcher.utils.openai_base_url import normalize_openai_base_url
 
 
 def get_llm(llm_provider, **kwargs):
-    from gpt_researcher.llm_provider import GenericLLMProvider
-    return GenericLLMProvider.from_provider(llm_provider, **kwargs)
+    """Return the pooled provider instance for these arguments, reusing its client and connections."""
+    from gpt_researcher.llm_provider import get_provider_registry
+    return get_provider_registry().get(llm_provider, **kwargs)
 
 
 async def create_chat_completion(
@@ -33,6 +39,8 @@ async def create_chat_completion(
         llm_kwargs: dict[str, Any] | None = None,
         cost_callback: callable = None,
         reasoning_effort: str | None = ReasoningEfforts.Medium.value,
+        cache: bool = True,
+        priority: Priority = Priority.PLANNING,
         **kwargs
 ) -> str:
     """Create a chat completion using the OpenAI API
@@ -47,6 +55,9 @@ async def create_chat_completion(
         llm_kwargs (dict[str, Any], optional): Additional LLM keyword arguments. Defaults to None.
         cost_callback: Callback function for updating cost.
         reasoning_effort (str, optional): Reasoning effort for OpenAI's reasoning models. Defaults to 'low'.
+        cache (bool): Whether the response may be served from / stored in the LLM response cache
+            (LLM_CACHE_PATH). Pass False for creative generation. Defaults to True.
+        priority (Priority, optional): Scheduling class of the call. Defaults to PLANNING.
         **kwargs: Additional keyword arguments.
     Returns:
         str: The response from the chat completion.
@@ -80,21 +91,109 @@ async def create_chat_completion(
             provider_kwargs['openai_api_base'] = normalize_openai_base_url(base_url)
 
     provider = get_llm(llm_provider, **provider_kwargs)
-    response = ""
-    # create response
-    for _ in range(10):  # maximum of 10 attempts
-        response = await provider.get_chat_response(
-            messages, stream, websocket, **kwargs
+
+    response_cache = get_response_cache() if cache else None
+    if response_cache is not None:
+        cache_key = response_cache_key(llm_provider, messages, {**provider_kwargs, **kwargs})
+        cached_response = await asyncio.to_thread(response_cache.get, cache_key)
+        if cached_response is not None:
+            logging.debug(f"LLM 响应缓存命中: {model}")
+            if stream:
+                await provider._send_output(cached_response, websocket)
+            return cached_response
+
+    # create response when the scheduler grants a slot, with retries on transient errors
+    estimated_tokens = len(str(messages)) // 4 + (provider_kwargs['max_tokens'] or 0)
+    usage = {}
+    try:
+        response = await get_llm_concurrency_controller().call(
+            llm_provider,
+            lambda: provider.get_chat_response(messages, stream, websocket, on_usage=usage.update, **kwargs),
+            priority=priority,
+            tokens=estimated_tokens,
         )
+    except Exception:
+        logging.error(f"Failed to get response from {llm_provider} API")
+        raise
+
+    if cost_callback:
+        llm_costs = await aestimate_llm_cost(str(messages), response, model=model, usage=usage)
+        cost_callback(llm_costs)
+
+    if response_cache is not None and response:
+        await asyncio.to_thread(response_cache.put, cache_key, response)
+
+    return response
+
+
+LLM_TIERS = ("fast", "smart", "strategic")
 
-        if cost_callback:
-            llm_costs = estimate_llm_cost(str(messages), response)
-            cost_callback(llm_costs)
 
-        return response
+def get_llm_route(config, task: TaskClass, default_llm: str = "smart") -> list[tuple[str, str]]:
+    """
+    (provider, model) pairs to try for a task class, in order.
 
-    logging.error(f"Failed to get response from {llm_provider} API")
-    raise RuntimeError(f"Failed to get response from {llm_provider} API")
+    The route is the LLM_ROUTES entry of the task (a "<provider>:<model>" string or a fallback
+    list; "fast", "smart" and "strategic" name the configured models), ending with the fast
+    model. A task that is not routed only uses the call site's default tier.
+    """
+    entries = config.llm_routes.get(task.value)
+    if not entries:
+        entries = [default_llm]
+    else:
+        entries = [entries, "fast"] if isinstance(entries, str) else [*entries, "fast"]
+    route = []
+    for entry in entries:
+        if entry in LLM_TIERS:
+            llm = getattr(config, f"{entry}_llm_provider"), getattr(config, f"{entry}_llm_model")
+        else:
+            llm = config.parse_llm(entry)
+        if llm not in route:
+            route.append(llm)
+    return route
+
+
+async def create_task_completion(
+        task: TaskClass,
+        messages: list[dict[str, str]],
+        config,
+        default_llm: str = "smart",
+        stream: bool = False,
+        **kwargs
+) -> str:
+    """Create a chat completion with the models routed to a task class.
+    Transient failures left after the provider's retries (rate limits, overload, 5xx,
+    timeouts), and non-streamed calls exceeding LLM_ROUTE_TIMEOUT seconds, fail over to the
+    next model of the route; other errors propagate. Streamed calls only
+    use the first model, since part of their output may already have been sent.
+    Args:
+        task (TaskClass): The kind of call, looked up in LLM_ROUTES.
+        messages (list[dict[str, str]]): The messages to send to the chat completion.
+        config: Configuration settings.
+        default_llm (str): Model tier ("fast", "smart" or "strategic") used when the task is not routed.
+        stream (bool): Whether to stream the response. Defaults to False.
+        **kwargs: Arguments of create_chat_completion.
+    Returns:
+        str: The response from the chat completion.
+    """
+    route = get_llm_route(config, task, default_llm)
+    if stream:
+        route = route[:1]
+    for i, (llm_provider, model) in enumerate(route):
+        completion = create_chat_completion(messages, model=model, llm_provider=llm_provider, stream=stream, **kwargs)
+        if i == len(route) - 1:
+            return await completion
+        try:
+            if config.llm_route_timeout and not stream:
+                return await asyncio.wait_for(completion, config.llm_route_timeout)
+            return await completion
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            next_provider, next_model = route[i + 1]
+            logging.warning(
+                f"{task.value} 任务调用 {llm_provider}:{model} 失败（{type(e).__name__}），切换到 {next_provider}:{next_model}"
+            )
 
 
 async def construct_subtopics(
@@ -142,19 +241,35 @@ async def construct_subtopics(
 
         provider = get_llm(config.smart_llm_provider, **provider_kwargs)
 
-        model = provider.llm
-
-        chain = prompt | model | parser
+        prompt_text = prompt.format(
+            task=task,
+            data=data,
+            subtopics=subtopics,
+            max_subtopics=config.max_subtopics,
+        )
 
-        output = await chain.ainvoke({
-            "task": task,
-            "data": data,
-            "subtopics": subtopics,
-            "max_subtopics": config.max_subtopics
-        }, **kwargs)
+        response_cache = get_response_cache()
+        cache_key = response_cache_key(config.smart_llm_provider, prompt_text, {**provider_kwargs, **kwargs})
+        cached_response = await asyncio.to_thread(response_cache.get, cache_key) if response_cache else None
+        if cached_response is not None:
+            return parser.parse(cached_response)
+
+        # Through get_chat_response so the call is recorded and can be replayed
+        messages = [{"role": "user", "content": prompt_text}]
+        response = await get_llm_concurrency_controller().call(
+            config.smart_llm_provider,
+            lambda: provider.get_chat_response(messages, stream=False, **kwargs),
+            priority=Priority.PLANNING,
+        )
+        output = parser.parse(response)
+        if response_cache is not None:
+            await asyncio.to_thread(response_cache.put, cache_key, response)
 
         return output
 
+    except ReplayMissError:
+        # An offline replay must not silently fall back to the existing subtopics
+        raise
     except Exception as e:
         print("Exception in parsing subtopics : ", e)
         logging.getLogger(__name__).error("Exception in parsing subtopics : \n {e}")
@@ -54,15 +54,16 @@ async def create_chat_completion_with_tools(
         Exception: If tool-enabled completion fails, falls back to simple completion
     """
     try:
-        from ..llm_provider.generic.base import GenericLLMProvider
+        from ..llm_provider.limiter import get_llm_concurrency_controller
+        from .llm import get_llm
         
-        # Create LLM provider using the config
+        # Get the pooled LLM provider for the config
         provider_kwargs = {
             'model': model,
             **(llm_kwargs or {})
         }
         
-        llm_provider_instance = GenericLLMProvider.from_provider(
+        llm_provider_instance = get_llm(
             llm_provider, 
             **provider_kwargs
         )
@@ -87,7 +88,9 @@ async def create_chat_completion_with_tools(
         from langchain_core.messages import ToolMessage
         
         # First call to LLM
-        response = await llm_with_tools.ainvoke(lc_messages)
+        response = await get_llm_concurrency_controller().call(
+            llm_provider, lambda: llm_with_tools.ainvoke(lc_messages)
+        )
         
         # Process tool calls if any were made
         tool_calls_metadata = []
@@ -151,13 +154,17 @@ async def create_chat_completion_with_tools(
             
             # Get final response from LLM after tool execution
             logger.info("Getting final response from LLM after tool execution")
-            final_response = await llm_with_tools.ainvoke(lc_messages)
+            final_response = await get_llm_concurrency_controller().call(
+                llm_provider, lambda: llm_with_tools.ainvoke(lc_messages)
+            )
             
             # Track costs if callback provided
             if cost_callback:
-                from .costs import estimate_llm_cost
+                from .costs import aestimate_llm_cost
                 # Calculate costs for both calls
-                llm_costs = estimate_llm_cost(str(lc_messages), final_response.content or "")
+                llm_costs = await aestimate_llm_cost(
+                    str(lc_messages), final_response.content or "", model=model, usage=final_response.usage_metadata
+                )
                 cost_callback(llm_costs)
             
             return final_response.content, tool_calls_metadata
@@ -165,8 +172,10 @@ async def create_chat_completion_with_tools(
         else:
             # No tool calls, return regular response
             if cost_callback:
-                from .costs import estimate_llm_cost
-                llm_costs = estimate_llm_cost(str(messages), response.content or "")
+                from .costs import aestimate_llm_cost
+                llm_costs = await aestimate_llm_cost(
+                    str(messages), response.content or "", model=model, usage=response.usage_metadata
+                )
                 cost_callback(llm_costs)
             
             return response.content, []
@@ -43,6 +43,9 @@ setup(
     ],
     python_requires='>=3.11',
     install_requires=reqs,
+    extras_require={
+        "ann": ["hnswlib>=0.8.0"],
+    },
 
 
 )
\ No newline at end of file
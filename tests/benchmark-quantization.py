@@ -0,0 +1,90 @@
+"""
+recall@k of compact embedding storage against exact float32 search.
+
+Every storage format (float16, int8, optional Matryoshka truncation) is scored with the
+full-precision query, which is how GPT Researcher searches stored vectors. For int8 the
+recall with a quantized query is printed as well, to show what rescoring with the
+full-precision query recovers.
+
+By default the corpus is synthetic: clustered vectors whose variance decays across
+dimensions, roughly like Matryoshka-trained models. Pass real embeddings for meaningful
+truncation numbers:
+
+    python tests/benchmark-quantization.py --embeddings chunks.npy [--queries queries.npy]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from gpt_researcher.context.similarity import SimilarityEngine, normalize
+from gpt_researcher.memory.quantization import VectorCodec, quantize_int8, truncate
+
+
+def synthetic_corpus(size: int, dim: int, num_queries: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    decay = 1.0 / np.sqrt(1.0 + np.arange(dim) / 64.0)
+    centers = rng.standard_normal((max(size // 50, 1), dim)) * decay
+    docs = centers[rng.integers(0, len(centers), size)] + 0.5 * rng.standard_normal((size, dim)) * decay
+    queries = docs[rng.integers(0, size, num_queries)] + 0.3 * rng.standard_normal((num_queries, dim)) * decay
+    return docs.astype(np.float32), queries.astype(np.float32)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def run(docs: np.ndarray, queries: np.ndarray, k: int, dimensions: list) -> None:
+    truth = top_k(normalize(queries) @ normalize(docs).T, k)
+    full_dim = docs.shape[1]
+    print(f"{len(docs)} vectors x {full_dim} dims, {len(queries)} queries, recall@{k}\n")
+    print(f"{'format':<22}{'bytes/vector':>14}{'recall':>10}{'quantized query':>18}")
+
+    for dims in [0] + dimensions:
+        for precision in ("float32", "float16", "int8"):
+            codec = VectorCodec(precision, dims)
+            stored = np.vstack([codec.decode(codec.encode(vector)) for vector in docs])
+            hits = SimilarityEngine(stored).search_many(queries, k)
+            found = np.array([[i for i, _ in row] for row in hits])
+
+            symmetric = ""
+            if precision == "int8":
+                codes, _ = quantize_int8(truncate(queries, dims))
+                query_codes = normalize(codes.astype(np.float32))
+                symmetric = f"{recall(top_k(query_codes @ normalize(stored).T, k), truth):.3f}"
+
+            name = f"{precision}" + (f" @{dims}" if dims else f" @{full_dim}")
+            size = len(codec.encode(docs[0]))
+            print(f"{name:<22}{size:>14}{recall(found, truth):>10.3f}{symmetric:>18}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--embeddings", help=".npy file with one document embedding per row")
+    parser.add_argument("--queries", help=".npy file with query embeddings (default: noisy copies of documents)")
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dimensions", type=int, nargs="*", default=[512, 256])
+    args = parser.parse_args()
+
+    if args.embeddings:
+        docs = np.load(args.embeddings).astype(np.float32)
+        if args.queries:
+            queries = np.load(args.queries).astype(np.float32)
+        else:
+            rng = np.random.default_rng(0)
+            picked = docs[rng.integers(0, len(docs), args.num_queries)]
+            queries = picked + 0.3 * picked.std() * rng.standard_normal(picked.shape).astype(np.float32)
+    else:
+        docs, queries = synthetic_corpus(args.size, args.dim, args.num_queries)
+
+    run(docs, queries, args.k, args.dimensions)
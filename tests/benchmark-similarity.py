@@ -0,0 +1,79 @@
+"""
+Benchmark of chunk scoring: the previous LangChain EmbeddingsFilter pipeline against the
+NumPy SimilarityEngine.
+
+Embeddings are precomputed random vectors served from a lookup table, so only the scoring,
+selection and Document plumbing is measured, not provider latency.
+
+Usage:
+    python tests/benchmark-similarity.py [--sizes 1000 10000 100000] [--dim 384] [--queries 5]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_classic.retrievers.document_compressors import EmbeddingsFilter
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from gpt_researcher.context.similarity import SimilarityEngine
+
+
+class LookupEmbeddings(Embeddings):
+    def __init__(self, vectors: dict):
+        self.vectors = vectors
+
+    def embed_documents(self, texts):
+        return [self.vectors[text] for text in texts]
+
+    def embed_query(self, text):
+        return self.vectors[text]
+
+
+def run(size: int, dim: int, num_queries: int, k: int = 10, threshold: float = 0.05) -> None:
+    rng = np.random.default_rng(0)
+    chunk_vectors = rng.standard_normal((size, dim), dtype=np.float32)
+    query_vectors = rng.standard_normal((num_queries, dim), dtype=np.float32)
+    texts = [f"chunk {i}" for i in range(size)]
+    queries = [f"query {i}" for i in range(num_queries)]
+
+    lookup = {text: vector.tolist() for text, vector in zip(texts, chunk_vectors)}
+    lookup.update({query: vector.tolist() for query, vector in zip(queries, query_vectors)})
+    embeddings = LookupEmbeddings(lookup)
+
+    # Previous pipeline: Documents for every chunk, one EmbeddingsFilter pass per query
+    start = time.perf_counter()
+    docs = [Document(page_content=text, metadata={"source": "bench"}) for text in texts]
+    relevance_filter = EmbeddingsFilter(embeddings=embeddings, similarity_threshold=threshold)
+    for query in queries:
+        list(relevance_filter.compress_documents(docs, query))[:k]
+    pipeline_time = time.perf_counter() - start
+
+    # Engine: one normalized matrix, all queries in one multiply, top-k via argpartition
+    start = time.perf_counter()
+    engine = SimilarityEngine(embeddings.embed_documents(texts))
+    hits = engine.search_many([embeddings.embed_query(query) for query in queries], k, threshold)
+    [[Document(page_content=texts[i], metadata={"source": "bench"}) for i, _ in query_hits] for query_hits in hits]
+    engine_time = time.perf_counter() - start
+
+    print(
+        f"{size:>7} chunks x {num_queries} queries | "
+        f"EmbeddingsFilter {pipeline_time * 1000:9.1f} ms | "
+        f"SimilarityEngine {engine_time * 1000:9.1f} ms | "
+        f"{pipeline_time / engine_time:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.dim, args.queries)
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from gpt_researcher.prompts import PromptFamily
+
+
+class KeywordEmbeddings:
+    """Embeds text as counts of vocabulary words and records every call."""
+
+    def __init__(self, vocabulary=("quantum", "garden", "finance"), offset: float = 0.0):
+        self.vocabulary = list(vocabulary)
+        self.offset = offset
+        self.document_calls = 0
+        self.query_calls = 0
+        self.embedded_documents = []
+
+    def _embed(self, text):
+        return [float(text.lower().count(word)) + self.offset for word in self.vocabulary]
+
+    async def aembed_documents(self, texts):
+        self.document_calls += 1
+        self.embedded_documents.extend(texts)
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text):
+        self.query_calls += 1
+        return self._embed(text)
+
+
+@pytest.fixture
+def keyword_embeddings():
+    """Factory of KeywordEmbeddings fakes: keyword_embeddings(vocabulary=..., offset=...)."""
+    return KeywordEmbeddings
+
+
+@pytest.fixture
+def make_researcher():
+    """
+    Factory of fake GPTResearcher instances: make_researcher(cfg={...}, **attributes).
+
+    cfg entries become attributes of researcher.cfg; other keyword arguments override the
+    researcher attributes. Added research sources are collected in researcher.research_sources.
+    """
+
+    def factory(cfg=None, **attributes):
+        sources = []
+        values = dict(
+            cfg=SimpleNamespace(**(cfg or {})),
+            query="query",
+            report_source="web",
+            headers={},
+            kwargs={},
+            visited_urls=set(),
+            verbose=False,
+            websocket=None,
+            vector_store=None,
+            prompt_family=PromptFamily,
+            research_sources=sources,
+            add_research_sources=sources.extend,
+            add_costs=lambda cost: None,
+        )
+        values.update(attributes)
+        return SimpleNamespace(**values)
+
+    return factory
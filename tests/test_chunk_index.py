@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from gpt_researcher.context.chunk_index import ChunkIndex
+from gpt_researcher.context.dedup import content_hash
+
+PAGES = [
+    {"url": "https://q", "title": "Q", "raw_content": "quantum computing and quantum error correction"},
+    {"url": "https://g", "title": "G", "raw_content": "garden tips for a spring garden"},
+    {"url": "https://f", "title": "F", "raw_content": "personal finance basics"},
+]
+
+
+@pytest.mark.asyncio
+async def test_pages_are_embedded_once_for_all_queries(keyword_embeddings):
+    embeddings = keyword_embeddings()
+    index = await ChunkIndex.from_pages(PAGES, embeddings)
+
+    quantum = await index.search("quantum", k=2)
+    garden = await index.search("garden", k=2)
+
+    assert [doc.metadata["source"] for doc in quantum] == ["https://q"]
+    assert [doc.metadata["source"] for doc in garden] == ["https://g"]
+    assert embeddings.document_calls == 1
+    assert embeddings.query_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_precomputed_vectors_skip_embedding(keyword_embeddings):
+    embeddings = keyword_embeddings()
+    vectors = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+    index = await ChunkIndex.from_pages(PAGES, embeddings, vectors=vectors)
+
+    results = await index.search("finance", k=3)
+
+    assert [doc.metadata["source"] for doc in results] == ["https://f"]
+    assert embeddings.document_calls == 0
+
+
+class FakeAnnIndex:
+    def __init__(self, hits):
+        self.hits = hits
+
+    def search_many(self, query_vectors, k, threshold=None):
+        return [self.hits for _ in query_vectors]
+
+
+@pytest.mark.asyncio
+async def test_ann_results_are_mapped_by_chunk_id(keyword_embeddings):
+    pages = [dict(page, chunk_id=chunk_id) for page, chunk_id in zip(PAGES, [10, 20, 30])]
+    ann_index = FakeAnnIndex([(30, 0.9), (99, 0.8), (10, 0.7)])
+    index = await ChunkIndex.from_pages(pages, keyword_embeddings(), ann_index=ann_index)
+
+    results = await index.search("anything", k=3)
+
+    assert [doc.metadata["source"] for doc in results] == ["https://f", "https://q"]
+
+
+def test_hnsw_index_incremental_inserts_and_reload(tmp_path):
+    pytest.importorskip("hnswlib")
+    from gpt_researcher.context.ann_index import HNSWIndex
+
+    path = str(tmp_path / "docs.hnsw")
+    index = HNSWIndex(path)
+    index.add([1, 2], [[1, 0, 0], [0, 1, 0]])
+    index.save()
+
+    reloaded = HNSWIndex(path)
+    reloaded.add([3], [[0, 0, 1]])
+    reloaded.remove([1])
+
+    assert reloaded.labels == {2, 3}
+    assert reloaded.search_many([[0, 0, 1]], k=5, threshold=0.5) == [[(3, pytest.approx(1.0, abs=1e-5))]]
+
+
+@pytest.mark.asyncio
+async def test_pack_many_stays_within_token_budget(keyword_embeddings):
+    pages = PAGES + [{"url": "https://q2", "title": "Q2", "raw_content": "quantum sensors"}]
+    index = await ChunkIndex.from_pages(pages, keyword_embeddings())
+
+    [(docs, packed)] = await index.pack_many(["quantum"], token_budget=15, model="gpt-4o", k=5)
+
+    assert len(docs) == 1
+    assert 0 < packed.tokens_used <= 15
+    assert list(index.packed_vectors) == [content_hash(docs[0].page_content)]
@@ -0,0 +1,59 @@
+import pytest
+from langchain_core.documents import Document
+
+from gpt_researcher.context.dedup import content_hash, deduplicate_documents
+
+
+def doc(content, source):
+    return Document(page_content=content, metadata={"source": source, "title": source})
+
+
+@pytest.mark.asyncio
+async def test_exact_duplicates_are_merged_with_their_sources(keyword_embeddings):
+    groups = [
+        [doc("Quantum computing basics", "https://a"), doc("Garden tips", "https://b")],
+        [doc("quantum   computing basics", "https://c"), doc("Personal finance", "https://d")],
+    ]
+
+    deduplicated, removed = await deduplicate_documents(groups, keyword_embeddings(), similarity_threshold=0)
+
+    assert removed == 1
+    assert [[d.page_content for d in group] for group in deduplicated] == [
+        ["Quantum computing basics", "Garden tips"],
+        ["Personal finance"],
+    ]
+    assert deduplicated[0][0].metadata["sources"] == ["https://a", "https://c"]
+    assert deduplicated[0][0].metadata["source"] == "https://a, https://c"
+    assert groups[0][0].metadata["source"] == "https://a"
+
+
+@pytest.mark.asyncio
+async def test_near_duplicates_are_merged_above_threshold(keyword_embeddings):
+    groups = [
+        [doc("quantum error correction", "https://a")],
+        [doc("more on quantum hardware", "https://b"), doc("finance news", "https://c")],
+    ]
+
+    deduplicated, removed = await deduplicate_documents(groups, keyword_embeddings(), similarity_threshold=0.95)
+
+    assert removed == 1
+    assert [[d.metadata["source"] for d in group] for group in deduplicated] == [
+        ["https://a, https://b"],
+        ["https://c"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_known_vectors_are_not_embedded_again(keyword_embeddings):
+    groups = [
+        [doc("quantum error correction", "https://a")],
+        [doc("more on quantum hardware", "https://b"), doc("finance news", "https://c")],
+    ]
+    known = {content_hash("quantum error correction"): [1.0, 0.0, 0.0], content_hash("finance news"): [0.0, 0.0, 1.0]}
+    embeddings = keyword_embeddings()
+
+    deduplicated, removed = await deduplicate_documents(groups, embeddings, similarity_threshold=0.95, vectors=known)
+
+    assert embeddings.embedded_documents == ["more on quantum hardware"]
+    assert removed == 1
+    assert [[d.metadata["source"] for d in group] for group in deduplicated] == [["https://a, https://b"], ["https://c"]]
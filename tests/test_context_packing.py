@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from gpt_researcher.context.packing import (
+    PROMPT_RESERVE_TOKENS,
+    count_tokens,
+    get_context_budget,
+    get_context_window,
+    pack_by_mmr,
+    pack_in_order,
+)
+
+
+def test_mmr_prefers_diverse_items_over_near_duplicates():
+    vectors = np.array([[1, 0], [0.999, 0.045], [0, 1]], dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    relevance = np.array([0.9, 0.89, 0.6], dtype=np.float32)
+
+    packed = pack_by_mmr(relevance, vectors, [10, 10, 10], budget=100, lambda_mult=0.5, max_items=2)
+
+    assert packed.indices == [0, 2]
+    assert packed.tokens_used == 20
+
+
+def test_mmr_respects_token_budget():
+    vectors = np.eye(3, dtype=np.float32)
+    relevance = np.array([0.9, 0.8, 0.7], dtype=np.float32)
+
+    packed = pack_by_mmr(relevance, vectors, [60, 50, 30], budget=100)
+
+    assert packed.indices == [0, 2]
+    assert packed.tokens_used <= packed.budget
+
+
+def test_pack_in_order_keeps_the_latest_items():
+    items = ["one two three", "four five six", "seven eight nine ten"]
+    budget = count_tokens(items[1], "gpt-4o") + count_tokens(items[2], "gpt-4o")
+
+    packed = pack_in_order(items, budget=budget, model="gpt-4o", keep_last=True)
+
+    assert packed.select(items) == items[1:]
+    assert packed.tokens_used == budget
+    assert pack_in_order(items, budget=budget, model="gpt-4o").select(items) == items[:2]
+
+
+def test_context_budget_uses_model_window_and_cap():
+    assert get_context_window("gpt-4o-mini") == 128000
+    assert get_context_window("llama3.1:8b") == 128000
+    assert get_context_window("unknown-model") == 32000
+
+    cfg = SimpleNamespace(smart_llm_model="gpt-4", smart_token_limit=4000, max_context_tokens=32000, context_window_tokens=0)
+    assert get_context_budget(cfg) == 8192 - 4000 - PROMPT_RESERVE_TOKENS
+    cfg.smart_llm_model = "gpt-4o"
+    assert get_context_budget(cfg) == 32000
@@ -0,0 +1,92 @@
+import asyncio
+import os
+
+import pytest
+
+from gpt_researcher.document import LocalDocumentIndex
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.embedded = 0
+
+    async def aembed_documents(self, texts):
+        self.embedded += len(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+@pytest.mark.asyncio
+async def test_index_only_reparses_changed_files(tmp_path):
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    _write(docs_dir / "a.txt", "alpha document " * 20)
+    _write(docs_dir / "b.txt", "beta document " * 20)
+    index = LocalDocumentIndex(str(docs_dir), str(tmp_path / "index" / "docs.sqlite"))
+
+    assert await index.update() == 2
+    assert await index.update() == 0
+
+    _write(docs_dir / "b.txt", "changed beta document " * 20)
+    os.remove(docs_dir / "a.txt")
+    assert await index.update() == 1
+
+    docs = await index.load()
+    assert {doc["url"] for doc in docs} == {"b.txt"}
+    assert "changed beta" in docs[0]["raw_content"]
+
+
+@pytest.mark.asyncio
+async def test_index_embeds_each_chunk_once(tmp_path):
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    _write(docs_dir / "a.txt", "alpha document " * 20)
+    index = LocalDocumentIndex(str(docs_dir), str(tmp_path / "docs.sqlite"))
+    embeddings = CountingEmbeddings()
+
+    docs = await index.load()
+    first = await index.get_embeddings(docs, embeddings, "test:model")
+    second = await index.get_embeddings(docs, embeddings, "test:model")
+
+    assert first.shape == (len(docs), 2)
+    assert (first == second).all()
+    assert embeddings.embedded == len(docs)
+
+
+@pytest.mark.asyncio
+async def test_failed_parses_are_retried(tmp_path):
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    (docs_dir / "broken.txt").write_bytes(b"\xff\xfe\x00 not utf-8 \xff")
+    _write(docs_dir / "ok.txt", "ok document " * 20)
+    index = LocalDocumentIndex(str(docs_dir), str(tmp_path / "docs.sqlite"))
+
+    assert await index.update() == 2
+    # The unparseable file is not recorded, so every update tries it again
+    assert await index.update() == 1
+
+    _write(docs_dir / "broken.txt", "fixed document " * 20)
+    assert await index.update() == 1
+    assert await index.update() == 0
+    assert {doc["url"] for doc in await index.load()} == {"ok.txt", "broken.txt"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_can_share_an_index_file(tmp_path):
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    for i in range(5):
+        _write(docs_dir / f"doc{i}.txt", f"document {i} " * 50)
+    index_path = str(tmp_path / "docs.sqlite")
+
+    results = await asyncio.gather(*(LocalDocumentIndex(str(docs_dir), index_path).load() for _ in range(4)))
+
+    for docs in results:
+        assert {doc["url"] for doc in docs} == {f"doc{i}.txt" for i in range(5)}
+    # Files parsed by several runs at once are stored once
+    docs = await LocalDocumentIndex(str(docs_dir), index_path).load()
+    assert len(docs) == len({doc["chunk_id"] for doc in docs}) == len(results[0])
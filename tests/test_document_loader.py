@@ -0,0 +1,88 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from gpt_researcher.document import document
+from gpt_researcher.document.document import PROCESS_POOL_MIN_FILES, DocumentLoader, _ByteBudget
+
+
+def _write_files(directory, count):
+    paths = []
+    for i in range(count):
+        path = directory / f"doc{i}.txt"
+        path.write_text(f"content of document {i}", encoding="utf-8")
+        paths.append(str(path))
+    (directory / "ignored.bin").write_bytes(b"\x00")
+    return paths
+
+
+@pytest.mark.asyncio
+async def test_files_are_parsed_in_a_process_pool(tmp_path):
+    paths = _write_files(tmp_path, PROCESS_POOL_MIN_FILES)
+
+    results = await DocumentLoader(str(tmp_path), max_workers=2).load_by_file()
+
+    assert sorted(results) == sorted(paths)
+    for i, path in enumerate(paths):
+        assert results[path] == [{"raw_content": f"content of document {i}", "url": f"doc{i}.txt"}]
+
+
+@pytest.mark.asyncio
+async def test_broken_process_pool_falls_back_to_threads(tmp_path, monkeypatch):
+    paths = _write_files(tmp_path, PROCESS_POOL_MIN_FILES)
+    created = []
+
+    class BrokenExecutor:
+        def __init__(self, max_workers, mp_context=None):
+            self.start_method = mp_context.get_start_method()
+            created.append(self)
+
+        def submit(self, fn, *args):
+            raise BrokenProcessPool("worker died")
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    monkeypatch.setattr(document, "ProcessPoolExecutor", BrokenExecutor)
+
+    docs = await DocumentLoader(paths, max_workers=2).load()
+
+    assert [executor.start_method for executor in created] == ["spawn"]
+    assert sorted(doc["raw_content"] for doc in docs) == sorted(
+        f"content of document {i}" for i in range(PROCESS_POOL_MIN_FILES)
+    )
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_bounds_bytes_in_flight():
+    budget = _ByteBudget(100)
+    peak = 0
+
+    async def parse(size):
+        nonlocal peak
+        await budget.acquire(size)
+        peak = max(peak, budget.in_flight)
+        await asyncio.sleep(0.01)
+        await budget.release(size)
+
+    await asyncio.gather(*(parse(40) for _ in range(6)))
+
+    assert peak == 80
+    assert budget.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_lets_an_oversized_file_through_alone():
+    budget = _ByteBudget(100)
+
+    await asyncio.wait_for(budget.acquire(500), timeout=1)
+    assert budget.in_flight == 500
+
+    waiter = asyncio.create_task(budget.acquire(10))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await budget.release(500)
+    await asyncio.wait_for(waiter, timeout=1)
+    assert budget.in_flight == 10
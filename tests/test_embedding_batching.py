@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from gpt_researcher.memory.batching import BatchingEmbeddings
+
+
+class RecordingEmbeddings:
+    def __init__(self):
+        self.requests = []
+
+    async def aembed_documents(self, texts):
+        self.requests.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    async def aembed_query(self, text):
+        self.requests.append([text])
+        return [float(len(text))]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_sent_as_one_request():
+    inner = RecordingEmbeddings()
+    embeddings = BatchingEmbeddings(inner, "openai", window=0.01)
+
+    results = await asyncio.gather(
+        embeddings.aembed_query("a"),
+        embeddings.aembed_query("bb"),
+        embeddings.aembed_documents(["ccc", "dddd"]),
+    )
+
+    assert results == [[1.0], [2.0], [[3.0], [4.0]]]
+    assert inner.requests == [["a", "bb", "ccc", "dddd"]]
+
+
+@pytest.mark.asyncio
+async def test_batches_respect_the_size_limit():
+    inner = RecordingEmbeddings()
+    embeddings = BatchingEmbeddings(inner, "openai", window=0.01, max_batch_size=2)
+
+    results = await asyncio.gather(*(embeddings.aembed_documents([text]) for text in ["a", "bb", "ccc"]))
+
+    assert results == [[[1.0]], [[2.0]], [[3.0]]]
+    assert all(len(request) <= 2 for request in inner.requests)
+    assert sum(len(request) for request in inner.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_queries_of_asymmetric_providers_are_not_batched():
+    inner = RecordingEmbeddings()
+    embeddings = BatchingEmbeddings(inner, "cohere", window=0.01)
+
+    await asyncio.gather(embeddings.aembed_query("a"), embeddings.aembed_query("bb"))
+
+    assert inner.requests == [["a"], ["bb"]]
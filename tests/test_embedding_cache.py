@@ -0,0 +1,80 @@
+import pytest
+from langchain_classic.retrievers.document_compressors import EmbeddingsFilter
+from langchain_core.embeddings import Embeddings
+
+from gpt_researcher.memory.cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return [float(len(text)), 0.0]
+
+
+def _cached(tmp_path, max_entries=100):
+    inner = CountingEmbeddings()
+    cache = EmbeddingCache(str(tmp_path / "cache" / "embeddings.sqlite"), max_entries=max_entries)
+    return inner, CachedEmbeddings(inner, cache, "test", "model")
+
+
+def test_repeated_texts_are_embedded_once(tmp_path):
+    inner, embeddings = _cached(tmp_path)
+
+    first = embeddings.embed_documents(["a", "bb", "a"])
+    second = embeddings.embed_documents(["bb", "ccc"])
+
+    assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert second == [[2.0, 1.0], [3.0, 1.0]]
+    assert inner.embedded == ["a", "bb", "ccc"]
+
+    embeddings.embed_query("a")
+    embeddings.embed_query("a")
+    assert inner.embedded.count("a") == 2
+
+
+@pytest.mark.asyncio
+async def test_async_calls_share_the_cache(tmp_path):
+    inner, embeddings = _cached(tmp_path)
+
+    embeddings.embed_documents(["a"])
+    vectors = await embeddings.aembed_documents(["a", "bb"])
+
+    assert vectors == [[1.0, 1.0], [2.0, 1.0]]
+    assert inner.embedded == ["a", "bb"]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    inner, embeddings = _cached(tmp_path, max_entries=2)
+
+    embeddings.embed_documents(["a"])
+    embeddings.embed_documents(["bb"])
+    embeddings.embed_documents(["a"])
+    embeddings.embed_documents(["ccc"])
+    embeddings.embed_documents(["a", "bb"])
+
+    assert inner.embedded == ["a", "bb", "ccc", "bb"]
+
+
+def test_wrapper_is_accepted_as_langchain_embeddings(tmp_path):
+    _, embeddings = _cached(tmp_path)
+    assert EmbeddingsFilter(embeddings=embeddings, similarity_threshold=0.3).embeddings is embeddings
+
+
+def test_connection_is_reused_and_size_is_counted_periodically(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"), max_entries=1000)
+    statements = []
+    cache._connection().set_trace_callback(statements.append)
+
+    for i in range(30):
+        cache.put_many("test", "model", {f"hash{i}": [float(i), 1.0]})
+        cache.get_many("test", "model", [f"hash{i}"])
+
+    assert not any("COUNT" in statement or "journal_mode" in statement for statement in statements)
+    assert len(cache.get_many("test", "model", [f"hash{i}" for i in range(30)])) == 30
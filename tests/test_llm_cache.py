@@ -0,0 +1,45 @@
+import pytest
+
+from gpt_researcher.llm_provider import cache as llm_cache
+from gpt_researcher.llm_provider.cache import LLMResponseCache, configure_response_cache, response_cache_key
+from gpt_researcher.utils import llm
+
+
+class CountingProvider:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_chat_response(self, messages, stream, websocket=None, **kwargs):
+        self.calls += 1
+        return f"response {self.calls}"
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite"), ttl=60)
+    messages = [{"role": "user", "content": "hi"}]
+    key = response_cache_key("openai", messages, {"model": "gpt-4o", "temperature": 0.4})
+    cache.put(key, "hello")
+    assert cache.get(key) == "hello"
+    assert response_cache_key("openai", messages, {"model": "gpt-4o", "temperature": 0.7}) != key
+
+    now = llm_cache.time.time()
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now + 61)
+    assert cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_create_chat_completion_serves_repeated_calls_from_cache(tmp_path, monkeypatch):
+    provider = CountingProvider()
+    monkeypatch.setattr(llm, "get_llm", lambda *args, **kwargs: provider)
+    configure_response_cache(str(tmp_path / "llm.sqlite"))
+    messages = [{"role": "user", "content": "plan the research"}]
+    try:
+        first = await llm.create_chat_completion(messages, model="gpt-4o", llm_provider="openai")
+        second = await llm.create_chat_completion(messages, model="gpt-4o", llm_provider="openai")
+        uncached = await llm.create_chat_completion(messages, model="gpt-4o", llm_provider="openai", cache=False)
+    finally:
+        configure_response_cache("")
+
+    assert first == second == "response 1"
+    assert uncached == "response 2"
+    assert provider.calls == 2
@@ -0,0 +1,38 @@
+import pytest
+
+from gpt_researcher.utils import costs, llm
+from gpt_researcher.utils.costs import estimate_llm_cost, estimate_tokens, get_model_pricing
+
+
+class UsageReportingProvider:
+    async def get_chat_response(self, messages, stream, websocket=None, on_usage=None, **kwargs):
+        on_usage({"input_tokens": 1000, "output_tokens": 100, "total_tokens": 1100})
+        return "answer"
+
+
+def test_provider_usage_is_priced_per_model(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("reported usage must not be re-tokenized")
+
+    monkeypatch.setattr(costs, "estimate_tokens", fail)
+    usage = {"input_tokens": 1_000_000, "output_tokens": 1_000_000}
+    assert estimate_llm_cost("", "", model="gpt-4o-mini", usage=usage) == pytest.approx(0.75)
+    assert estimate_llm_cost("", "", model="openai/gpt-4o", usage=usage) == pytest.approx(12.5)
+    assert get_model_pricing("some-local-model") == (costs.INPUT_COST_PER_TOKEN, costs.OUTPUT_COST_PER_TOKEN)
+
+
+def test_large_texts_are_estimated_from_samples():
+    text = "research context with several words per line\n" * 20_000
+    assert len(text) > costs.SAMPLING_THRESHOLD_CHARS
+    exact = sum(estimate_tokens(text[i:i + 50_000]) for i in range(0, len(text), 50_000))
+    assert estimate_tokens(text) == pytest.approx(exact, rel=0.02)
+
+
+@pytest.mark.asyncio
+async def test_create_chat_completion_charges_reported_usage(monkeypatch):
+    monkeypatch.setattr(llm, "get_llm", lambda *args, **kwargs: UsageReportingProvider())
+    charged = []
+    await llm.create_chat_completion(
+        [{"role": "user", "content": "hi"}], model="gpt-4o", llm_provider="openai", cost_callback=charged.append
+    )
+    assert charged == [pytest.approx(1000 * 2.5e-6 + 100 * 10e-6)]
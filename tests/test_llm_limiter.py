@@ -0,0 +1,193 @@
+import asyncio
+
+import pytest
+
+from gpt_researcher.llm_provider import limiter as limiter_module
+from gpt_researcher.llm_provider.limiter import AdaptiveConcurrencyLimiter, LLMConcurrencyController, Priority, get_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.response = FakeResponse(status_code, headers)
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(limiter_module.asyncio, "sleep", fake_sleep)
+    controller = LLMConcurrencyController()
+    controller._limiters.clear()
+    controller.configure(8, 64, 3)
+    yield controller, sleeps
+    controller._limiters.clear()
+    controller.configure(8, 64, 5)
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_are_retried_after_retry_after_and_halve_the_limit(controller):
+    controller, sleeps = controller
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ProviderError(429, {"retry-after": "0"})
+        return "ok"
+
+    assert await controller.call("openai", call) == "ok"
+    assert len(attempts) == 2
+    assert sleeps == [0.0]
+    assert 4 <= controller.limiter("openai").limit < 5
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_propagate_immediately(controller):
+    controller, _ = controller
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        raise ProviderError(400)
+
+    with pytest.raises(ProviderError):
+        await controller.call("openai", call)
+    assert len(attempts) == 1
+    assert controller.limiter("openai").in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_in_flight_calls_and_grows_on_success():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, max_limit=2)
+    running, peak = 0, 0
+
+    async def task():
+        nonlocal running, peak
+        await limiter.acquire()
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        limiter.on_success()
+        await limiter.release()
+
+    await asyncio.gather(*(task() for _ in range(6)))
+    assert peak == 2
+
+    growing = AdaptiveConcurrencyLimiter(initial=2, max_limit=4)
+    for _ in range(4):
+        growing.on_success()
+    assert 3 <= growing.limit <= 4
+
+
+def test_retry_after_headers():
+    assert get_retry_after(ProviderError(429, {"retry-after-ms": "1500"})) == 1.5
+    assert get_retry_after(ProviderError(429, {"retry-after": "7"})) == 7.0
+    assert get_retry_after(ProviderError(429)) is None
+
+
+@pytest.mark.asyncio
+async def test_waiting_calls_are_granted_by_priority_then_fair_share():
+    limiter = AdaptiveConcurrencyLimiter(initial=1, max_limit=1)
+    await limiter.acquire(Priority.PLANNING, session="a")
+    granted = []
+
+    async def call(name, priority, session):
+        await limiter.acquire(priority, session)
+        granted.append(name)
+        await limiter.release()
+
+    tasks = [
+        asyncio.create_task(call("background", Priority.BACKGROUND, "b")),
+        asyncio.create_task(call("planning a", Priority.PLANNING, "a")),
+        asyncio.create_task(call("planning b", Priority.PLANNING, "b")),
+        asyncio.create_task(call("report", Priority.INTERACTIVE, "a")),
+    ]
+    await asyncio.sleep(0)
+    await limiter.release()
+    await asyncio.gather(*tasks)
+
+    # Session "a" already had a call served, so "b" goes first within the planning class
+    assert granted == ["report", "planning b", "planning a", "background"]
+
+
+@pytest.mark.asyncio
+async def test_requests_per_minute_budget_holds_back_calls():
+    limiter = AdaptiveConcurrencyLimiter(initial=8, requests_per_minute=2)
+    await limiter.acquire()
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    assert not waiter.done() and limiter.in_flight == 2
+    assert limiter.requests.wait_time(1, limiter_module.time.monotonic()) == pytest.approx(30, abs=0.5)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter._waiting == []
+
+
+class FlakyStreamingModel:
+    """Streams `before` chunks, then fails with a 503 on the first `failures` attempts."""
+
+    def __init__(self, before, failures=1):
+        self.before = before
+        self.failures = failures
+        self.attempts = 0
+
+    async def astream(self, messages, **kwargs):
+        from langchain_core.messages import AIMessageChunk
+
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            for content in self.before:
+                yield AIMessageChunk(content=content)
+            raise ProviderError(503)
+        yield AIMessageChunk(content="full report\n")
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, data):
+        self.sent.append(data["output"])
+
+
+@pytest.mark.asyncio
+async def test_stream_failing_after_output_is_not_retried(controller):
+    from gpt_researcher.llm_provider.generic import GenericLLMProvider, PartialStreamError
+
+    controller, _ = controller
+    model = FlakyStreamingModel(["first paragraph\n", "second"])
+    websocket = RecordingWebSocket()
+    provider = GenericLLMProvider(model)
+
+    with pytest.raises(PartialStreamError):
+        await controller.call("openai", lambda: provider.get_chat_response([], True, websocket))
+    assert model.attempts == 1
+    assert websocket.sent == ["first paragraph\n"]
+
+
+@pytest.mark.asyncio
+async def test_stream_failing_before_output_is_retried(controller):
+    from gpt_researcher.llm_provider.generic import GenericLLMProvider
+
+    controller, _ = controller
+    model = FlakyStreamingModel(["partial paragraph without newline"])
+    websocket = RecordingWebSocket()
+    provider = GenericLLMProvider(model)
+
+    assert await controller.call("openai", lambda: provider.get_chat_response([], True, websocket)) == "full report\n"
+    assert model.attempts == 2
+    assert websocket.sent == ["full report\n"]
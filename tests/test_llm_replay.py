@@ -0,0 +1,90 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from gpt_researcher.llm_provider import GenericLLMProvider, ReplayMissError, configure_llm_replay
+from gpt_researcher.llm_provider.replay import load_recording, request_hash
+from gpt_researcher.utils import llm
+
+
+class ScriptedChatModel:
+    model_name = "gpt-4o"
+
+    async def ainvoke(self, messages, **kwargs):
+        usage = {"input_tokens": 12, "output_tokens": 3, "total_tokens": 15}
+        return AIMessage(content="plan: a, b", usage_metadata=usage)
+
+    async def astream(self, messages, **kwargs):
+        for text in ["# Report\n", "body ", "text\n"]:
+            yield AIMessageChunk(content=text)
+
+
+@pytest.mark.asyncio
+async def test_recorded_calls_are_replayed_offline(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    plan_messages = [{"role": "user", "content": "plan"}]
+    report_messages = [{"role": "user", "content": "write"}]
+
+    configure_llm_replay(path)
+    try:
+        live = GenericLLMProvider(ScriptedChatModel(), verbose=False)
+        await live.get_chat_response(plan_messages, stream=False)
+        await live.get_chat_response(report_messages, stream=True)
+    finally:
+        configure_llm_replay("")
+
+    load_recording.cache_clear()
+    replay = GenericLLMProvider.from_provider("replay", model=path, temperature=0.4, verbose=False)
+    usage = {}
+    assert await replay.get_chat_response(plan_messages, stream=False, on_usage=usage.update) == "plan: a, b"
+    assert usage["total_tokens"] == 15
+    assert await replay.get_chat_response(report_messages, stream=True) == "# Report\nbody text\n"
+
+    [streamed] = load_recording(path).records[request_hash(report_messages)]
+    assert [text for _, text in streamed["chunks"]] == ["# Report\n", "body ", "text\n"]
+    with pytest.raises(ReplayMissError):
+        await replay.get_chat_response([{"role": "user", "content": "unrecorded"}], stream=False)
+    with pytest.raises(NotImplementedError):
+        replay.llm.bind_tools([])
+
+
+class SubtopicsChatModel:
+    model_name = "gpt-4o"
+
+    async def ainvoke(self, messages, **kwargs):
+        return AIMessage(content=json.dumps({"subtopics": [{"task": "History"}, {"task": "Outlook"}]}))
+
+
+def _subtopics_config(provider, model):
+    return SimpleNamespace(
+        smart_llm_provider=provider,
+        smart_llm_model=model,
+        llm_kwargs={},
+        temperature=0.4,
+        smart_token_limit=4000,
+        max_subtopics=3,
+    )
+
+
+@pytest.mark.asyncio
+async def test_subtopics_are_recorded_and_replayed(tmp_path, monkeypatch):
+    path = str(tmp_path / "run.jsonl")
+
+    configure_llm_replay(path)
+    try:
+        with monkeypatch.context() as patch:
+            patch.setattr(llm, "get_llm", lambda provider, **kwargs: GenericLLMProvider(SubtopicsChatModel(), verbose=False))
+            recorded = await llm.construct_subtopics("solar power", "data", _subtopics_config("openai", "gpt-4o"))
+    finally:
+        configure_llm_replay("")
+
+    load_recording.cache_clear()
+    replayed = await llm.construct_subtopics("solar power", "data", _subtopics_config("replay", path))
+    assert [subtopic.task for subtopic in replayed.subtopics] == ["History", "Outlook"]
+    assert replayed == recorded
+
+    # A request missing from the recording fails instead of returning no subtopics
+    with pytest.raises(ReplayMissError):
+        await llm.construct_subtopics("wind power", "data", _subtopics_config("replay", path))
@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from gpt_researcher.config import Config
+from gpt_researcher.utils import llm
+from gpt_researcher.utils.enum import TaskClass
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def make_config(routes=None, timeout=0):
+    return SimpleNamespace(
+        llm_routes=routes or {},
+        llm_route_timeout=timeout,
+        fast_llm_provider="openai", fast_llm_model="gpt-4o-mini",
+        smart_llm_provider="openai", smart_llm_model="gpt-4.1",
+        strategic_llm_provider="openai", strategic_llm_model="o4-mini",
+        parse_llm=Config.parse_llm,
+    )
+
+
+def test_routed_tasks_resolve_tiers_and_end_with_the_fast_model():
+    config = make_config({"extract": ["openai:gpt-4.1-nano", "smart"]})
+    assert llm.get_llm_route(config, TaskClass.Extract) == [
+        ("openai", "gpt-4.1-nano"), ("openai", "gpt-4.1"), ("openai", "gpt-4o-mini")
+    ]
+    # Unrouted tasks keep the call site's model, without fallback
+    assert llm.get_llm_route(config, TaskClass.Plan, "strategic") == [("openai", "o4-mini")]
+    assert llm.get_llm_route(make_config({"plan": "strategic"}), TaskClass.Plan) == [
+        ("openai", "o4-mini"), ("openai", "gpt-4o-mini")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_errors_and_timeouts_fail_over_along_the_route(monkeypatch):
+    calls = []
+
+    async def fake_completion(messages, model=None, llm_provider=None, **kwargs):
+        calls.append(model)
+        if model == "o4-mini":
+            await asyncio.sleep(10)
+        if model == "gpt-4.1":
+            raise ProviderError(503)
+        return model
+
+    monkeypatch.setattr(llm, "create_chat_completion", fake_completion)
+    config = make_config({"reason": ["strategic", "smart"]}, timeout=0.05)
+    messages = [{"role": "user", "content": "why?"}]
+
+    assert await llm.create_task_completion(TaskClass.Reason, messages, config) == "gpt-4o-mini"
+    assert calls == ["o4-mini", "gpt-4.1", "gpt-4o-mini"]
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_propagate(monkeypatch):
+    calls = []
+
+    async def fake_completion(messages, model=None, llm_provider=None, **kwargs):
+        calls.append(model)
+        raise ProviderError(400)
+
+    monkeypatch.setattr(llm, "create_chat_completion", fake_completion)
+    config = make_config({"extract": ["smart"]})
+
+    with pytest.raises(ProviderError):
+        await llm.create_task_completion(TaskClass.Extract, [{"role": "user", "content": "x"}], config)
+    assert calls == ["gpt-4.1"]
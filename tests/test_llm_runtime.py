@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import pytest
+
+from gpt_researcher.config.variables.default import DEFAULT_CONFIG
+from gpt_researcher.llm_provider import (
+    configure_llm_runtime,
+    get_llm_concurrency_controller,
+    get_provider_registry,
+    get_semantic_cache,
+)
+
+
+def make_config(**overrides):
+    values = {key.lower(): value for key, value in DEFAULT_CONFIG.items()}
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture(autouse=True)
+def restore_runtime():
+    yield
+    configure_llm_runtime(make_config(), force=True)
+
+
+def test_runtime_is_configured_once_per_process():
+    configure_llm_runtime(make_config(llm_max_concurrency=16, llm_provider_pool_size=4), force=True)
+    limiter = get_llm_concurrency_controller().limiter("runtime-test")
+
+    # A researcher created later with other settings must not reset limits in use
+    assert not configure_llm_runtime(make_config(llm_max_concurrency=2, llm_provider_pool_size=0))
+    assert get_llm_concurrency_controller().max_concurrency == 16
+    assert limiter.max_limit == 16
+    assert get_provider_registry().max_size == 4
+
+
+def test_differing_later_config_logs_a_warning(caplog):
+    configure_llm_runtime(make_config(), force=True)
+
+    with caplog.at_level("WARNING", logger="gpt_researcher.llm_provider.runtime"):
+        configure_llm_runtime(make_config())
+        assert not caplog.records
+
+        configure_llm_runtime(make_config(llm_max_concurrency=2))
+    assert "LLM_MAX_CONCURRENCY" in caplog.text
+
+
+def test_forced_configuration_is_applied():
+    configure_llm_runtime(make_config(semantic_cache_threshold=0.9), force=True)
+    assert get_semantic_cache().threshold == 0.9
+
+    assert configure_llm_runtime(make_config(semantic_cache_threshold=0.0), force=True)
+    assert get_semantic_cache().threshold == 0.0
@@ -6,7 +6,8 @@ import os
 import json
 
 @pytest.mark.asyncio
-async def test_custom_logs_handler():
+async def test_custom_logs_handler(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
     # Mock websocket
     mock_websocket = AsyncMock()
     mock_websocket.send_json = AsyncMock()
@@ -35,8 +36,9 @@ async def test_custom_logs_handler():
         assert log_data['events'][0]['data'] == test_data 
 
 @pytest.mark.asyncio
-async def test_content_update():
+async def test_content_update(monkeypatch, tmp_path):
     """Test handling of non-log type data that updates content"""
+    monkeypatch.chdir(tmp_path)
     mock_websocket = AsyncMock()
     mock_websocket.send_json = AsyncMock()
     
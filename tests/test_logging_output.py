@@ -28,8 +28,9 @@ class DummyWebSocket(WebSocket):
         self.events.append(event)
 
 @pytest.mark.asyncio
-async def test_log_output_file():
+async def test_log_output_file(monkeypatch, tmp_path):
     """Test to verify logs are properly written to output file"""
+    monkeypatch.chdir(tmp_path)
     from backend.server.server_utils import CustomLogsHandler
     
     # 1. Setup like the main app
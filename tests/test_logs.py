@@ -8,7 +8,8 @@ sys.path.append(str(project_root))
 
 from backend.server.server_utils import CustomLogsHandler
 
-def test_logs_creation():
+def test_logs_creation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
     # Print current working directory
     print(f"Current working directory: {os.getcwd()}")
     
@@ -16,7 +17,7 @@ def test_logs_creation():
     print(f"Project root: {project_root}")
     
     # Try to create logs directory directly
-    logs_dir = project_root / "logs"
+    logs_dir = tmp_path / "logs"
     print(f"Attempting to create logs directory at: {logs_dir}")
     
     try:
@@ -31,7 +32,7 @@ def test_logs_creation():
         print(f"✓ Created test file: {test_file}")
         
         # Initialize the handler
-        handler = CustomLogsHandler()
+        handler = CustomLogsHandler(None, "test_logs")
         print("✓ CustomLogsHandler initialized")
         
         # Test JSON logging
@@ -45,4 +46,9 @@ def test_logs_creation():
         print(f"Traceback: {traceback.format_exc()}")
 
 if __name__ == "__main__":
-    test_logs_creation() 
\ No newline at end of file
+    import tempfile
+
+    import pytest
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_logs_creation(Path(tempfile.mkdtemp()), monkeypatch) 
\ No newline at end of file
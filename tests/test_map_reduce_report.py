@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+import pytest
+
+from gpt_researcher.actions import report_generation
+from gpt_researcher.context.packing import count_tokens, shard_by_tokens
+
+
+def make_config(mode="auto", max_context_tokens=2000):
+    return SimpleNamespace(
+        report_map_reduce=mode,
+        map_reduce_shard_tokens=1500,
+        max_context_tokens=max_context_tokens,
+        context_window_tokens=0,
+        smart_llm_model="gpt-4.1",
+        smart_token_limit=4000,
+        fast_llm_model="gpt-4o-mini",
+        fast_token_limit=3000,
+        llm_kwargs={},
+    )
+
+
+def test_shards_respect_the_token_budget():
+    items = ["source text " * 300, "short note", "another source " * 2000]
+    shards = shard_by_tokens(items, 1000, "gpt-4o-mini")
+    assert all(sum(count_tokens(piece, "gpt-4o-mini") for piece in shard) <= 1000 for shard in shards)
+    assert "".join("".join(shard) for shard in shards) == "".join(items)
+
+
+@pytest.mark.asyncio
+async def test_large_contexts_are_reduced_to_notes_in_parallel(monkeypatch):
+    shards_seen = []
+
+    async def fake_extract(query, context, config, cost_callback=None, prompt_family=None, **kwargs):
+        shards_seen.append(context)
+        return f"note {len(shards_seen)}"
+
+    monkeypatch.setattr(report_generation, "extract_context_notes", fake_extract)
+    context = [f"source {i}: " + "finding " * 800 for i in range(6)]
+
+    notes = await report_generation.map_reduce_context("query", context, make_config())
+    assert len(shards_seen) > 1
+    assert notes == [f"note {i + 1}" for i in range(len(shards_seen))]
+
+    small = ["a short context"]
+    assert await report_generation.map_reduce_context("query", small, make_config()) is small
+    assert await report_generation.map_reduce_context("query", context, make_config("off")) is context
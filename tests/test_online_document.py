@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+from langchain_core.documents import Document
+
+from gpt_researcher.document import online_document
+from gpt_researcher.document.online_document import OnlineDocumentLoader
+
+
+class FakeContent:
+    def __init__(self, body):
+        self.body = body
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self.body), size):
+            await asyncio.sleep(0)
+            yield self.body[start:start + size]
+
+
+class FakeResponse:
+    def __init__(self, body=b"", status=200, content_length=None):
+        self.status = status
+        self.content_length = content_length
+        self.content = FakeContent(body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Serves canned responses per URL and tracks how many downloads run at once."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.active = 0
+        self.max_active = 0
+
+    def get(self, url, timeout=None):
+        session = self
+        response = self.responses[url]
+
+        class Download:
+            async def __aenter__(self):
+                if isinstance(response, Exception):
+                    raise response
+                session.active += 1
+                session.max_active = max(session.max_active, session.active)
+                await asyncio.sleep(0.01)
+                return response
+
+            async def __aexit__(self, *exc):
+                session.active -= 1
+                return False
+
+        return Download()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TextLoader:
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as handle:
+            return [Document(page_content=handle.read(), metadata={})]
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    def _serve(responses):
+        session = FakeSession(responses)
+        monkeypatch.setattr(online_document.aiohttp, "ClientSession", lambda **kwargs: session)
+        monkeypatch.setattr(online_document.aiohttp, "TCPConnector", lambda **kwargs: None)
+        monkeypatch.setattr(online_document, "get_loader", lambda path, extension: TextLoader(path))
+        return session
+    return _serve
+
+
+@pytest.mark.asyncio
+async def test_downloads_are_bounded_by_max_concurrency(serve):
+    urls = [f"https://example.com/{i}.txt" for i in range(10)]
+    session = serve({url: FakeResponse(f"document {url}".encode()) for url in urls})
+
+    docs = await OnlineDocumentLoader(urls, max_concurrency=3).load()
+
+    assert session.max_active == 3
+    assert [doc["url"] for doc in docs] == urls
+    assert docs[0]["raw_content"] == f"document {urls[0]}"
+
+
+@pytest.mark.asyncio
+async def test_oversized_downloads_are_skipped(serve):
+    serve({
+        "https://example.com/declared.txt": FakeResponse(b"x" * 10, content_length=1_000_000),
+        "https://example.com/streamed.txt": FakeResponse(b"x" * 200_000),
+        "https://example.com/small.txt": FakeResponse(b"small document"),
+    })
+
+    docs = await OnlineDocumentLoader(
+        ["https://example.com/declared.txt", "https://example.com/streamed.txt", "https://example.com/small.txt"],
+        max_file_size=100_000,
+    ).load()
+
+    assert docs == [{"raw_content": "small document", "url": "https://example.com/small.txt"}]
+
+
+@pytest.mark.asyncio
+async def test_failed_urls_do_not_abort_the_batch(serve):
+    serve({
+        "https://example.com/timeout.txt": asyncio.TimeoutError(),
+        "https://example.com/broken.txt": RuntimeError("connection reset"),
+        "https://example.com/missing.txt": FakeResponse(status=404),
+        "https://example.com/ok.txt": FakeResponse(b"ok document"),
+    })
+
+    docs = await OnlineDocumentLoader([
+        "https://example.com/timeout.txt",
+        "https://example.com/broken.txt",
+        "https://example.com/missing.txt",
+        "https://example.com/ok.txt",
+    ]).load()
+
+    assert docs == [{"raw_content": "ok document", "url": "https://example.com/ok.txt"}]
+
+
+@pytest.mark.asyncio
+async def test_no_document_loaded_raises(serve):
+    serve({"https://example.com/missing.txt": FakeResponse(status=404)})
+
+    with pytest.raises(ValueError):
+        await OnlineDocumentLoader(["https://example.com/missing.txt"]).load()
@@ -0,0 +1,93 @@
+import pytest
+
+from gpt_researcher.context.page_budget import apply_page_budget, truncate_content
+
+
+def _build_page():
+    lead = "Intro paragraph about the page."
+    filler = ["Unrelated filler text about gardening and weather. " * 10 for _ in range(20)]
+    relevant = "Quantum error correction uses surface codes to protect qubits. " * 5
+    return "\n\n".join([lead] + filler[:10] + [relevant] + filler[10:])
+
+
+def test_short_content_is_untouched():
+    assert truncate_content("short text", "query", 1000) == "short text"
+    assert truncate_content("x" * 5000, "query", 0) == "x" * 5000
+
+
+def test_truncation_keeps_lead_and_relevant_section():
+    content = _build_page()
+    result = truncate_content(content, "quantum error correction", 2000)
+
+    assert len(result) <= 2000
+    assert result.startswith("Intro paragraph")
+    assert "surface codes" in result
+
+
+def test_apply_page_budget_preserves_metadata():
+    pages = [
+        {"url": "https://a", "title": "A", "raw_content": _build_page()},
+        {"url": "https://b", "title": "B", "raw_content": "small"},
+    ]
+    budgeted = apply_page_budget(pages, "quantum error correction", 2000)
+
+    assert budgeted[0]["url"] == "https://a" and budgeted[0]["title"] == "A"
+    assert len(budgeted[0]["raw_content"]) <= 2000
+    assert budgeted[1] is pages[1]
+    assert len(pages[0]["raw_content"]) > 2000
+
+
+def test_cjk_query_matches_sections_by_character_ngrams():
+    filler = ["今天的天气很好，我们去公园散步，看到了很多花草树木。" * 8 for _ in range(20)]
+    relevant = "量子纠错使用表面码来保护量子比特免受噪声影响。" * 8
+    content = "\n\n".join(["页面简介。"] + filler[:10] + [relevant] + filler[10:])
+
+    result = truncate_content(content, "量子纠错的原理是什么", 1000)
+
+    assert len(result) <= 1000
+    assert "表面码" in result
+
+
+@pytest.mark.asyncio
+async def test_page_budget_only_applies_to_scraped_pages(monkeypatch):
+    from types import SimpleNamespace
+
+    from gpt_researcher.context import compression
+    from gpt_researcher.skills import context_manager
+
+    received = []
+
+    class RecordingIndex:
+        @classmethod
+        async def from_pages(cls, pages, embeddings, **kwargs):
+            received.append(pages)
+            return cls()
+
+        def __len__(self):
+            return 0
+
+        async def search(self, query, k=5, similarity_threshold=0.0):
+            return []
+
+    monkeypatch.setattr(context_manager, "ChunkIndex", RecordingIndex)
+    monkeypatch.setattr(compression, "ChunkIndex", RecordingIndex)
+    researcher = SimpleNamespace(
+        cfg=SimpleNamespace(max_page_content_chars=2000, smart_llm_model="gpt-4o"),
+        memory=SimpleNamespace(get_embeddings=lambda: None),
+        prompt_family=None,
+        kwargs={},
+        verbose=False,
+        add_costs=lambda cost: None,
+    )
+    manager = context_manager.ContextManager(researcher)
+    manager.get_query_token_budget = lambda: 0
+    pages = [{"url": "report.pdf", "title": "", "raw_content": _build_page()}]
+
+    await manager.build_chunk_index("quantum error correction", pages)
+    await manager.get_similar_documents_by_query("quantum error correction", pages, scraped=False)
+    await manager.get_similar_documents_by_query("quantum error correction", pages)
+
+    documents_index, local_query, scraped_query = received
+    assert documents_index[0]["raw_content"] == pages[0]["raw_content"]
+    assert local_query[0]["raw_content"] == pages[0]["raw_content"]
+    assert len(scraped_query[0]["raw_content"]) <= 2000
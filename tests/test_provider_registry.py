@@ -0,0 +1,61 @@
+import pytest
+
+from gpt_researcher.llm_provider import GenericLLMProvider, get_provider_registry
+from gpt_researcher.utils.llm import get_llm
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    built = []
+
+    def from_provider(provider, **kwargs):
+        built.append((provider, kwargs))
+        return GenericLLMProvider(llm=object())
+
+    monkeypatch.setattr(GenericLLMProvider, "from_provider", from_provider)
+    registry = get_provider_registry()
+    registry.reset()
+    registry.configure(2)
+    yield registry, built
+    registry.reset()
+    registry.configure(32)
+
+
+def test_providers_are_reused_per_provider_and_kwargs(registry):
+    registry, built = registry
+
+    first = get_llm("openai", model="gpt-4o", model_kwargs={"a": 1, "b": [1, 2]})
+    again = get_llm("openai", model_kwargs={"b": [1, 2], "a": 1}, model="gpt-4o")
+    other = get_llm("openai", model="gpt-4o-mini")
+
+    assert first is again
+    assert other is not first
+    assert len(built) == 2
+    assert registry.hits == 1
+
+
+def test_pool_is_bounded_and_unhashable_kwargs_are_not_pooled(registry):
+    registry, built = registry
+
+    for model in ("a", "b", "c"):
+        get_llm("openai", model=model)
+    assert len(registry) == 2
+
+    get_llm("openai", model="a")
+    assert len(built) == 4
+
+    get_llm("openai", model="x", http_client=bytearray())
+    get_llm("openai", model="x", http_client=bytearray())
+    assert len(built) == 6
+
+
+def test_sdk_retries_are_disabled_for_pooled_clients(registry):
+    registry, built = registry
+
+    get_llm("openai", model="gpt-4o")
+    get_llm("anthropic", model="claude", max_retries=3)
+    get_llm("ollama", model="llama3")
+
+    assert built[0][1]["max_retries"] == 0
+    assert built[1][1]["max_retries"] == 3
+    assert "max_retries" not in built[2][1]
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from gpt_researcher.context.similarity import SimilarityEngine
+from gpt_researcher.memory.quantization import VectorCodec
+
+
+@pytest.mark.parametrize("precision,size", [("float32", 64 * 4), ("float16", 64 * 2), ("int8", 4 + 64)])
+def test_codec_round_trip(precision, size):
+    vector = np.random.default_rng(0).standard_normal(64).astype(np.float32)
+    codec = VectorCodec(precision)
+
+    blob = codec.encode(vector)
+
+    assert len(blob) == size
+    assert np.allclose(codec.decode(blob), vector, atol=0.05)
+
+
+def test_truncation_keeps_leading_dimensions_normalized():
+    codec = VectorCodec("float32", dimensions=2)
+    decoded = codec.decode(codec.encode([3.0, 4.0, 12.0]))
+
+    assert np.allclose(decoded, [0.6, 0.8])
+    assert codec.name == "float32@2"
+    assert VectorCodec().name == ""
+    with pytest.raises(ValueError):
+        VectorCodec("int4")
+
+
+def test_int8_engine_matches_float32_ranking():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((500, 32)).astype(np.float32)
+    queries = rng.standard_normal((5, 32)).astype(np.float32)
+
+    exact = SimilarityEngine(vectors).search_many(queries, k=5)
+    quantized = SimilarityEngine(vectors, precision="int8").search_many(queries, k=5)
+
+    for exact_hits, quantized_hits in zip(exact, quantized):
+        assert exact_hits[0][0] == quantized_hits[0][0]
+        assert quantized_hits[0][1] == pytest.approx(exact_hits[0][1], abs=0.02)
@@ -0,0 +1,65 @@
+import pytest
+
+from gpt_researcher.skills.researcher import ResearchConductor
+
+
+LONG_TEXT = "Full page content returned by the retriever. " * 5
+
+
+class FakeRetriever:
+    def __init__(self, query, query_domains=None):
+        self.query = query
+        self.include_raw_content = False
+
+    def search(self, max_results=5):
+        results = [{"href": "https://example.com/linked", "body": "snippet"}]
+        if self.include_raw_content:
+            results.append({
+                "href": "https://example.com/full",
+                "body": "snippet",
+                "title": "Full",
+                "raw_content": LONG_TEXT,
+            })
+        return results
+
+
+class FakeScraperManager:
+    def __init__(self):
+        self.browsed = []
+
+    async def browse_urls(self, urls):
+        self.browsed.extend(urls)
+        return [{"url": url, "raw_content": "scraped", "image_urls": [], "title": ""} for url in urls]
+
+
+@pytest.mark.asyncio
+async def test_raw_content_results_skip_scraping(make_researcher):
+    researcher = make_researcher(
+        cfg={"max_search_results_per_query": 5, "use_retriever_raw_content": True},
+        retrievers=[FakeRetriever],
+        scraper_manager=FakeScraperManager(),
+    )
+    conductor = ResearchConductor(researcher)
+
+    content = await conductor._scrape_data_by_urls("query")
+
+    assert researcher.scraper_manager.browsed == ["https://example.com/linked"]
+    urls = {page["url"]: page["raw_content"] for page in content}
+    assert urls["https://example.com/full"] == LONG_TEXT
+    assert urls["https://example.com/linked"] == "scraped"
+    assert "https://example.com/full" in researcher.visited_urls
+    assert any(page["url"] == "https://example.com/full" for page in researcher.research_sources)
+
+
+@pytest.mark.asyncio
+async def test_raw_content_disabled_scrapes_everything(make_researcher):
+    researcher = make_researcher(
+        cfg={"max_search_results_per_query": 5, "use_retriever_raw_content": False},
+        retrievers=[FakeRetriever],
+        scraper_manager=FakeScraperManager(),
+    )
+    conductor = ResearchConductor(researcher)
+
+    await conductor._scrape_data_by_urls("query")
+
+    assert researcher.scraper_manager.browsed == ["https://example.com/linked"]
@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from gpt_researcher.skills import writer
+from gpt_researcher.skills.writer import ReportGenerator
+
+VOCABULARY = ["quantum", "garden"]
+
+
+@pytest.fixture
+def researcher(make_researcher, keyword_embeddings):
+    cfg = dict(
+        report_sections=2, total_words=1000, agent_role=None,
+        smart_llm_model="gpt-4.1", smart_token_limit=4000, max_context_tokens=8000, context_window_tokens=0,
+    )
+    context = [
+        "Source: https://q.example\nTitle: Q\nContent: quantum computers use qubits\n"
+        "Source: https://g.example\nTitle: G\nContent: garden soil needs compost\n"
+    ]
+    return make_researcher(
+        cfg=cfg, query="quantum garden", role="role", report_type="research_report", tone=None, context=context,
+        memory=SimpleNamespace(get_embeddings=lambda: keyword_embeddings(VOCABULARY, offset=0.01)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_sections_are_written_concurrently_from_their_context_slice(monkeypatch, researcher):
+    running, peak, contexts = 0, 0, {}
+
+    async def fake_outline(**kwargs):
+        return {"title": "Quantum Gardens", "sections": ["Quantum", "Garden"]}
+
+    async def fake_section(section_title, context, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        contexts[section_title] = context
+        await asyncio.sleep(0.01)
+        running -= 1
+        url = "https://q.example" if section_title == "Quantum" else "https://g.example"
+        return f"## {section_title}\n\nText ([source]({url})) and again ([source](https://q.example))."
+
+    monkeypatch.setattr(writer, "generate_report_outline", fake_outline)
+    monkeypatch.setattr(writer, "write_report_section", fake_section)
+
+    report = await ReportGenerator(researcher).write_report_by_sections(researcher.context)
+
+    assert peak == 2
+    # Each section's context leads with the chunks most relevant to it
+    assert contexts["Quantum"].index("qubits") < contexts["Quantum"].index("compost")
+    assert contexts["Garden"].index("compost") < contexts["Garden"].index("qubits")
+    assert report.startswith("# Quantum Gardens\n\n## Table of Contents")
+    assert report.index("## Quantum\n") < report.index("## Garden\n")
+    references = report.split("## References")[1]
+    assert references.count("https://q.example") == 2 and references.count("https://g.example") == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_sections_fall_back_to_a_single_call(monkeypatch, researcher):
+    async def fake_outline(**kwargs):
+        return {"title": "Quantum Gardens", "sections": ["Quantum", "Garden"]}
+
+    async def empty_section(**kwargs):
+        return "  "
+
+    sent = []
+
+    class RecordingWebSocket:
+        async def send_json(self, data):
+            sent.append(data)
+
+    monkeypatch.setattr(writer, "generate_report_outline", fake_outline)
+    monkeypatch.setattr(writer, "write_report_section", empty_section)
+    researcher.websocket = RecordingWebSocket()
+
+    assert await ReportGenerator(researcher).write_report_by_sections(researcher.context) is None
+    # Nothing was streamed, so the single-call report does not follow a stray header
+    assert not [data for data in sent if data["type"] == "report"]
+
+
+@pytest.mark.asyncio
+async def test_failed_section_cancels_the_others(monkeypatch, researcher):
+    cancelled = []
+
+    async def fake_outline(**kwargs):
+        return {"title": "Quantum Gardens", "sections": ["Quantum", "Garden", "Outlook"]}
+
+    async def fake_section(section_title, **kwargs):
+        if section_title == "Quantum":
+            raise RuntimeError("provider down")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(section_title)
+            raise
+        return f"## {section_title}"
+
+    monkeypatch.setattr(writer, "generate_report_outline", fake_outline)
+    monkeypatch.setattr(writer, "write_report_section", fake_section)
+
+    with pytest.raises(RuntimeError):
+        await ReportGenerator(researcher).write_report_by_sections(researcher.context)
+    await asyncio.sleep(0)
+    assert sorted(cancelled) == ["Garden", "Outlook"]
@@ -245,6 +245,31 @@ class TestHandleFileUpload:
             backend.server.server_utils.DocumentLoader = original_loader
 
 
+    @pytest.mark.asyncio
+    async def test_unloadable_upload_is_rejected_and_removed(self, mock_file, temp_doc_path):
+        """Test that a file the document loader rejects returns 400 and is deleted."""
+        import backend.server.server_utils
+        original_loader = backend.server.server_utils.DocumentLoader
+
+        class FailingDocumentLoader:
+            def __init__(self, path):
+                pass
+            async def load(self):
+                raise ValueError("No documents could be loaded")
+
+        backend.server.server_utils.DocumentLoader = FailingDocumentLoader
+
+        try:
+            with pytest.raises(HTTPException) as exc_info:
+                await handle_file_upload(mock_file, temp_doc_path)
+
+            assert exc_info.value.status_code == 400
+            assert exc_info.value.detail == "No documents could be loaded"
+            assert not os.path.exists(os.path.join(temp_doc_path, "test.txt"))
+        finally:
+            backend.server.server_utils.DocumentLoader = original_loader
+
+
 class TestHandleFileDeletion:
     """Test the secure file deletion functionality."""
     
@@ -0,0 +1,62 @@
+import pytest
+
+from gpt_researcher.llm_provider.semantic_cache import embed_for_semantic_cache, get_semantic_cache
+
+
+class FixedEmbeddings:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    async def aembed_query(self, text):
+        return self.vectors[text]
+
+
+@pytest.fixture
+def cache():
+    cache = get_semantic_cache()
+    cache.reset()
+    cache.configure(0.95, max_entries=2)
+    yield cache
+    cache.reset()
+    cache.configure(0, max_entries=1000)
+
+
+def test_similar_queries_hit_within_the_same_namespace(cache):
+    cache.store(("choose_agent", "gpt-4o"), [1.0, 0.0], ("Finance Agent", "role"))
+
+    assert cache.lookup(("choose_agent", "gpt-4o"), [0.99, 0.05]) == ("Finance Agent", "role")
+    assert cache.lookup(("choose_agent", "gpt-4o"), [0.6, 0.8]) is None
+    assert cache.lookup(("choose_agent", "gpt-4o-mini"), [1.0, 0.0]) is None
+    assert cache.hit_rate == pytest.approx(1 / 3)
+
+
+def test_entries_are_bounded_per_namespace(cache):
+    for vector in ([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]):
+        cache.store("plan", vector, vector)
+
+    assert cache.lookup("plan", [1.0, 0.0, 0.0]) is None
+    assert cache.lookup("plan", [0.0, 0.0, 1.0]) == [0.0, 0.0, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_skips_embedding(cache):
+    embeddings = FixedEmbeddings({"query": [1.0, 0.0]})
+    assert await embed_for_semantic_cache(embeddings, "query") == [1.0, 0.0]
+
+    cache.configure(0)
+    assert await embed_for_semantic_cache(embeddings, "query") is None
+
+
+def test_changed_year_or_entity_does_not_hit(cache):
+    # Embeddings of these queries are nearly identical; only their key terms differ
+    cache.store("plan", [1.0, 0.0], ["2024 plan"], "AI chip market outlook 2024 for Nvidia")
+
+    assert cache.lookup("plan", [1.0, 0.0], "AI chip market outlook 2025 for Nvidia") is None
+    assert cache.lookup("plan", [1.0, 0.0], "AI chip market outlook 2024 for AMD") is None
+    assert cache.lookup("plan", [0.99, 0.05], "AI chip market outlook 2024 for Nvidia") == ["2024 plan"]
+
+
+def test_cache_is_disabled_by_default():
+    from gpt_researcher.config.variables.default import DEFAULT_CONFIG
+
+    assert DEFAULT_CONFIG["SEMANTIC_CACHE_THRESHOLD"] == 0
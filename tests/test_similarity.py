@@ -0,0 +1,19 @@
+import numpy as np
+
+from gpt_researcher.context.similarity import SimilarityEngine
+
+
+def test_search_many_returns_sorted_top_k_above_threshold():
+    engine = SimilarityEngine([[1, 0], [0.8, 0.6], [0, 1], [-1, 0]])
+
+    results = engine.search_many([[1, 0], [0, 1]], k=2, threshold=0.5)
+
+    assert [i for i, _ in results[0]] == [0, 1]
+    assert [i for i, _ in results[1]] == [2, 1]
+    assert np.isclose(results[0][1][1], 0.8)
+
+
+def test_threshold_and_empty_engine():
+    engine = SimilarityEngine([[1, 0], [0, 1]])
+    assert engine.search([1, 0], k=5, threshold=0.5) == [(0, 1.0)]
+    assert SimilarityEngine(np.zeros((0, 2))).search([1, 0], k=3) == []
@@ -0,0 +1,72 @@
+import pytest
+from langchain_core.documents import Document
+
+from gpt_researcher.skills.researcher import ResearchConductor
+
+
+class SnippetRetriever:
+    def __init__(self, query, query_domains=None):
+        self.query = query
+
+    def search(self, max_results=5):
+        return [
+            {"href": "https://example.com/a", "title": "A", "body": f"snippet A for {self.query}"},
+            {"href": "https://example.com/b", "title": "B", "body": f"snippet B for {self.query}"},
+            {"href": "https://example.com/empty", "title": "Empty", "body": "  "},
+        ]
+
+
+class OtherSnippetRetriever(SnippetRetriever):
+    def search(self, max_results=5):
+        return [{"href": "https://example.com/a", "title": "A", "body": "another snippet of A"}]
+
+
+class NoScraping:
+    async def browse_urls(self, urls):
+        raise AssertionError("web_snippets must not scrape")
+
+
+class RecordingContextManager:
+    def __init__(self):
+        self.pages = []
+
+    async def get_similar_documents_by_query(self, query, pages, scraped=True):
+        self.pages.append(pages)
+        return [Document(page_content=page["raw_content"], metadata={"source": page["url"]}) for page in pages]
+
+
+@pytest.fixture
+def researcher(make_researcher):
+    return make_researcher(
+        cfg={"max_search_results_per_query": 5, "mcp_strategy": "disabled"},
+        report_source="web_snippets",
+        retrievers=[SnippetRetriever, OtherSnippetRetriever],
+        scraper_manager=NoScraping(),
+        context_manager=RecordingContextManager(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_sub_query_context_is_built_from_snippets_without_scraping(researcher):
+    conductor = ResearchConductor(researcher)
+
+    documents, mcp_context = await conductor._process_sub_query("solar power", [])
+
+    assert mcp_context == []
+    assert [doc.page_content for doc in documents] == [
+        "snippet A for solar power", "snippet B for solar power", "another snippet of A"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_snippet_sources_are_recorded_once_per_url(researcher):
+    conductor = ResearchConductor(researcher)
+
+    first = await conductor._get_snippets_by_query("solar power")
+    second = await conductor._get_snippets_by_query("wind power")
+
+    # Each sub-query keeps all its snippets as context...
+    assert len(first) == len(second) == 3
+    # ...but a URL becomes a research source only the first time it is seen
+    assert [page["url"] for page in researcher.research_sources] == ["https://example.com/a", "https://example.com/b"]
+    assert researcher.visited_urls == {"https://example.com/a", "https://example.com/b"}
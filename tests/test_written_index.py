@@ -0,0 +1,20 @@
+import pytest
+
+from gpt_researcher.context.written_index import WrittenSectionIndex
+
+VOCABULARY = ["solar", "wind", "battery"]
+
+
+@pytest.mark.asyncio
+async def test_sections_are_embedded_once_as_the_report_grows(keyword_embeddings):
+    embeddings = keyword_embeddings(VOCABULARY)
+    index = WrittenSectionIndex(embeddings)
+
+    await index.add([{"section_title": "Solar", "written_content": "solar panels and solar farms"}])
+    await index.add([{"section_title": "Wind", "written_content": "wind turbines"}])
+    results = await index.search_many(["solar", "wind", "battery"])
+
+    assert embeddings.embedded_documents == ["solar panels and solar farms", "wind turbines"]
+    assert results[0] == ["Title: Solar\nContent: solar panels and solar farms\n"]
+    assert results[1] == ["Title: Wind\nContent: wind turbines\n"]
+    assert results[2] == []